@@ -1,4 +1,5 @@
-# Torna 'api' um pacote e reexporta db/migrate para permitir imports como 'from .. import db' nos modelos
-from .models import db, migrate
+# Torna 'api' um pacote e reexporta db para permitir imports como 'from .. import db' nos modelos
+# (o Flask-Migrate é inicializado em create_app, fora do cold start do Vercel)
+from .models import db
 
-__all__ = ['db', 'migrate']
\ No newline at end of file
+__all__ = ['db']
@@ -3,18 +3,25 @@ from datetime import datetime
 from flask import Flask, jsonify, request, make_response
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 # Tornar imports resilientes para rodar tanto localmente (pacote api) quanto no Vercel (executando api/index.py)
 try:
     from .config import config
-    from .models import db, migrate
+    from .models import db
     from .routes import register_routes
+    from .docs import init_docs
+    from .instrumentation import init_instrumentation
+    from .responses import init_responses
+    from .jobs import init_jobs
 except ImportError:
     from config import config
-    from models import db, migrate
+    from models import db
     from routes import register_routes
-
-from flasgger import Swagger
+    from docs import init_docs
+    from instrumentation import init_instrumentation
+    from responses import init_responses
+    from jobs import init_jobs
 
 def create_app(config_name='default'):
     """Factory para criar a aplicação Flask"""
@@ -26,66 +33,27 @@ def create_app(config_name='default'):
     config_name = config_name or selected
     app.config.from_object(config[config_name])
     
-    # Configuração do Swagger
-    swagger_config = {
-        "headers": [],
-        "specs": [
-            {
-                "endpoint": 'apispec',
-                "route": '/apispec.json',
-                "rule_filter": lambda rule: True,
-                "model_filter": lambda tag: True,
-            }
-        ],
-        "static_url_path": "/flasgger_static",
-        "swagger_ui": True,
-        "specs_route": "/api/docs"
-    }
-    
-    swagger_template = {
-        "swagger": "2.0",
-        "info": {
-            "title": "Fireng API - GAT & DAT",
-            "description": """
-API unificada para os sistemas Fireng:
-
-**GAT (Gestão de Atendimento Técnico)**: Sistema web administrativo
-- Gerenciamento de usuários, clientes e equipes
-- Planejamento e agendamento de serviços
-- Relatórios e dashboards gerenciais
-- Acesso: Admin, Coordenadores
-
-**DAT (Diário de Atendimento Técnico)**: Aplicativo mobile para técnicos
-- Registro de inspeções e manutenções em campo
-- Captura de fotos e assinaturas
-- Sincronização offline
-- Acesso: Técnicos, Clientes
-
-**Compartilhado**: Recursos comuns entre GAT e DAT
-- Autenticação e autorização (JWT)
-- Perfis de usuário
-- Notificações
-            """,
-            "version": "1.0.0",
-            "contact": {
-                "name": "Fireng",
-                "url": "https://github.com/seu-usuario/fireng"
-            }
-        },
-        "securityDefinitions": {
-            "Bearer": {
-                "type": "apiKey",
-                "name": "Authorization",
-                "in": "header",
-                "description": "JWT Authorization header usando o esquema Bearer. Exemplo: 'Bearer {token}'"
-            }
-        },
-        "security": [{"Bearer": []}]
-    }
+    # Inicialização sob demanda (opcional, LAZY_STARTUP): rotas e documentação carregadas na primeira
+    # requisição ao prefixo; Flask-Migrate (alembic) e comandos de CLI ficam de fora
+    lazy_startup = app.config.get('LAZY_STARTUP', False)
+    
+    # IP do cliente a partir de X-Forwarded-For apenas para os proxies confiáveis
+    # (request.remote_addr passa a ser o endereço informado pelo último deles)
+    trusted_proxies = app.config.get('TRUSTED_PROXY_COUNT', 0)
+    if trusted_proxies:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=trusted_proxies, x_proto=trusted_proxies)
     
     # Inicializar extensões
     db.init_app(app)
-    migrate.init_app(app, db)
+    if not lazy_startup:
+        from flask_migrate import Migrate
+        Migrate(app, db)
+    
+    # Métricas por requisição (consultas SQL, tempos, bytes) e Server-Timing
+    init_instrumentation(app)
+    
+    # Compressão negociada e ETag das listagens (respostas condicionais)
+    init_responses(app)
     
     # Configuração CORS para produção no Vercel
     allowed_origins = [
@@ -127,10 +95,6 @@ API unificada para os sistemas Fireng:
             'message': 'Authorization header não encontrado ou inválido'
         }), 401
     
-    # Swagger removido temporariamente devido a incompatibilidade
-    # Swagger(app, config=swagger_config, template=swagger_template)
-    Swagger(app, config=swagger_config, template=swagger_template)
-    
     # Middleware CORS personalizado para garantir funcionamento
     @app.after_request
     def after_request(response):
@@ -215,7 +179,21 @@ API unificada para os sistemas Fireng:
         }), 405
     
     # Registrar rotas
-    register_routes(app)
+    register_routes(app, lazy=lazy_startup)
+    
+    # Documentação (/api/docs e /apispec.json)
+    init_docs(app)
+    
+    # Registrar comandos de linha de comando (flask attachments ...)
+    if not lazy_startup:
+        try:
+            from .commands import register_commands
+        except ImportError:
+            from commands import register_commands
+        register_commands(app)
+    
+    # Executores de tarefas embutidos (JOBS_EMBEDDED_WORKERS, desenvolvimento local)
+    init_jobs(app)
     
     # Criar tabelas do banco de dados (apenas se explicitamente habilitado em dev)
     if app.config.get('DEBUG') and os.getenv('RUN_DB_CREATE', 'false').lower() == 'true':
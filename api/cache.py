@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Valor sentinela para diferenciar "não está no cache" de um valor None armazenado
+MISSING = object()
+
+# Caches nomeados, expostos em /api/metrics (acertos, faltas e entradas)
+named_caches = {}
+
+
+class TTLCache:
+    """Cache em memória com expiração (TTL), tamanho limitado (LRU) e invalidação por versão
+
+    Cada processo mantém sua própria instância; o TTL limita a defasagem entre
+    workers. Entradas gravadas antes de uma invalidação são descartadas mesmo
+    que ainda não tenham expirado. Com name, o cache é registrado em named_caches
+    e seus contadores de acertos/faltas aparecem em /api/metrics.
+    """
+
+    def __init__(self, ttl=30, maxsize=256, name=None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        if name:
+            named_caches[name] = self
+
+    def get(self, key):
+        """Retorna o valor armazenado ou MISSING se ausente/expirado"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+
+            value, expires_at, version = entry
+            if version != self.version or expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return MISSING
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Armazena um valor; ttl <= 0 desabilita o armazenamento"""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl, self.version)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key, factory, ttl=None):
+        """Retorna o valor do cache ou calcula com factory() e armazena"""
+        value = self.get(key)
+        if value is MISSING:
+            value = factory()
+            self.set(key, value, ttl=ttl)
+        return value
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate(self):
+        """Invalida todas as entradas (incrementa a versão)"""
+        with self._lock:
+            self.version += 1
+            self._data.clear()
+
+    def stats(self):
+        """Contadores do cache: acertos, faltas, entradas, limite e versão"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'version': self.version,
+            }
+
+
+# Caches que devem ser invalidados quando determinados modelos forem alterados
+_watchers = []
+
+
+def invalidate_on_change(cache, *models):
+    """Registra um cache para ser invalidado quando instâncias dos modelos forem gravadas"""
+    _watchers.append((models, cache))
+
+
+@event.listens_for(Session, 'after_flush')
+def _invalidate_watched_caches(session, flush_context):
+    """Invalida os caches registrados cujos modelos aparecem no flush
+
+    Instâncias alteradas apenas em coleções (ex.: a norma associada a um novo
+    equipamento pelo backref) não contam. Os caches invalidados são lembrados
+    na sessão e invalidados de novo no commit: uma leitura concorrente entre o
+    flush e o commit ainda veria (e guardaria) os dados antigos.
+    """
+    if not _watchers:
+        return
+
+    changed = set()
+    for instance in list(session.new) + list(session.deleted):
+        changed.add(type(instance))
+    for instance in session.dirty:
+        if session.is_modified(instance, include_collections=False):
+            changed.add(type(instance))
+
+    if not changed:
+        return
+
+    for models, cache in _watchers:
+        if any(issubclass(model_class, models) for model_class in changed):
+            cache.invalidate()
+            session.info.setdefault('invalidated_caches', set()).add(cache)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    for cache in session.info.pop('invalidated_caches', ()):
+        cache.invalidate()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_invalidated(session):
+    session.info.pop('invalidated_caches', None)
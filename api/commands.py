@@ -0,0 +1,150 @@
+import os
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from .models import db, Inspection, Maintenance, Attachment
+from .services.attachments import externalize_photos, externalize_value, has_inline_photos
+from .services.client_search import rebuild_search_index
+from .services.query_plans import SMALL_TABLES, find_full_scans
+from .services.inventory_counters import reconcile_inventory_counts
+from .jobs import JobWorker
+from .docs import SPEC_ARTIFACT_PATH, render_spec
+
+attachments_cli = AppGroup('attachments', help='Gerenciamento de anexos (assinaturas e fotos)')
+clients_cli = AppGroup('clients', help='Manutenção dos dados de clientes')
+docs_cli = AppGroup('docs', help='Documentação OpenAPI')
+inventories_cli = AppGroup('inventories', help='Manutenção dos inventários')
+perf_cli = AppGroup('perf', help='Verificações de desempenho das consultas')
+jobs_cli = AppGroup('jobs', help='Execução das tarefas em segundo plano')
+
+
+def _externalize_model(model, batch_size):
+    """Move assinaturas/fotos inline de um modelo para o armazenamento de anexos"""
+    moved = 0
+    last_id = 0
+    
+    while True:
+        rows = model.query.filter(
+            model.id > last_id,
+            db.or_(model.signature.isnot(None), model.photos.isnot(None))
+        ).order_by(model.id).limit(batch_size).all()
+        
+        if not rows:
+            break
+        
+        for row in rows:
+            last_id = row.id
+            changed = False
+            
+            if row.signature and not Attachment.is_reference(row.signature):
+                row.signature = externalize_value(row.signature)
+                changed = True
+            
+            if has_inline_photos(row.photos):
+                row.photos = externalize_photos(row.photos)
+                changed = True
+            
+            if changed:
+                moved += 1
+        
+        db.session.commit()
+        db.session.expunge_all()
+    
+    return moved
+
+
+@attachments_cli.command('externalize')
+@click.option('--batch-size', default=200, show_default=True, help='Linhas processadas por commit')
+def externalize_command(batch_size):
+    """Move assinaturas e fotos base64 gravadas nas linhas para o armazenamento de anexos"""
+    for model in (Inspection, Maintenance):
+        moved = _externalize_model(model, batch_size)
+        click.echo(f'{model.__tablename__}: {moved} linhas atualizadas')
+
+
+@clients_cli.command('reindex')
+@click.option('--batch-size', default=500, show_default=True, help='Clientes processados por commit')
+def reindex_command(batch_size):
+    """Recalcula os campos de busca dos clientes e reconstrói o índice FTS5 (SQLite)"""
+    updated = rebuild_search_index(batch_size)
+    click.echo(f'clients: {updated} clientes reindexados')
+
+
+@docs_cli.command('build')
+@click.option('--check', is_flag=True, help='Apenas verifica se o arquivo está atualizado (código 1 se não estiver)')
+@click.option('--output', default=SPEC_ARTIFACT_PATH, show_default=True, help='Arquivo da especificação')
+def build_docs_command(check, output):
+    """Gera a especificação OpenAPI servida em /apispec.json a partir das docstrings"""
+    data = render_spec(current_app._get_current_object())
+
+    current = None
+    if os.path.exists(output):
+        with open(output, 'rb') as spec_file:
+            current = spec_file.read()
+
+    if check:
+        if current != data:
+            click.echo(f'docs: {output} desatualizado; rode `flask docs build`')
+            raise SystemExit(1)
+        click.echo(f'docs: {output} atualizado')
+        return
+
+    if current == data:
+        click.echo(f'docs: {output} já estava atualizado')
+        return
+
+    with open(output, 'wb') as spec_file:
+        spec_file.write(data)
+    click.echo(f'docs: {output} gerado ({len(data)} bytes)')
+
+
+@inventories_cli.command('recount')
+@click.option('--inventory-id', 'inventory_ids', type=int, multiple=True, help='Inventário a reconciliar (padrão: todos)')
+def recount_command(inventory_ids):
+    """Recalcula os contadores de equipamentos com uma única consulta agregada"""
+    updated = reconcile_inventory_counts(list(inventory_ids) or None)
+    db.session.commit()
+    click.echo(f'inventories: {updated} inventários corrigidos')
+
+
+@perf_cli.command('explain')
+@click.option('--allow', multiple=True, help='Tabela adicional em que a varredura completa é aceita')
+def explain_command(allow):
+    """Executa EXPLAIN nas consultas dos endpoints de listagem e falha em varreduras completas"""
+    analyzed, scans = find_full_scans(current_app._get_current_object(), allowed_tables=SMALL_TABLES | set(allow))
+    
+    for scan in scans:
+        click.echo(f'{scan.target}: varredura completa em {scan.table} ({scan.detail})')
+        statement = ' '.join(scan.statement.split())
+        click.echo(f'    ...{statement[statement.find(" FROM "):][:300]}')
+    
+    click.echo(f'{analyzed} consultas analisadas, {len(scans)} varreduras completas')
+    if scans:
+        raise SystemExit(1)
+
+
+@jobs_cli.command('worker')
+@click.option('--threads', default=2, show_default=True, help='Tarefas executadas em paralelo')
+@click.option('--poll-interval', default=2.0, show_default=True, help='Segundos entre consultas à fila vazia')
+@click.option('--once', is_flag=True, help='Executa as tarefas pendentes e encerra (ex.: cron)')
+def worker_command(threads, poll_interval, once):
+    """Executa as tarefas da tabela jobs (sem broker externo)"""
+    worker = JobWorker(current_app._get_current_object(), threads=threads, poll_interval=poll_interval)
+    
+    if once:
+        executed = worker.drain()
+        click.echo(f'{executed} tarefas executadas')
+        return
+    
+    click.echo(f'Executor {worker.name} com {worker.threads} threads (Ctrl+C para encerrar)')
+    worker.run_forever()
+
+
+def register_commands(app):
+    """Registra os comandos de linha de comando (flask <grupo> <comando>)"""
+    app.cli.add_command(attachments_cli)
+    app.cli.add_command(clients_cli)
+    app.cli.add_command(docs_cli)
+    app.cli.add_command(inventories_cli)
+    app.cli.add_command(perf_cli)
+    app.cli.add_command(jobs_cli)
@@ -58,6 +58,90 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
     
+    # Custo do bcrypt; hashes com custo diferente são refeitos no próximo login
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+    
+    # Pool de bcrypt: cálculos simultâneos, fila máxima e tempo limite (segundos)
+    BCRYPT_MAX_WORKERS = int(os.getenv('BCRYPT_MAX_WORKERS', '4'))
+    BCRYPT_MAX_PENDING = int(os.getenv('BCRYPT_MAX_PENDING', '32'))
+    BCRYPT_TIMEOUT = int(os.getenv('BCRYPT_TIMEOUT', '10'))
+    
+    # Bloqueio de login após falhas dentro da janela (segundos): por par e-mail + IP
+    # (um terceiro não consegue bloquear a conta da vítima) e, com limite maior, por IP
+    LOGIN_MAX_FAILURES = int(os.getenv('LOGIN_MAX_FAILURES', '5'))
+    LOGIN_MAX_FAILURES_PER_IP = int(os.getenv('LOGIN_MAX_FAILURES_PER_IP', '50'))
+    LOGIN_FAILURE_WINDOW = int(os.getenv('LOGIN_FAILURE_WINDOW', '300'))
+    
+    # Proxies reversos confiáveis à frente da aplicação (ProxyFix). O Vercel sobrescreve
+    # X-Forwarded-For com o IP real do cliente, por isso 1 quando VERCEL está definida;
+    # sem proxy o cabeçalho é ignorado, pois pode ser forjado pelo cliente
+    TRUSTED_PROXY_COUNT = int(os.getenv('TRUSTED_PROXY_COUNT', '1' if os.getenv('VERCEL') else '0'))
+    
+    # Cache de identidade (id, role, is_active) entre requisições, em segundos
+    IDENTITY_CACHE_TTL = int(os.getenv('IDENTITY_CACHE_TTL', '60'))
+    
+    # Incluir role/status nas claims do access token (autorização sem consulta ao banco).
+    # Alterações de role/desativação só valem para tokens emitidos depois delas.
+    JWT_ROLE_CLAIMS = os.getenv('JWT_ROLE_CLAIMS', 'false').lower() == 'true'
+    
+    # Armazenamento de anexos (assinaturas e fotos): 'local' (disco) ou 'database'
+    # (tabela attachment_blobs). No Vercel o disco é efêmero e não é compartilhado
+    # entre instâncias, então o padrão lá é 'database'.
+    # Caminho relativo é resolvido a partir da pasta instance da aplicação
+    ATTACHMENTS_BACKEND = os.getenv('ATTACHMENTS_BACKEND', 'database' if os.getenv('VERCEL') else 'local')
+    ATTACHMENTS_DIR = os.getenv('ATTACHMENTS_DIR', 'attachments')
+    
+    # Backend dos arquivos de importação em massa aguardando a tarefa (async): o executor
+    # pode rodar em outra máquina, então o padrão é o banco, que todos compartilham
+    IMPORT_UPLOADS_BACKEND = os.getenv('IMPORT_UPLOADS_BACKEND', 'database')
+    
+    # Feriados considerados pelas regras de recorrência que adiam datas para o próximo
+    # dia útil (datas ISO separadas por vírgula, ex.: 2026-11-02,2026-11-15)
+    INSPECTION_HOLIDAYS = os.getenv('INSPECTION_HOLIDAYS', '')
+    
+    # Cache das estatísticas de geração automática (segundos; 0 desabilita)
+    STATS_CACHE_TTL = int(os.getenv('STATS_CACHE_TTL', '30'))
+    
+    # Cache dos dados de referência (normas e equipes), em segundos; invalidado a cada
+    # gravação desses modelos no processo, o TTL limita a defasagem entre processos
+    REFERENCE_CACHE_TTL = int(os.getenv('REFERENCE_CACHE_TTL', '300'))
+    
+    # Intervalo (segundos) entre conferências da versão da tabela de periodicidades;
+    # gravações no próprio processo invalidam na hora, o TTL limita a defasagem entre
+    # processos (0 confere a cada preview/geração)
+    SCHEDULE_CACHE_TTL = int(os.getenv('SCHEDULE_CACHE_TTL', '30'))
+    
+    # Instrumentação por requisição (consultas, tempo de banco, serialização)
+    INSTRUMENTATION_ENABLED = os.getenv('INSTRUMENTATION_ENABLED', 'true').lower() == 'true'
+    SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING_ENABLED', 'true').lower() == 'true'
+    
+    # Compressão das respostas (gzip; brotli quando o pacote estiver instalado) a partir
+    # do tamanho mínimo em bytes, e nível do gzip (1-9)
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+    COMPRESSION_LEVEL = int(os.getenv('COMPRESSION_LEVEL', '6'))
+    
+    # Token fixo para o coletor Prometheus em /api/metrics (além de JWT de admin)
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+    
+    # Tarefas em segundo plano (tabela jobs): executores embutidos no processo web
+    # (0 = apenas `flask jobs worker`), intervalo de consulta da fila, segundos sem
+    # progresso até uma tarefa em execução ser considerada abandonada e tentativas
+    JOBS_EMBEDDED_WORKERS = int(os.getenv('JOBS_EMBEDDED_WORKERS', '0'))
+    # Declara que há um `flask jobs worker` em outro processo/máquina sobre o mesmo banco.
+    # Sem ele e sem executores embutidos, as rotas recusam enfileirar tarefas (503): no
+    # Vercel nada processaria a fila
+    JOBS_EXTERNAL_WORKER = os.getenv('JOBS_EXTERNAL_WORKER', 'false').lower() == 'true'
+    JOBS_POLL_INTERVAL = float(os.getenv('JOBS_POLL_INTERVAL', '2'))
+    JOBS_STALE_AFTER = int(os.getenv('JOBS_STALE_AFTER', '900'))
+    JOBS_MAX_ATTEMPTS = int(os.getenv('JOBS_MAX_ATTEMPTS', '3'))
+    
+    # Inicialização sob demanda para reduzir o cold start (opcional, desativada por padrão):
+    # blueprints e documentação carregados na primeira requisição ao prefixo, sem Flask-Migrate
+    # e CLI. Depende de um atributo interno do Flask 2.3 (ver LazyRoutes) e supõe uma requisição
+    # por vez, como nas funções do Vercel; ative com LAZY_STARTUP=true
+    LAZY_STARTUP = os.getenv('LAZY_STARTUP', 'false').lower() == 'true'
+    
     # Configurações CORS
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:5173,http://localhost:5174').split(',')
 
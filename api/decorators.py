@@ -1,7 +1,6 @@
 from functools import wraps
 from flask import jsonify
-from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
-from .models import User
+from .identity import resolve_identity
 
 def role_required(*roles):
     """
@@ -11,9 +10,8 @@ def role_required(*roles):
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            verify_jwt_in_request()
-            user_id = get_jwt_identity()
-            user = User.query.get(int(user_id))
+            # Identidade memorizada em flask.g e em cache entre requisições
+            user = resolve_identity()
             
             if not user:
                 return jsonify({'error': 'Usuário não encontrado'}), 404
@@ -33,8 +31,8 @@ def role_required(*roles):
 
 
 def get_current_user():
-    """Retorna o usuário atual autenticado"""
-    verify_jwt_in_request()
-    user_id = get_jwt_identity()
-    return User.query.get(int(user_id))
+    """Retorna a identidade do usuário autenticado (id, role, is_active, has_role)
 
+    Reaproveita a identidade já resolvida por role_required na mesma requisição.
+    """
+    return resolve_identity()
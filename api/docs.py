@@ -0,0 +1,177 @@
+# Documentação OpenAPI (flasgger). O flasgger só é importado em init_docs: com suas
+# dependências (jsonschema, mistune, PyYAML) ele custa ~150ms no cold start.
+import gzip
+import hashlib
+import json
+import os
+import threading
+from flask import Response, request
+
+# Especificação pré-gerada (`flask docs build`), versionada no repositório.
+# Quando presente, /apispec.json é servido deste arquivo, sem montar a especificação
+# a partir das docstrings YAML a cada requisição.
+SPEC_ARTIFACT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'apispec.json')
+
+# Endpoint da especificação no flasgger (blueprint 'flasgger')
+SPEC_ENDPOINT = 'apispec'
+
+SWAGGER_CONFIG = {
+    "headers": [],
+    "specs": [
+        {
+            "endpoint": SPEC_ENDPOINT,
+            "route": '/apispec.json',
+            "rule_filter": lambda rule: True,
+            "model_filter": lambda tag: True,
+        }
+    ],
+    "static_url_path": "/flasgger_static",
+    "swagger_ui": True,
+    "specs_route": "/api/docs"
+}
+
+SWAGGER_TEMPLATE = {
+    "swagger": "2.0",
+    "info": {
+        "title": "Fireng API - GAT & DAT",
+        "description": """
+API unificada para os sistemas Fireng:
+
+**GAT (Gestão de Atendimento Técnico)**: Sistema web administrativo
+- Gerenciamento de usuários, clientes e equipes
+- Planejamento e agendamento de serviços
+- Relatórios e dashboards gerenciais
+- Acesso: Admin, Coordenadores
+
+**DAT (Diário de Atendimento Técnico)**: Aplicativo mobile para técnicos
+- Registro de inspeções e manutenções em campo
+- Captura de fotos e assinaturas
+- Sincronização offline
+- Acesso: Técnicos, Clientes
+
+**Compartilhado**: Recursos comuns entre GAT e DAT
+- Autenticação e autorização (JWT)
+- Perfis de usuário
+- Notificações
+        """,
+        "version": "1.0.0",
+        "contact": {
+            "name": "Fireng",
+            "url": "https://github.com/seu-usuario/fireng"
+        }
+    },
+    "securityDefinitions": {
+        "Bearer": {
+            "type": "apiKey",
+            "name": "Authorization",
+            "in": "header",
+            "description": "JWT Authorization header usando o esquema Bearer. Exemplo: 'Bearer {token}'"
+        }
+    },
+    "security": [{"Bearer": []}]
+}
+
+# Prefixos atendidos pelo flasgger (especificação, interface e arquivos estáticos)
+DOCS_PREFIXES = ['/apispec.json', '/api/docs', '/flasgger_static']
+
+
+def swag_from(specs):
+    """Anexa uma especificação (dicionário) à view, como flasgger.swag_from sem validação
+
+    O flasgger lê o atributo specs_dict ao montar /apispec.json.
+    """
+    def decorator(function):
+        function.specs_dict = specs
+        return function
+    return decorator
+
+
+class SpecArtifact:
+    """Especificação pré-gerada servida com ETag e gzip
+
+    O arquivo é lido e comprimido uma única vez por processo; respostas com
+    If-None-Match igual ao ETag (hash do conteúdo) recebem 304 sem corpo.
+    """
+
+    def __init__(self, path=SPEC_ARTIFACT_PATH):
+        self.path = path
+        self._loaded = None
+        self._lock = threading.Lock()
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def _load(self):
+        if self._loaded is None:
+            with self._lock:
+                if self._loaded is None:
+                    with open(self.path, 'rb') as spec_file:
+                        data = spec_file.read()
+                    self._loaded = (
+                        data,
+                        gzip.compress(data, compresslevel=9, mtime=0),
+                        hashlib.sha256(data).hexdigest()[:32]
+                    )
+        return self._loaded
+
+    def view(self):
+        data, compressed, etag = self._load()
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        elif request.accept_encodings['gzip']:
+            response = Response(compressed, mimetype='application/json')
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = Response(data, mimetype='application/json')
+
+        response.set_etag(etag)
+        response.headers['Vary'] = 'Accept-Encoding'
+        # Sempre revalida: o conteúdo muda a cada deploy, o 304 é barato
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+
+def render_spec(app):
+    """Monta a especificação com o flasgger a partir de todas as rotas, serializada de forma estável"""
+    lazy_routes = app.extensions.get('lazy_routes')
+    if lazy_routes is not None:
+        lazy_routes.load_all()
+
+    if not hasattr(app, 'swag'):
+        _init_swagger(app)
+
+    with app.test_request_context():
+        spec = app.swag.get_apispecs(SPEC_ENDPOINT)
+
+    return (json.dumps(spec, indent=2, sort_keys=True, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def _init_swagger(app):
+    from flasgger import Swagger
+    Swagger(app, config=SWAGGER_CONFIG, template=SWAGGER_TEMPLATE)
+
+
+def init_docs(app, artifact=None):
+    """Inicializa a documentação; no modo LAZY_STARTUP, só na primeira requisição a ela
+
+    Com o arquivo pré-gerado, o flasgger atende apenas a interface (/api/docs) e
+    /apispec.json passa a servir o arquivo. Sem ele, a especificação é montada em
+    tempo de execução e cobre todas as rotas, então os blueprints pendentes são
+    carregados antes do flasgger.
+    """
+    artifact = artifact or SpecArtifact()
+    use_artifact = artifact.exists()
+
+    def load(app):
+        if not use_artifact and 'lazy_routes' in app.extensions:
+            app.extensions['lazy_routes'].load_all()
+        _init_swagger(app)
+        if use_artifact:
+            app.view_functions[f'flasgger.{SPEC_ENDPOINT}'] = artifact.view
+
+    lazy_routes = app.extensions.get('lazy_routes')
+    if lazy_routes is None:
+        load(app)
+    else:
+        lazy_routes.add(DOCS_PREFIXES, load)
@@ -0,0 +1,88 @@
+from flask import current_app, g
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from .cache import TTLCache, MISSING
+from .models import db, User
+
+# Cache entre requisições de (id, role, is_active) por usuário
+identity_cache = TTLCache(ttl=60, maxsize=1024, name='identity')
+
+
+class Identity:
+    """Identidade do usuário autenticado: apenas o necessário para autorização"""
+    
+    __slots__ = ('id', 'role', 'is_active')
+    
+    def __init__(self, id, role, is_active):
+        self.id = id
+        self.role = role
+        self.is_active = is_active
+    
+    def __repr__(self):
+        return f'<Identity {self.id} - {self.role}>'
+    
+    def has_role(self, *roles):
+        """Verifica se o usuário possui uma das roles especificadas"""
+        return self.role in roles
+
+
+def load_identity(user_id):
+    """Busca (id, role, is_active) do usuário, usando o cache com TTL"""
+    identity = identity_cache.get(user_id)
+    if identity is not MISSING:
+        return identity
+    
+    row = db.session.query(User.id, User.role, User.is_active).filter(User.id == user_id).first()
+    if not row:
+        return None
+    
+    identity = Identity(row.id, row.role, bool(row.is_active))
+    identity_cache.set(user_id, identity, ttl=current_app.config.get('IDENTITY_CACHE_TTL', 60))
+    return identity
+
+
+def resolve_identity():
+    """Resolve a identidade do JWT atual, memorizada em flask.g durante a requisição
+
+    Com JWT_ROLE_CLAIMS habilitado, role e status vêm das claims do token e a
+    autorização não consulta o banco.
+    """
+    if '_current_identity' in g:
+        return g._current_identity
+    
+    verify_jwt_in_request()
+    user_id = int(get_jwt_identity())
+    identity = None
+    
+    if current_app.config.get('JWT_ROLE_CLAIMS'):
+        claims = get_jwt()
+        if 'role' in claims:
+            identity = Identity(user_id, claims['role'], claims.get('active', True))
+    
+    if identity is None:
+        identity = load_identity(user_id)
+    
+    g._current_identity = identity
+    return identity
+
+
+def identity_claims(user):
+    """Claims adicionais do access token (role e status), quando habilitadas"""
+    if not current_app.config.get('JWT_ROLE_CLAIMS'):
+        return {}
+    
+    return {'role': user.role, 'active': bool(user.is_active)}
+
+
+def forget_identity(user_id):
+    """Remove o usuário do cache de identidades"""
+    identity_cache.delete(user_id)
+
+
+@event.listens_for(Session, 'after_flush')
+def _forget_changed_users(session, flush_context):
+    """Invalida o cache quando um usuário é alterado ou removido (ex.: users.py)"""
+    for instance in list(session.dirty) + list(session.deleted):
+        if isinstance(instance, User):
+            forget_identity(instance.id)
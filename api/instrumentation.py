@@ -0,0 +1,205 @@
+import threading
+import time
+from flask import g, has_request_context, request, request_started, request_finished
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class RequestMetrics:
+    """Custos acumulados durante uma requisição"""
+
+    __slots__ = ('started_at', 'queries', 'db_seconds', 'rows', 'serialization_seconds')
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.serialization_seconds = 0.0
+
+
+def current_metrics():
+    """Métricas da requisição atual (ou None fora de requisição/instrumentação)"""
+    if not has_request_context():
+        return None
+    return g.get('_request_metrics')
+
+
+class MetricsRegistry:
+    """Totais por endpoint no formato de sumários Prometheus (_count/_sum)"""
+
+    # (nome da métrica, atributo acumulado, descrição)
+    SUMMARIES = [
+        ('fireng_request_duration_seconds', 'duration_seconds', 'Duração total da requisição'),
+        ('fireng_request_db_queries', 'queries', 'Consultas SQL executadas'),
+        ('fireng_request_db_seconds', 'db_seconds', 'Tempo gasto no banco de dados'),
+        ('fireng_request_db_rows', 'rows', 'Linhas retornadas/afetadas informadas pelo driver'),
+        ('fireng_request_serialization_seconds', 'serialization_seconds', 'Tempo de serialização JSON'),
+        ('fireng_response_bytes', 'response_bytes', 'Tamanho do corpo da resposta'),
+    ]
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, method, status, values):
+        key = (endpoint, method, status)
+        with self._lock:
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = {'count': 0, 'max_queries': 0}
+                stats.update({attribute: 0 for _, attribute, _ in self.SUMMARIES})
+                self._endpoints[key] = stats
+
+            stats['count'] += 1
+            stats['max_queries'] = max(stats['max_queries'], values['queries'])
+            for _, attribute, _ in self.SUMMARIES:
+                stats[attribute] += values[attribute]
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def render(self):
+        """Exporta os totais no formato texto do Prometheus"""
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+
+        lines = []
+        for name, attribute, description in self.SUMMARIES:
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} summary')
+            for (endpoint, method, status), stats in endpoints:
+                labels = _labels(endpoint=endpoint, method=method, status=status)
+                lines.append(f'{name}_count{labels} {stats["count"]}')
+                lines.append(f'{name}_sum{labels} {_number(stats[attribute])}')
+
+        lines.append('# HELP fireng_request_db_queries_max Maior número de consultas SQL em uma requisição')
+        lines.append('# TYPE fireng_request_db_queries_max gauge')
+        for (endpoint, method, status), stats in endpoints:
+            labels = _labels(endpoint=endpoint, method=method, status=status)
+            lines.append(f'fireng_request_db_queries_max{labels} {stats["max_queries"]}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+
+def _number(value):
+    return f'{value:.6f}' if isinstance(value, float) else str(value)
+
+
+metrics_registry = MetricsRegistry()
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_metrics() is not None:
+        conn.info.setdefault('_query_started_at', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics = current_metrics()
+    started = conn.info.get('_query_started_at')
+    if metrics is None or not started:
+        return
+
+    metrics.queries += 1
+    metrics.db_seconds += time.perf_counter() - started.pop()
+
+    # rowcount de SELECT depende do driver (PyMySQL informa; SQLite retorna -1)
+    if cursor.rowcount and cursor.rowcount > 0:
+        metrics.rows += cursor.rowcount
+
+
+@event.listens_for(Engine, 'handle_error')
+def _handle_error(exception_context):
+    # Comando que falhou no cursor não passa por after_cursor_execute: descarta o início
+    # registrado para não ser atribuído ao próximo comando da conexão
+    connection = exception_context.connection
+    if (connection is None or exception_context.execution_context is None
+            or exception_context.statement is None):
+        return
+
+    started = connection.info.get('_query_started_at')
+    if not started:
+        return
+
+    started_at = started.pop()
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics.queries += 1
+        metrics.db_seconds += time.perf_counter() - started_at
+
+
+class InstrumentedJSONProvider(DefaultJSONProvider):
+    """Provider JSON padrão que mede o tempo de serialização da requisição"""
+
+    def dumps(self, obj, **kwargs):
+        metrics = current_metrics()
+        if metrics is None:
+            return super().dumps(obj, **kwargs)
+
+        started_at = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            metrics.serialization_seconds += time.perf_counter() - started_at
+
+
+def _on_request_started(sender, **extra):
+    g._request_metrics = RequestMetrics()
+
+
+def _on_request_finished(sender, response, **extra):
+    metrics = current_metrics()
+    if metrics is None:
+        return
+
+    duration = time.perf_counter() - metrics.started_at
+
+    # Respostas em streaming não têm tamanho conhecido neste ponto
+    response_bytes = 0 if response.is_streamed else (response.calculate_content_length() or 0)
+
+    if sender.config.get('SERVER_TIMING_ENABLED', True):
+        timings = [
+            f'db;dur={metrics.db_seconds * 1000:.1f};desc="{metrics.queries} queries"',
+            f'serialize;dur={metrics.serialization_seconds * 1000:.1f}',
+            f'total;dur={duration * 1000:.1f}',
+        ]
+        existing = response.headers.get('Server-Timing')
+        if existing:
+            timings.insert(0, existing)
+        response.headers['Server-Timing'] = ', '.join(timings)
+
+    metrics_registry.record(
+        request.endpoint or 'unmatched',
+        request.method,
+        response.status_code,
+        {
+            'duration_seconds': duration,
+            'queries': metrics.queries,
+            'db_seconds': metrics.db_seconds,
+            'rows': metrics.rows,
+            'serialization_seconds': metrics.serialization_seconds,
+            'response_bytes': response_bytes,
+        }
+    )
+
+
+def init_instrumentation(app):
+    """Ativa a coleta de métricas por requisição (INSTRUMENTATION_ENABLED)"""
+    if not app.config.get('INSTRUMENTATION_ENABLED', True):
+        return
+
+    app.json = InstrumentedJSONProvider(app)
+    request_started.connect(_on_request_started, app)
+    request_finished.connect(_on_request_finished, app)
@@ -0,0 +1,300 @@
+import json
+import logging
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from .models import db, Job
+
+logger = logging.getLogger(__name__)
+
+# Executores registrados por tipo de tarefa ('auto_inspections.generate' -> função)
+JOB_HANDLERS = {}
+
+# Tipos enfileirados apenas pelo código da aplicação (o payload não é confiável
+# vindo do cliente, ex.: referência a um arquivo gravado pela rota); POST /api/jobs os recusa
+INTERNAL_JOB_TYPES = set()
+
+# Candidatas tentadas por claim_next quando outro executor reserva a mesma tarefa antes
+CLAIM_ATTEMPTS = 5
+
+
+class JobError(Exception):
+    """Tipo de tarefa desconhecido ou parâmetros inválidos"""
+
+
+class JobsUnavailable(JobError):
+    """Nenhum executor configurado para processar a fila (resultará em HTTP 503)"""
+
+    def __init__(self, message='Nenhum executor de tarefas configurado; execute a operação sem async'):
+        super().__init__(message)
+
+
+def job_handler(job_type, public=True):
+    """Registra o executor de um tipo de tarefa
+
+    O executor recebe um JobContext e retorna um dicionário serializável em JSON,
+    gravado como resultado da tarefa. Com public=False o tipo não pode ser
+    enfileirado por POST /api/jobs, apenas pelo código da aplicação.
+    """
+    def decorator(fn):
+        JOB_HANDLERS[job_type] = fn
+        if not public:
+            INTERNAL_JOB_TYPES.add(job_type)
+        return fn
+    return decorator
+
+
+def public_job_types():
+    """Tipos de tarefa que podem ser enfileirados por POST /api/jobs"""
+    return sorted(set(JOB_HANDLERS) - INTERNAL_JOB_TYPES)
+
+
+def _config(name, default):
+    try:
+        return current_app.config.get(name, default)
+    except RuntimeError:
+        return default
+
+
+def workers_configured():
+    """Indica se há executor para a fila: embutido (JOBS_EMBEDDED_WORKERS) ou externo
+
+    Um executor externo (`flask jobs worker` em outro processo ou máquina) não
+    é visível daqui; JOBS_EXTERNAL_WORKER declara que ele existe. Sem nenhum dos
+    dois (ex.: Vercel sem executor separado) a tarefa ficaria pendente para sempre.
+    """
+    return _config('JOBS_EMBEDDED_WORKERS', 0) > 0 or _config('JOBS_EXTERNAL_WORKER', False)
+
+
+def enqueue(job_type, payload=None, created_by=None, public=False):
+    """Grava uma nova tarefa pendente e retorna o Job
+
+    Recusa (JobsUnavailable) quando nenhum executor está configurado. public=True
+    (pedido vindo do cliente) aceita apenas os tipos de public_job_types().
+    """
+    if not workers_configured():
+        raise JobsUnavailable()
+
+    if job_type not in JOB_HANDLERS or (public and job_type in INTERNAL_JOB_TYPES):
+        raise JobError(f'Tipo de tarefa desconhecido: {job_type}. Opções: {", ".join(public_job_types())}')
+
+    if payload is not None and not isinstance(payload, dict):
+        raise JobError('payload deve ser um objeto JSON')
+
+    job = Job(job_type=job_type, payload=json.dumps(payload or {}), created_by=created_by)
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+class JobContext:
+    """Parâmetros e relatório de progresso de uma tarefa em execução"""
+
+    def __init__(self, job):
+        self.job_id = job.id
+        self.job_type = job.job_type
+        self.payload = job.get_payload()
+        self.created_by = job.created_by
+
+    def report(self, progress=None, message=None):
+        """Grava o progresso (0-100) e/ou uma mensagem
+
+        Confirma a transação corrente: executores gravam em lotes idempotentes,
+        de forma que o trabalho já confirmado não se perde se a tarefa falhar.
+        """
+        values = {'updated_at': datetime.utcnow()}
+        if progress is not None:
+            values['progress'] = max(0, min(100, int(progress)))
+        if message is not None:
+            values['progress_message'] = message[:255]
+
+        db.session.execute(db.update(Job).where(Job.id == self.job_id).values(**values))
+        db.session.commit()
+
+
+def _fail_exhausted(stale_before, max_attempts):
+    """Marca como falhas as tarefas abandonadas que esgotaram as tentativas"""
+    db.session.execute(
+        db.update(Job).where(
+            Job.status == Job.STATUS_RUNNING,
+            Job.updated_at < stale_before,
+            Job.attempts >= max_attempts
+        ).values(
+            status=Job.STATUS_FAILED,
+            error='Tarefa abandonada pelo executor (tentativas esgotadas)',
+            finished_at=datetime.utcnow()
+        )
+    )
+
+
+def claim_next(worker_id):
+    """Reserva a próxima tarefa pendente (ou abandonada) para este executor
+
+    A reserva é um UPDATE condicional ao status/tentativas lidos (compare-and-swap):
+    só um executor consegue mudar a linha, em qualquer banco. Não há SELECT ...
+    FOR UPDATE: com autocommit (conexão MySQL da aplicação) o bloqueio terminaria
+    junto com o próprio SELECT. O executor que perde a disputa tenta a candidata
+    seguinte, até CLAIM_ATTEMPTS vezes.
+    """
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=_config('JOBS_STALE_AFTER', 900))
+    max_attempts = _config('JOBS_MAX_ATTEMPTS', 3)
+
+    _fail_exhausted(stale_before, max_attempts)
+
+    last_id = 0
+    for _ in range(CLAIM_ATTEMPTS):
+        candidate = db.session.query(Job.id, Job.status, Job.attempts).filter(
+            db.or_(
+                Job.status == Job.STATUS_QUEUED,
+                db.and_(Job.status == Job.STATUS_RUNNING, Job.updated_at < stale_before)
+            ),
+            Job.attempts < max_attempts,
+            Job.id > last_id
+        ).order_by(Job.id).limit(1).first()
+
+        if candidate is None:
+            break
+
+        claimed = db.session.execute(
+            db.update(Job).where(
+                Job.id == candidate.id,
+                Job.status == candidate.status,
+                Job.attempts == candidate.attempts
+            ).values(
+                status=Job.STATUS_RUNNING,
+                worker_id=worker_id,
+                attempts=Job.attempts + 1,
+                started_at=now,
+                updated_at=now,
+                error=None
+            )
+        ).rowcount
+        db.session.commit()
+
+        if claimed:
+            return db.session.get(Job, candidate.id)
+
+        last_id = candidate.id
+
+    db.session.commit()
+    return None
+
+
+def run_job(job):
+    """Executa uma tarefa já reservada e grava resultado ou erro"""
+    handler = JOB_HANDLERS.get(job.job_type)
+    job_id = job.id
+
+    try:
+        if handler is None:
+            raise JobError(f'Tipo de tarefa desconhecido: {job.job_type}')
+
+        result = handler(JobContext(job))
+        db.session.commit()
+
+        job = db.session.get(Job, job_id)
+        job.status = Job.STATUS_SUCCEEDED
+        job.result = json.dumps(result, default=str) if result is not None else None
+        job.progress = 100
+    except Exception as e:
+        db.session.rollback()
+        logger.exception('Tarefa %s (%s) falhou', job_id, job.job_type)
+
+        job = db.session.get(Job, job_id)
+        job.status = Job.STATUS_FAILED
+        job.error = str(e)
+
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+    return job
+
+
+class JobWorker:
+    """Executor local de tarefas: threads que consultam a fila no banco
+
+    Não depende de broker externo; vários processos (ou máquinas) podem rodar
+    executores sobre o mesmo banco.
+    """
+
+    def __init__(self, app, threads=1, poll_interval=2.0, name=None):
+        self.app = app
+        self.threads = max(1, threads)
+        self.poll_interval = poll_interval
+        self.name = name or f'{socket.gethostname()}:{os.getpid()}'
+        self._stop = threading.Event()
+        self._threads = []
+
+    def run_once(self, worker_id=None):
+        """Reserva e executa uma tarefa; retorna o Job executado ou None se a fila estiver vazia"""
+        with self.app.app_context():
+            try:
+                job = claim_next(worker_id or self.name)
+                return run_job(job) if job else None
+            finally:
+                db.session.remove()
+
+    def drain(self):
+        """Executa tarefas até a fila esvaziar; retorna quantas foram executadas"""
+        executed = 0
+        while self.run_once():
+            executed += 1
+        return executed
+
+    def _loop(self, worker_id):
+        while not self._stop.is_set():
+            try:
+                job = self.run_once(worker_id)
+            except Exception:
+                logger.exception('Erro no executor de tarefas %s', worker_id)
+                job = None
+
+            if job is None:
+                self._stop.wait(self.poll_interval)
+
+    def start(self):
+        for index in range(self.threads):
+            thread = threading.Thread(
+                target=self._loop, args=(f'{self.name}/{index}',),
+                name=f'job-worker-{index}', daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_forever(self):
+        """Bloqueia executando tarefas até KeyboardInterrupt"""
+        self.start()
+        try:
+            while any(thread.is_alive() for thread in self._threads):
+                self._stop.wait(1.0)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+
+def init_jobs(app):
+    """Inicia executores embutidos no processo web quando JOBS_EMBEDDED_WORKERS > 0
+
+    Útil em desenvolvimento local; em produção (Vercel) rode `flask jobs worker`
+    em um processo separado e defina JOBS_EXTERNAL_WORKER=true, senão as rotas
+    recusam enfileirar (503).
+    """
+    threads = app.config.get('JOBS_EMBEDDED_WORKERS', 0)
+    if threads > 0:
+        # Os executores são registrados na importação dos módulos de rotas (LAZY_STARTUP)
+        lazy_routes = app.extensions.get('lazy_routes')
+        if lazy_routes is not None:
+            lazy_routes.load_all()
+        app.extensions['job_worker'] = JobWorker(
+            app, threads=threads, poll_interval=app.config.get('JOBS_POLL_INTERVAL', 2.0)
+        ).start()
@@ -0,0 +1,50 @@
+from sqlalchemy.orm import joinedload, selectinload, subqueryload, lazyload
+
+# Estratégias de carregamento de relacionamentos disponíveis
+LOADER_STRATEGIES = {
+    'joined': joinedload,      # muitos-para-um: LEFT JOIN na mesma consulta
+    'selectin': selectinload,  # coleções: uma consulta extra com IN (...) por lote
+    'subquery': subqueryload,
+    'lazy': lazyload,
+}
+
+
+class LoadingError(ValueError):
+    """Parâmetro include inválido (resultará em HTTP 400)"""
+
+
+def parse_include(value, model):
+    """Valida o parâmetro include= contra os relacionamentos carregáveis do modelo
+
+    Sem o parâmetro, todos os relacionamentos de EAGER_LOADERS são incluídos;
+    include=none não inclui nenhum.
+    """
+    available = list(model.EAGER_LOADERS)
+
+    if value is None:
+        return available
+
+    relations = [name.strip() for name in value.split(',') if name.strip()]
+    if relations == ['none']:
+        return []
+
+    invalid = [name for name in relations if name not in available]
+    if invalid:
+        raise LoadingError(f'Relacionamentos inválidos: {", ".join(invalid)}. Opções: {", ".join(available)}')
+
+    return relations
+
+
+def eager_load(query, model, relations, strategies=None):
+    """Aplica à consulta as estratégias de carregamento dos relacionamentos pedidos
+
+    A estratégia padrão vem de model.EAGER_LOADERS e pode ser substituída por
+    relacionamento em strategies (ex.: {'standards': 'joined'}).
+    """
+    strategies = strategies or {}
+
+    for name in relations:
+        strategy = strategies.get(name, model.EAGER_LOADERS[name])
+        query = query.options(LOADER_STRATEGIES[strategy](getattr(model, name)))
+
+    return query
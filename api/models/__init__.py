@@ -1,8 +1,6 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 
 db = SQLAlchemy()
-migrate = Migrate()
 
 # Importar modelos na ordem correta (respeitando dependências)
 from .user import User
@@ -15,11 +13,13 @@ from .inventory import Inventory
 from .equipment import Equipment, equipment_standards
 from .maintenance import Maintenance
 from .inspection import Inspection
+from .inspection_schedule import InspectionSchedule
 from .technician import Technician
+from .attachment import Attachment, AttachmentBlob
+from .job import Job
 
 __all__ = [
     'db', 
-    'migrate', 
     'User', 
     'Client', 
     'Branch',
@@ -31,6 +31,10 @@ __all__ = [
     'equipment_standards',
     'Maintenance',
     'Inspection', 
-    'Technician'
+    'InspectionSchedule',
+    'Technician',
+    'Attachment',
+    'AttachmentBlob',
+    'Job'
 ]
 
@@ -0,0 +1,97 @@
+import json
+from datetime import datetime
+from sqlalchemy.dialects.mysql import LONGBLOB
+from . import db
+
+class Attachment(db.Model):
+    """Modelo de anexo - Conteúdo binário endereçado por hash (assinaturas e fotos)"""
+    
+    __tablename__ = 'attachments'
+    
+    # Prefixo das referências gravadas nas colunas signature/photos
+    REFERENCE_PREFIX = 'attachment:'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    sha256 = db.Column(db.String(64), unique=True, nullable=False, index=True)
+    content_type = db.Column(db.String(100), nullable=False, default='application/octet-stream')
+    size = db.Column(db.Integer, nullable=False)
+    storage_backend = db.Column(db.String(20), nullable=False, default='local')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<Attachment {self.sha256[:12]} - {self.content_type}>'
+    
+    @property
+    def reference(self):
+        """Referência gravada nas linhas que usam o anexo"""
+        return f'{self.REFERENCE_PREFIX}{self.sha256}'
+    
+    @property
+    def url(self):
+        return Attachment.url_for_digest(self.sha256)
+    
+    def to_dict(self):
+        """Serializa o anexo para dicionário"""
+        return {
+            'id': self.id,
+            'sha256': self.sha256,
+            'reference': self.reference,
+            'url': self.url,
+            'content_type': self.content_type,
+            'size': self.size,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+    
+    @staticmethod
+    def is_reference(value):
+        """Verifica se o valor é uma referência de anexo ('attachment:<sha256>')"""
+        return isinstance(value, str) and value.startswith(Attachment.REFERENCE_PREFIX)
+    
+    @staticmethod
+    def digest_from_reference(value):
+        """Extrai o hash de uma referência de anexo"""
+        return value[len(Attachment.REFERENCE_PREFIX):]
+    
+    @staticmethod
+    def url_for_digest(digest):
+        return f'/api/attachments/{digest}'
+    
+    @staticmethod
+    def photo_urls(value):
+        """URLs das fotos de uma lista JSON (referências viram /api/attachments/<sha256>)
+
+        URLs externas são mantidas; fotos ainda inline (base64 legado) ficam como
+        None e continuam disponíveis no campo photos.
+        """
+        if not value:
+            return []
+        
+        try:
+            photos = json.loads(value)
+        except ValueError:
+            photos = [value]
+        
+        if not isinstance(photos, list):
+            photos = [photos]
+        
+        urls = []
+        for photo in photos:
+            if Attachment.is_reference(photo):
+                urls.append(Attachment.url_for_digest(Attachment.digest_from_reference(photo)))
+            elif isinstance(photo, str) and photo.startswith(('http://', 'https://', '/')):
+                urls.append(photo)
+            else:
+                urls.append(None)
+        return urls
+
+
+class AttachmentBlob(db.Model):
+    """Conteúdo dos anexos no próprio banco (backend 'database')"""
+    
+    __tablename__ = 'attachment_blobs'
+    
+    sha256 = db.Column(db.String(64), primary_key=True)
+    data = db.Column(db.LargeBinary().with_variant(LONGBLOB(), 'mysql'), nullable=False)
+    
+    def __repr__(self):
+        return f'<AttachmentBlob {self.sha256[:12]}>'
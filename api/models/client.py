@@ -1,11 +1,30 @@
+import re
+import unicodedata
 from datetime import datetime
+from sqlalchemy import event, DDL
 from . import db
 
+
+def normalize_search_text(value):
+    """Normaliza texto para busca: minúsculas, sem acentos e espaços simples"""
+    value = unicodedata.normalize('NFKD', value or '')
+    value = ''.join(char for char in value if not unicodedata.combining(char))
+    return ' '.join(value.lower().split())
+
+
+def only_digits(value):
+    """Mantém apenas os dígitos (ex.: CPF/CNPJ sem pontuação)"""
+    return re.sub(r'\D', '', value or '')
+
+
 class Client(db.Model):
     """Modelo de cliente"""
     
     __tablename__ = 'clients'
     
+    # Colunas internas fora da serialização por colunas (api/serialization.py)
+    JSON_EXCLUDE = ('search_text', 'cpf_cnpj_digits')
+    
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
@@ -17,6 +36,9 @@ class Client(db.Model):
     zip_code = db.Column(db.String(10))
     is_active = db.Column(db.Boolean, default=True)
     notes = db.Column(db.Text)
+    # Campos derivados para busca (mantidos automaticamente antes de gravar)
+    search_text = db.Column(db.String(255))  # nome + email + dígitos do CPF/CNPJ normalizados
+    cpf_cnpj_digits = db.Column(db.String(20), index=True)  # busca por prefixo usa o índice
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -29,6 +51,12 @@ class Client(db.Model):
     def __repr__(self):
         return f'<Client {self.name}>'
     
+    def refresh_search_fields(self):
+        """Recalcula os campos derivados usados pela busca"""
+        self.cpf_cnpj_digits = only_digits(self.cpf_cnpj) or None
+        parts = [normalize_search_text(self.name), normalize_search_text(self.email), self.cpf_cnpj_digits]
+        self.search_text = ' '.join(part for part in parts if part)[:255]
+    
     def to_dict(self, include_relations=False):
         """Serializa o cliente para dicionário"""
         data = {
@@ -55,3 +83,33 @@ class Client(db.Model):
         
         return data
 
+
+
+@event.listens_for(Client, 'before_insert')
+@event.listens_for(Client, 'before_update')
+def _refresh_client_search_fields(mapper, connection, target):
+    target.refresh_search_fields()
+
+
+# Índices de texto completo sobre search_text, criados junto com a tabela:
+# FULLTEXT no MySQL e tabela virtual FTS5 (sincronizada por triggers) no SQLite
+CLIENT_SEARCH_DDL = {
+    'mysql': [
+        'ALTER TABLE clients ADD FULLTEXT INDEX ft_clients_search_text (search_text)',
+    ],
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS clients_fts USING fts5("
+        "search_text, content='clients', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        'CREATE TRIGGER IF NOT EXISTS clients_fts_ai AFTER INSERT ON clients BEGIN '
+        'INSERT INTO clients_fts(rowid, search_text) VALUES (new.id, new.search_text); END',
+        'CREATE TRIGGER IF NOT EXISTS clients_fts_ad AFTER DELETE ON clients BEGIN '
+        "INSERT INTO clients_fts(clients_fts, rowid, search_text) VALUES ('delete', old.id, old.search_text); END",
+        'CREATE TRIGGER IF NOT EXISTS clients_fts_au AFTER UPDATE ON clients BEGIN '
+        "INSERT INTO clients_fts(clients_fts, rowid, search_text) VALUES ('delete', old.id, old.search_text); "
+        'INSERT INTO clients_fts(rowid, search_text) VALUES (new.id, new.search_text); END',
+    ],
+}
+
+for _dialect, _statements in CLIENT_SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(Client.__table__, 'after_create', DDL(_statement).execute_if(dialect=_dialect))
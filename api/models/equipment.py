@@ -1,5 +1,8 @@
 from datetime import datetime
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
 from . import db
+from .inventory import Inventory
 
 # Tabela de relacionamento N:N entre Equipment e Standard
 equipment_standards = db.Table('equipment_standards',
@@ -34,12 +37,18 @@ class Equipment(db.Model):
     
     STATUSES = [STATUS_ACTIVE, STATUS_INACTIVE, STATUS_MAINTENANCE, STATUS_EXPIRED]
     
+    # Relacionamentos serializados em to_dict e estratégia padrão de carregamento nas listagens
+    EAGER_LOADERS = {
+        'inventory': 'joined',
+        'standards': 'selectin',
+    }
+    
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     type = db.Column(db.String(50), nullable=False)
     manufacturer = db.Column(db.String(100))
     model = db.Column(db.String(100))
-    serial_number = db.Column(db.String(100))
+    serial_number = db.Column(db.String(100), index=True)  # verificado a cada cadastro
     tag_number = db.Column(db.String(50))  # Número de identificação/plaqueta
     manufacturing_date = db.Column(db.Date)
     installation_date = db.Column(db.Date)
@@ -52,7 +61,7 @@ class Equipment(db.Model):
     notes = db.Column(db.Text)
     
     # Foreign Keys
-    inventory_id = db.Column(db.Integer, db.ForeignKey('inventories.id'))
+    inventory_id = db.Column(db.Integer, db.ForeignKey('inventories.id'), index=True)
     
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -65,8 +74,11 @@ class Equipment(db.Model):
     def __repr__(self):
         return f'<Equipment {self.id} - {self.name}>'
     
-    def to_dict(self, include_relations=False):
-        """Serializa o equipamento para dicionário"""
+    def to_dict(self, include_relations=False, relations=None):
+        """Serializa o equipamento para dicionário
+        
+        relations restringe os relacionamentos incluídos (padrão: todos de EAGER_LOADERS).
+        """
         data = {
             'id': self.id,
             'name': self.name,
@@ -90,12 +102,14 @@ class Equipment(db.Model):
         }
         
         if include_relations:
-            if self.inventory:
+            relations = self.EAGER_LOADERS if relations is None else relations
+            
+            if 'inventory' in relations and self.inventory:
                 data['inventory'] = {
                     'id': self.inventory.id,
                     'branch_id': self.inventory.branch_id
                 }
-            if self.standards:
+            if 'standards' in relations and self.standards:
                 data['standards'] = [
                     {
                         'id': std.id,
@@ -116,3 +130,79 @@ class Equipment(db.Model):
     def validate_status(status):
         """Valida se o status é válido"""
         return status in Equipment.STATUSES
+
+
+def _committed_value(instance, key):
+    """Valor do atributo antes das alterações pendentes no flush"""
+    history = inspect(instance).attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(instance, key)
+
+
+def _counter_deltas(session):
+    """Variação dos contadores por inventário causada pelos equipamentos do flush"""
+    deltas = {}
+
+    def add(inventory_id, equipment_type, amount):
+        if inventory_id is None:
+            return
+        counters = deltas.setdefault(inventory_id, {})
+        counters['total_equipments'] = counters.get('total_equipments', 0) + amount
+        column = Inventory.TYPE_COUNTERS.get(equipment_type)
+        if column:
+            counters[column] = counters.get(column, 0) + amount
+
+    for instance in session.new:
+        if isinstance(instance, Equipment):
+            add(instance.inventory_id, instance.type, 1)
+
+    for instance in session.deleted:
+        if isinstance(instance, Equipment):
+            add(_committed_value(instance, 'inventory_id'), _committed_value(instance, 'type'), -1)
+
+    for instance in session.dirty:
+        if isinstance(instance, Equipment) and instance not in session.deleted:
+            before = (_committed_value(instance, 'inventory_id'), _committed_value(instance, 'type'))
+            after = (instance.inventory_id, instance.type)
+            if before != after:
+                add(*before, -1)
+                add(*after, 1)
+
+    return deltas
+
+
+@event.listens_for(Session, 'after_flush')
+def _update_inventory_counts(session, flush_context):
+    """Atualiza os contadores dos inventários com UPDATE atômico (coluna = coluna + n)"""
+    deltas = _counter_deltas(session)
+    if not deltas:
+        return
+
+    table = Inventory.__table__
+    connection = session.connection()
+    for inventory_id, counters in deltas.items():
+        values = {
+            column: db.func.coalesce(table.c[column], 0) + amount
+            for column, amount in counters.items() if amount
+        }
+        if values:
+            connection.execute(table.update().where(table.c.id == inventory_id).values(**values))
+
+    session.info.setdefault('_inventory_counts_changed', set()).update(deltas)
+
+
+@event.listens_for(Session, 'after_flush_postexec')
+def _expire_inventory_counts(session, flush_context):
+    """Descarta os contadores em memória dos inventários atualizados via SQL"""
+    changed = session.info.pop('_inventory_counts_changed', None)
+    if not changed:
+        return
+
+    columns = ['total_equipments'] + list(Inventory.TYPE_COUNTERS.values())
+    for inventory_id in changed:
+        instance = session.identity_map.get(inspect(Inventory).identity_key_from_primary_key((inventory_id,)))
+        if instance is not None:
+            session.expire(instance, columns)
@@ -1,11 +1,25 @@
 from datetime import datetime
 from . import db
+from .attachment import Attachment
 
 class Inspection(db.Model):
     """Modelo de inspeção"""
     
     __tablename__ = 'inspections'
     
+    # Índices dos filtros da listagem (sempre com a ordenação scheduled_date, id da paginação)
+    # e da busca de inspeções pendentes por equipamento na geração automática
+    __table_args__ = (
+        db.Index('ix_inspections_scheduled_date_id', 'scheduled_date', 'id'),
+        db.Index('ix_inspections_technician_scheduled', 'technician_id', 'scheduled_date', 'id'),
+        db.Index('ix_inspections_client_scheduled', 'client_id', 'scheduled_date', 'id'),
+        db.Index('ix_inspections_team_scheduled', 'team_id', 'scheduled_date', 'id'),
+        db.Index('ix_inspections_status_scheduled', 'status', 'scheduled_date', 'id'),
+        db.Index('ix_inspections_equipment_scheduled_status', 'equipment_id', 'scheduled_date', 'status'),
+        # Uma inspeção gerada por equipamento e data; origin NULL (manual) não entra na unicidade
+        db.Index('uq_inspections_equipment_scheduled_origin', 'equipment_id', 'scheduled_date', 'origin', unique=True),
+    )
+    
     # Status possíveis
     STATUS_PENDING = 'pendente'
     STATUS_IN_PROGRESS = 'em_andamento'
@@ -14,6 +28,15 @@ class Inspection(db.Model):
     
     STATUSES = [STATUS_PENDING, STATUS_IN_PROGRESS, STATUS_COMPLETED, STATUS_CANCELLED]
     
+    # Origem das inspeções criadas pela geração automática (manuais ficam com NULL)
+    ORIGIN_AUTO = 'auto'
+    
+    # Campos calculados da serialização por colunas (api/serialization.py), como no to_dict
+    JSON_COMPUTED = {
+        'photo_urls': lambda data: Attachment.photo_urls(data['photos']),
+        'signature_url': lambda data: f'/api/inspections/{data["id"]}/signature' if data['signature'] else None,
+    }
+    
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
@@ -23,6 +46,7 @@ class Inspection(db.Model):
     priority = db.Column(db.String(20), default='media')  # baixa, media, alta, urgente
     location = db.Column(db.String(255))
     equipment = db.Column(db.String(100))
+    origin = db.Column(db.String(20))
     
     # Chaves estrangeiras
     client_id = db.Column(db.Integer, db.ForeignKey('clients.id'), nullable=False)
@@ -36,8 +60,8 @@ class Inspection(db.Model):
     # Campos de resultado
     result = db.Column(db.Text)
     observations = db.Column(db.Text)
-    photos = db.Column(db.Text)  # JSON string com URLs das fotos
-    signature = db.Column(db.Text)  # Base64 da assinatura
+    photos = db.Column(db.Text)  # JSON string com URLs/referências de anexos das fotos
+    signature = db.Column(db.Text)  # Referência do anexo da assinatura ('attachment:<sha256>')
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -66,6 +90,7 @@ class Inspection(db.Model):
             'priority': self.priority,
             'location': self.location,
             'equipment': self.equipment,
+            'origin': self.origin,
             'client_id': self.client_id,
             'technician_id': self.technician_id,
             'created_by': self.created_by,
@@ -76,7 +101,10 @@ class Inspection(db.Model):
             'result': self.result,
             'observations': self.observations,
             'photos': self.photos,
+            'photo_urls': Attachment.photo_urls(self.photos),
+            # Referência do anexo (ou base64 legado ainda não externalizado); o conteúdo é servido por signature_url
             'signature': self.signature,
+            'signature_url': f'/api/inspections/{self.id}/signature' if self.signature else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
@@ -0,0 +1,53 @@
+from datetime import datetime
+from . import db
+from ..services.recurrence import RecurrenceRule, UNIT_DAYS, UNITS
+
+class InspectionSchedule(db.Model):
+    """Modelo de periodicidade de inspeção
+
+    Cada linha define a recorrência de um escopo: tipo de equipamento, norma,
+    contrato ou combinações (ex.: contrato + tipo). Colunas NULL significam
+    "qualquer"; o escopo mais específico prevalece na resolução.
+    """
+
+    __tablename__ = 'inspection_schedules'
+
+    UNITS = list(UNITS)
+
+    id = db.Column(db.Integer, primary_key=True)
+    equipment_type = db.Column(db.String(50))
+    standard_id = db.Column(db.Integer, db.ForeignKey('standards.id'))
+    contract_id = db.Column(db.Integer, db.ForeignKey('contracts.id'))
+    interval = db.Column(db.Integer, nullable=False)
+    unit = db.Column(db.String(10), default=UNIT_DAYS, nullable=False)
+    skip_weekends = db.Column(db.Boolean, default=False, nullable=False)
+    description = db.Column(db.String(255))
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<InspectionSchedule {self.scope} - {self.interval} {self.unit}>'
+
+    @property
+    def scope(self):
+        """Chave do escopo (contract_id, standard_id, equipment_type)"""
+        return (self.contract_id, self.standard_id, self.equipment_type)
+
+    def to_rule(self):
+        return RecurrenceRule(self.interval, self.unit, self.skip_weekends)
+
+    def to_dict(self):
+        """Serializa a periodicidade para dicionário"""
+        return {
+            'id': self.id,
+            'equipment_type': self.equipment_type,
+            'standard_id': self.standard_id,
+            'contract_id': self.contract_id,
+            'interval': self.interval,
+            'unit': self.unit,
+            'skip_weekends': self.skip_weekends,
+            'description': self.description,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
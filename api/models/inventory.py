@@ -14,6 +14,23 @@ class Inventory(db.Model):
     
     STATUSES = [STATUS_UPDATED, STATUS_PENDING, STATUS_AUDITING, STATUS_OUTDATED]
     
+    # Coluna de contador de cada tipo de equipamento (demais tipos contam apenas no total)
+    TYPE_COUNTERS = {
+        'extintor': 'extinguishers_count',
+        'hidrante': 'hydrants_count',
+        'sprinkler': 'sprinklers_count',
+        'alarme': 'alarms_count',
+        'iluminacao_emergencia': 'emergency_lights_count',
+    }
+    
+    # Relacionamentos serializados em to_dict e estratégia padrão de carregamento nas listagens.
+    # equipments só expõe equipments_count, lido do contador total_equipments: a coleção
+    # não é carregada (nenhuma resposta de inventário devolve a lista de equipamentos)
+    EAGER_LOADERS = {
+        'branch': 'joined',
+        'equipments': 'lazy',
+    }
+    
     id = db.Column(db.Integer, primary_key=True)
     
     # Foreign Keys
@@ -43,8 +60,11 @@ class Inventory(db.Model):
     def __repr__(self):
         return f'<Inventory {self.id} - Branch {self.branch_id}>'
     
-    def to_dict(self, include_relations=False):
-        """Serializa o inventário para dicionário"""
+    def to_dict(self, include_relations=False, relations=None):
+        """Serializa o inventário para dicionário
+        
+        relations restringe os relacionamentos incluídos (padrão: todos de EAGER_LOADERS).
+        """
         data = {
             'id': self.id,
             'branch_id': self.branch_id,
@@ -63,26 +83,29 @@ class Inventory(db.Model):
         }
         
         if include_relations:
-            if self.branch:
+            relations = self.EAGER_LOADERS if relations is None else relations
+            
+            if 'branch' in relations and self.branch:
                 data['branch'] = {
                     'id': self.branch.id,
                     'name': self.branch.name,
                     'company_id': self.branch.company_id
                 }
-            if hasattr(self, 'equipments'):
-                data['equipments_count'] = len(self.equipments)
+            if 'equipments' in relations:
+                data['equipments_count'] = self.total_equipments or 0
         
         return data
     
     def update_counts(self):
-        """Atualiza os contadores de equipamentos"""
-        if hasattr(self, 'equipments'):
-            self.total_equipments = len(self.equipments)
-            self.extinguishers_count = sum(1 for e in self.equipments if e.type == 'extintor')
-            self.hydrants_count = sum(1 for e in self.equipments if e.type == 'hidrante')
-            self.sprinklers_count = sum(1 for e in self.equipments if e.type == 'sprinkler')
-            self.alarms_count = sum(1 for e in self.equipments if e.type == 'alarme')
-            self.emergency_lights_count = sum(1 for e in self.equipments if e.type == 'iluminacao_emergencia')
+        """Recalcula os contadores de equipamentos com uma consulta agregada
+
+        Os contadores são mantidos incrementalmente a cada gravação de
+        equipamento; use este método (ou `flask inventories recount`) apenas para
+        reconciliar após cargas que não passam pelo ORM. Não faz commit.
+        """
+        from ..services.inventory_counters import reconcile_inventory_counts
+        reconcile_inventory_counts([self.id])
+        db.session.refresh(self)
     
     @staticmethod
     def validate_status(status):
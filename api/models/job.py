@@ -0,0 +1,74 @@
+import json
+from datetime import datetime
+from . import db
+
+class Job(db.Model):
+    """Modelo de tarefa em segundo plano (geração automática, importações, recontagens)"""
+
+    __tablename__ = 'jobs'
+
+    # Fila: tarefas pendentes na ordem de criação
+    __table_args__ = (
+        db.Index('ix_jobs_status_id', 'status', 'id'),
+    )
+
+    # Status possíveis
+    STATUS_QUEUED = 'pendente'
+    STATUS_RUNNING = 'executando'
+    STATUS_SUCCEEDED = 'concluido'
+    STATUS_FAILED = 'falhou'
+
+    STATUSES = [STATUS_QUEUED, STATUS_RUNNING, STATUS_SUCCEEDED, STATUS_FAILED]
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_type = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), default=STATUS_QUEUED, nullable=False)
+    payload = db.Column(db.Text)  # JSON com os parâmetros da tarefa
+    result = db.Column(db.Text)  # JSON com o resultado
+    error = db.Column(db.Text)
+
+    # Progresso reportado pelo executor (0-100, quando o total é conhecido)
+    progress = db.Column(db.Integer)
+    progress_message = db.Column(db.String(255))
+
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    worker_id = db.Column(db.String(100))
+    created_by = db.Column(db.Integer, db.ForeignKey('users.id'))
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<Job {self.id} - {self.job_type} ({self.status})>'
+
+    @property
+    def is_finished(self):
+        return self.status in (Job.STATUS_SUCCEEDED, Job.STATUS_FAILED)
+
+    @staticmethod
+    def _loads(value):
+        return json.loads(value) if value else None
+
+    def get_payload(self):
+        return self._loads(self.payload) or {}
+
+    def to_dict(self):
+        """Serializa a tarefa para dicionário"""
+        return {
+            'id': self.id,
+            'type': self.job_type,
+            'status': self.status,
+            'payload': self._loads(self.payload),
+            'result': self._loads(self.result),
+            'error': self.error,
+            'progress': self.progress,
+            'progress_message': self.progress_message,
+            'attempts': self.attempts,
+            'created_by': self.created_by,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'url': f'/api/jobs/{self.id}'
+        }
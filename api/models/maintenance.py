@@ -1,12 +1,22 @@
 from datetime import datetime
 from sqlalchemy import Numeric
 from . import db
+from .attachment import Attachment
 
 class Maintenance(db.Model):
     """Modelo de manutenção"""
     
     __tablename__ = 'maintenances'
     
+    # Índices dos filtros da listagem (sempre com a ordenação scheduled_date, id da paginação)
+    __table_args__ = (
+        db.Index('ix_maintenances_scheduled_date_id', 'scheduled_date', 'id'),
+        db.Index('ix_maintenances_technician_scheduled', 'technician_id', 'scheduled_date', 'id'),
+        db.Index('ix_maintenances_client_scheduled', 'client_id', 'scheduled_date', 'id'),
+        db.Index('ix_maintenances_status_scheduled', 'status', 'scheduled_date', 'id'),
+        db.Index('ix_maintenances_type_scheduled', 'maintenance_type', 'scheduled_date', 'id'),
+    )
+    
     # Status possíveis
     STATUS_PENDING = 'pendente'
     STATUS_IN_PROGRESS = 'em_andamento'
@@ -22,6 +32,12 @@ class Maintenance(db.Model):
     
     TYPES = [TYPE_PREVENTIVE, TYPE_CORRECTIVE, TYPE_PREDICTIVE]
     
+    # Campos calculados da serialização por colunas (api/serialization.py), como no to_dict
+    JSON_COMPUTED = {
+        'photo_urls': lambda data: Attachment.photo_urls(data['photos']),
+        'signature_url': lambda data: f'/api/maintenances/{data["id"]}/signature' if data['signature'] else None,
+    }
+    
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
@@ -46,8 +62,8 @@ class Maintenance(db.Model):
     work_performed = db.Column(db.Text)
     parts_used = db.Column(db.Text)  # JSON string com peças utilizadas
     observations = db.Column(db.Text)
-    photos = db.Column(db.Text)  # JSON string com URLs das fotos
-    signature = db.Column(db.Text)  # Base64 da assinatura
+    photos = db.Column(db.Text)  # JSON string com URLs/referências de anexos das fotos
+    signature = db.Column(db.Text)  # Referência do anexo da assinatura ('attachment:<sha256>')
     
     # Custos
     labor_cost = db.Column(Numeric(10, 2))
@@ -93,7 +109,10 @@ class Maintenance(db.Model):
             'parts_used': self.parts_used,
             'observations': self.observations,
             'photos': self.photos,
+            'photo_urls': Attachment.photo_urls(self.photos),
+            # Referência do anexo (ou base64 legado ainda não externalizado); o conteúdo é servido por signature_url
             'signature': self.signature,
+            'signature_url': f'/api/maintenances/{self.id}/signature' if self.signature else None,
             'labor_cost': float(self.labor_cost) if self.labor_cost else None,
             'parts_cost': float(self.parts_cost) if self.parts_cost else None,
             'total_cost': float(self.total_cost) if self.total_cost else None,
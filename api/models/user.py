@@ -1,6 +1,6 @@
 from datetime import datetime
-import bcrypt
 from . import db
+from ..security import password_hasher, needs_rehash
 
 class User(db.Model):
     """Modelo de usuário com controle de roles"""
@@ -31,13 +31,16 @@ class User(db.Model):
     
     def set_password(self, password):
         """Gera hash da senha usando bcrypt"""
-        # Gera salt e hash com bcrypt (12 rounds)
-        salt = bcrypt.gensalt(rounds=12)
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        # Custo definido por BCRYPT_ROUNDS; o cálculo roda no pool limitado de bcrypt
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
         """Verifica se a senha está correta"""
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        return password_hasher.check(password, self.password_hash)
+    
+    def password_needs_rehash(self):
+        """Indica se o hash foi gerado com custo diferente do BCRYPT_ROUNDS atual"""
+        return needs_rehash(self.password_hash)
     
     def has_role(self, *roles):
         """Verifica se o usuário possui uma das roles especificadas"""
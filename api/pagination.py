@@ -0,0 +1,138 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from .models import db
+
+# Limites da paginação por cursor
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+class PaginationError(ValueError):
+    """Parâmetro de paginação/projeção inválido (resultará em HTTP 400)"""
+
+
+def is_paginated(args):
+    """Indica se a requisição pediu paginação por cursor (limit ou cursor)"""
+    return 'limit' in args or 'cursor' in args
+
+
+def parse_limit(value):
+    """Converte o parâmetro limit, aplicando o padrão e o máximo"""
+    if value in (None, ''):
+        return DEFAULT_LIMIT
+
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise PaginationError('limit deve ser um número inteiro')
+
+    if limit < 1:
+        raise PaginationError('limit deve ser maior que zero')
+
+    return min(limit, MAX_LIMIT)
+
+
+def parse_offset(value):
+    """Converte o parâmetro offset (paginação de resultados ordenados por relevância)"""
+    if value in (None, ''):
+        return 0
+
+    try:
+        offset = int(value)
+    except (TypeError, ValueError):
+        raise PaginationError('offset deve ser um número inteiro')
+
+    if offset < 0:
+        raise PaginationError('offset não pode ser negativo')
+
+    return offset
+
+
+def parse_flag(value):
+    """Interpreta parâmetros booleanos de query string (true/1/yes)"""
+    return str(value).lower() in ('true', '1', 'yes')
+
+
+def encode_cursor(sort_value, row_id):
+    """Gera o cursor opaco a partir do último registro da página"""
+    if isinstance(sort_value, (datetime, date)):
+        sort_value = sort_value.isoformat()
+
+    payload = json.dumps([sort_value, row_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decodifica o cursor opaco em (sort_value, id)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError):
+        raise PaginationError('cursor inválido')
+
+
+def parse_fields(value, model, required=('id',)):
+    """Valida o parâmetro fields= contra as colunas do modelo
+
+    Retorna (campos_solicitados, colunas_selecionadas) ou (None, None) quando a
+    projeção não foi pedida. As colunas obrigatórias (ex.: chaves do cursor) são
+    sempre selecionadas, mas só aparecem na resposta se solicitadas.
+    """
+    if not value:
+        return None, None
+
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    valid_columns = model.__table__.columns.keys()
+    invalid = [field for field in fields if field not in valid_columns]
+
+    if invalid:
+        raise PaginationError(f'Campos inválidos: {", ".join(invalid)}')
+
+    selected = list(dict.fromkeys(fields + list(required)))
+    return fields, [getattr(model, name) for name in selected]
+
+
+def serialize_value(value):
+    """Converte valores de coluna em tipos serializáveis em JSON"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def row_to_dict(row, fields):
+    """Serializa uma linha projetada apenas com os campos solicitados"""
+    return {field: serialize_value(getattr(row, field)) for field in fields}
+
+
+def count_rows(query, model):
+    """Executa SELECT COUNT(*) sobre a consulta filtrada, sem carregar objetos"""
+    return query.with_entities(db.func.count(model.id)).order_by(None).scalar()
+
+
+def keyset_page(query, sort_column, id_column, cursor=None, limit=DEFAULT_LIMIT):
+    """Aplica paginação por cursor (keyset) em ordem decrescente de (sort_column, id)
+
+    Retorna (linhas, next_cursor). Busca limit + 1 linhas para saber se existe
+    uma próxima página sem precisar de COUNT.
+    """
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        query = query.filter(db.or_(
+            sort_column < sort_value,
+            db.and_(sort_column == sort_value, id_column < last_id)
+        ))
+
+    rows = query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+    return rows, next_cursor
@@ -0,0 +1,114 @@
+# Camada de resposta HTTP: compressão negociada (gzip/brotli) e respostas
+# condicionais (ETag fraco + If-None-Match) para os endpoints de listagem.
+import gzip
+import hashlib
+from flask import current_app, g, request
+
+# brotli é opcional (não está em requirements.txt); sem ele, apenas gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Tipos de conteúdo comprimidos
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html', 'text/plain', 'text/csv'}
+
+# Qualidade do brotli: 4-5 comprime melhor que o gzip nível 6 com custo de CPU parecido
+BROTLI_QUALITY = 5
+
+
+def list_etag(rows, model, extra=None):
+    """ETag fraco de uma listagem: ids e maior updated_at das linhas já carregadas
+
+    Calculado sobre a página buscada, sem consulta extra (um COUNT/MAX sobre todos
+    os filtros percorreria a tabela). As linhas devem trazer as colunas id e
+    updated_at do modelo. Inclui a URL completa, pois include/fields/cursor mudam
+    o corpo da resposta para o mesmo conjunto de linhas, e extra (ex.: o
+    next_cursor, que muda quando surgem linhas depois da última página).
+    """
+    ids = []
+    last_updated = None
+    for row in rows:
+        mapping = row._mapping
+        ids.append(str(mapping[model.id]))
+        updated_at = mapping[model.updated_at]
+        if updated_at is not None and (last_updated is None or updated_at > last_updated):
+            last_updated = updated_at
+
+    stamp = last_updated.isoformat() if last_updated else ''
+    digest = hashlib.sha256(f'{model.__tablename__}|{",".join(ids)}|{stamp}|{extra}|{request.full_path}'.encode())
+    return digest.hexdigest()[:32]
+
+
+def conditional_list(rows, model, extra=None):
+    """Valida If-None-Match da listagem antes de serializar as linhas
+
+    Retorna a resposta 304 quando o cliente já tem a versão atual; caso contrário
+    retorna None e o ETag é anexado à resposta 200 da rota (ver _apply_etag).
+    Alterações apenas em registros relacionados (ex.: nome do cliente de uma
+    inspeção) não mudam o ETag, assim como duas alterações no mesmo segundo em
+    bancos sem frações de segundo em updated_at.
+    """
+    etag = list_etag(rows, model, extra)
+    g.list_etag = etag
+
+    if not request.if_none_match.contains_weak(etag):
+        return None
+
+    response = current_app.response_class(status=304)
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _apply_etag(response):
+    etag = g.pop('list_etag', None)
+    if etag and response.status_code == 200:
+        response.set_etag(etag, weak=True)
+        # Sempre revalida com o servidor; o 304 evita a serialização e o corpo, não a consulta
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def negotiate_encoding(accept_encodings):
+    """Codificação preferida pelo cliente entre as suportadas (br, gzip) ou None"""
+    gzip_quality = accept_encodings.quality('gzip')
+    if brotli is not None:
+        br_quality = accept_encodings.quality('br')
+        if br_quality and br_quality >= gzip_quality:
+            return 'br'
+    return 'gzip' if gzip_quality else None
+
+
+def _compress(response):
+    config = current_app.config
+    if (not config.get('COMPRESSION_ENABLED', True)
+            or response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    if (response.content_length or 0) < config.get('COMPRESSION_MIN_SIZE', 1024):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    data = response.get_data()
+    if encoding == 'br':
+        response.set_data(brotli.compress(data, quality=BROTLI_QUALITY))
+    else:
+        response.set_data(gzip.compress(data, compresslevel=config.get('COMPRESSION_LEVEL', 6), mtime=0))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_responses(app):
+    """Registra ETag das listagens e compressão das respostas (after_request)"""
+    # after_request executa em ordem inversa: o ETag é aplicado antes da compressão
+    app.after_request(_compress)
+    app.after_request(_apply_etag)
@@ -1,37 +1,122 @@
-from .auth import auth_bp
-from .users import users_bp
-from .clients import clients_bp
-from .inspections import inspections_bp
-from .maintenances import maintenances_bp
-from .branches import branches_bp
-from .contracts import contracts_bp
-from .teams import teams_bp
-from .technicians import technicians_bp
-from .standards import standards_bp
-from .inventories import inventories_bp
-from .equipments import equipments_bp
-from .auto_inspections import auto_inspections_bp
-
-def register_routes(app):
-    """Registra todas as rotas da aplicação"""
+import threading
+from importlib import import_module
+
+# (módulo, blueprint, prefixo) na ordem de registro
+BLUEPRINTS = [
     # Rotas compartilhadas
-    app.register_blueprint(auth_bp, url_prefix='/api/auth')
-    
+    ('auth', 'auth_bp', '/api/auth'),
+    ('metrics', 'metrics_bp', '/api/metrics'),
+    ('jobs', 'jobs_bp', '/api/jobs'),
+
     # Rotas GAT (Gestão)
-    app.register_blueprint(users_bp, url_prefix='/api/users')
-    app.register_blueprint(clients_bp, url_prefix='/api/clients')
-    app.register_blueprint(branches_bp, url_prefix='/api/branches')
-    app.register_blueprint(contracts_bp, url_prefix='/api/contracts')
-    app.register_blueprint(teams_bp, url_prefix='/api/teams')
-    app.register_blueprint(technicians_bp, url_prefix='/api/technicians')
-    app.register_blueprint(standards_bp, url_prefix='/api/standards')
-    app.register_blueprint(inventories_bp, url_prefix='/api/inventories')
-    app.register_blueprint(equipments_bp, url_prefix='/api/equipments')
-    
+    ('users', 'users_bp', '/api/users'),
+    ('clients', 'clients_bp', '/api/clients'),
+    ('branches', 'branches_bp', '/api/branches'),
+    ('contracts', 'contracts_bp', '/api/contracts'),
+    ('teams', 'teams_bp', '/api/teams'),
+    ('technicians', 'technicians_bp', '/api/technicians'),
+    ('standards', 'standards_bp', '/api/standards'),
+    ('inventories', 'inventories_bp', '/api/inventories'),
+    ('equipments', 'equipments_bp', '/api/equipments'),
+
     # Rotas DAT (Diário de campo)
-    app.register_blueprint(inspections_bp, url_prefix='/api/inspections')
-    app.register_blueprint(maintenances_bp, url_prefix='/api/maintenances')
-    
+    ('inspections', 'inspections_bp', '/api/inspections'),
+    ('maintenances', 'maintenances_bp', '/api/maintenances'),
+    ('attachments', 'attachments_bp', '/api/attachments'),
+
     # Rotas de automação
-    app.register_blueprint(auto_inspections_bp, url_prefix='/api/auto-inspections')
+    ('auto_inspections', 'auto_inspections_bp', '/api/auto-inspections'),
+    ('inspection_schedules', 'inspection_schedules_bp', '/api/inspection-schedules'),
+]
+
+
+def _register_blueprint(app, module_name, attribute, url_prefix):
+    module = import_module(f'{__name__}.{module_name}')
+    app.register_blueprint(getattr(module, attribute), url_prefix=url_prefix)
+
+
+class LazyRoutes:
+    """Middleware WSGI que carrega grupos de rotas na primeira requisição ao seu prefixo
+
+    Evita importar todos os módulos de rotas (e compilar todas as regras de URL)
+    no cold start do Vercel: /api/health e /api/auth/login só carregam o que usam.
+    O Flask bloqueia registros depois da primeira requisição porque o mapa de URLs
+    não é protegido contra alterações concorrentes; aqui o registro é serializado
+    por um lock e cada grupo é carregado uma única vez. Pensado para o Vercel (uma
+    requisição por instância); servidores com várias threads devem usar o modo normal.
+
+    O bloqueio é liberado pelo atributo interno Flask._got_first_request (Flask
+    2.3, versão fixada em requirements.txt); se ele não existir, register_routes
+    volta ao registro completo na inicialização.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.wsgi_app = app.wsgi_app
+        self._loaders = {}
+        self._pending = {}
+        self._lock = threading.RLock()
+        app.wsgi_app = self
+        app.extensions['lazy_routes'] = self
+
+    def add(self, prefixes, loader):
+        """Registra loader(app) para ser chamado na primeira requisição a um dos prefixos"""
+        for prefix in prefixes:
+            self._pending[prefix] = loader
+
+    def _matches(self, path):
+        for prefix in list(self._pending):
+            if path == prefix or path.startswith(prefix.rstrip('/') + '/'):
+                yield prefix
+
+    def load(self, prefix):
+        with self._lock:
+            loader = self._pending.get(prefix)
+            if loader is None:
+                return
+
+            for other in [key for key, value in self._pending.items() if value is loader]:
+                del self._pending[other]
+
+            # Libera temporariamente o bloqueio de setup do Flask (ver docstring da classe)
+            got_first_request = self.app._got_first_request
+            self.app._got_first_request = False
+            try:
+                loader(self.app)
+            finally:
+                self.app._got_first_request = got_first_request
+
+    def load_all(self):
+        """Carrega todos os grupos pendentes (CLI, executores de tarefas, documentação)"""
+        with self._lock:
+            while self._pending:
+                self.load(next(iter(self._pending)))
+
+    def __call__(self, environ, start_response):
+        if self._pending:
+            for prefix in self._matches(environ.get('PATH_INFO', '')):
+                self.load(prefix)
+        return self.wsgi_app(environ, start_response)
+
+
+def register_routes(app, lazy=False):
+    """Registra todas as rotas da aplicação (com lazy=True, sob demanda por prefixo)"""
+    if lazy and not hasattr(app, '_got_first_request'):
+        app.logger.warning('LAZY_STARTUP ignorado: esta versão do Flask não tem _got_first_request')
+        lazy = False
+
+    if not lazy:
+        for entry in BLUEPRINTS:
+            _register_blueprint(app, *entry)
+        return
+
+    lazy_routes = app.extensions.get('lazy_routes') or LazyRoutes(app)
+    for module_name, attribute, url_prefix in BLUEPRINTS:
+        lazy_routes.add([url_prefix], lambda app, entry=(module_name, attribute, url_prefix): _register_blueprint(app, *entry))
+
 
+def load_all_routes(app):
+    """Garante todos os blueprints registrados (os executores de tarefas são registrados na importação)"""
+    lazy_routes = app.extensions.get('lazy_routes')
+    if lazy_routes is not None:
+        lazy_routes.load_all()
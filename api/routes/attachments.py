@@ -0,0 +1,42 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required
+from ..decorators import get_current_user
+from ..services.attachments import SHA256_PATTERN, attachment_response, attachment_visible_to
+
+attachments_bp = Blueprint('attachments', __name__)
+
+@attachments_bp.route('/<digest>', methods=['GET'])
+@jwt_required()
+def get_attachment(digest):
+    """Transmite um anexo pelo hash do conteúdo
+    ---
+    tags:
+      - 📎 Compartilhado - Anexos
+    security:
+      - Bearer: []
+    parameters:
+      - in: path
+        name: digest
+        type: string
+        required: true
+        description: SHA-256 do conteúdo (referência 'attachment:<sha256>')
+    responses:
+      200:
+        description: Conteúdo do anexo (com ETag e suporte a Range)
+      304:
+        description: Não modificado
+      404:
+        description: Anexo não encontrado (ou de inspeção/manutenção de outro técnico)
+    """
+    if not SHA256_PATTERN.fullmatch(digest):
+        return jsonify({'error': 'Anexo não encontrado'}), 404
+    
+    # Sem acesso, responde como inexistente para não confirmar o conteúdo pelo hash
+    if not attachment_visible_to(digest, get_current_user()):
+        return jsonify({'error': 'Anexo não encontrado'}), 404
+    
+    response = attachment_response(digest)
+    if response is None:
+        return jsonify({'error': 'Anexo não encontrado'}), 404
+    
+    return response
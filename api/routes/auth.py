@@ -1,10 +1,29 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, g
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
-from flasgger import swag_from
+from ..docs import swag_from
 from ..models import db, User
+from ..identity import identity_claims, load_identity
+from ..decorators import role_required
+from ..security import login_throttle, password_hasher, PasswordHasherBusy
 
 auth_bp = Blueprint('auth', __name__)
 
+
+def _client_ip():
+    """IP de origem da requisição
+
+    X-Forwarded-For só é considerado para os proxies de TRUSTED_PROXY_COUNT
+    (ProxyFix em create_app); a primeira entrada do cabeçalho é do cliente e
+    pode ser forjada.
+    """
+    return request.remote_addr
+
+
+def _with_bcrypt_timing(response):
+    """Adiciona o tempo gasto com bcrypt na requisição ao cabeçalho Server-Timing"""
+    response.headers['Server-Timing'] = f"bcrypt;dur={g.get('bcrypt_ms', 0.0):.1f}"
+    return response
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     """Registra um novo usuário
@@ -130,6 +149,10 @@ def login():
         description: Credenciais inválidas
       403:
         description: Usuário inativo
+      429:
+        description: Muitas tentativas com falha (ver cabeçalho Retry-After)
+      503:
+        description: Verificação de senha sobrecarregada, tente novamente
     """
     try:
         data = request.get_json()
@@ -137,24 +160,53 @@ def login():
         if not data or not data.get('email') or not data.get('password'):
             return jsonify({'error': 'Email e senha são obrigatórios'}), 400
         
-        user = User.query.filter_by(email=data['email']).first()
+        email = data['email']
+        client_ip = _client_ip()
+        
+        # Bloqueio por e-mail + IP e por IP antes de qualquer cálculo de bcrypt
+        retry_after = login_throttle.retry_after(email, client_ip)
+        if retry_after:
+            response = jsonify({
+                'error': 'Muitas tentativas de login. Tente novamente mais tarde',
+                'retry_after': retry_after
+            })
+            response.headers['Retry-After'] = str(retry_after)
+            return response, 429
         
-        if not user or not user.check_password(data['password']):
-            return jsonify({'error': 'Credenciais inválidas'}), 401
+        user = User.query.filter_by(email=email).first()
+        
+        try:
+            valid = user is not None and user.check_password(data['password'])
+        except PasswordHasherBusy as e:
+            return jsonify({'error': str(e)}), 503
+        
+        if not valid:
+            login_throttle.record_failure(email, client_ip)
+            return _with_bcrypt_timing(jsonify({'error': 'Credenciais inválidas'})), 401
+        
+        login_throttle.reset(email, client_ip)
         
         if not user.is_active:
             return jsonify({'error': 'Usuário inativo'}), 403
         
+        # Custo do bcrypt alterado: refaz o hash com a senha já validada
+        if user.password_needs_rehash():
+            try:
+                user.set_password(data['password'])
+                db.session.commit()
+            except PasswordHasherBusy:
+                db.session.rollback()
+        
         # Gerar tokens (identity deve ser string)
-        access_token = create_access_token(identity=str(user.id))
+        access_token = create_access_token(identity=str(user.id), additional_claims=identity_claims(user))
         refresh_token = create_refresh_token(identity=str(user.id))
         
-        return jsonify({
+        return _with_bcrypt_timing(jsonify({
             'message': 'Login realizado com sucesso',
             'access_token': access_token,
             'refresh_token': refresh_token,
             'user': user.to_dict()
-        }), 200
+        })), 200
     except Exception as e:
         print(f"Erro no login: {str(e)}")
         return jsonify({
@@ -163,6 +215,25 @@ def login():
         }), 500
 
 
+@auth_bp.route('/login/metrics', methods=['GET'])
+@jwt_required()
+@role_required('superadmin', 'admin')
+def login_metrics():
+    """Métricas de tempo do bcrypt (hash e verificação) deste processo
+    ---
+    tags:
+      - 🔐 Compartilhado - Autenticação
+    security:
+      - Bearer: []
+    responses:
+      200:
+        description: Contagem, tempo médio e máximo (ms) por operação e requisições recusadas
+      403:
+        description: Acesso negado
+    """
+    return jsonify(password_hasher.snapshot()), 200
+
+
 @auth_bp.route('/refresh', methods=['POST'])
 @jwt_required(refresh=True)
 def refresh():
@@ -184,7 +255,14 @@ def refresh():
         description: Token inválido ou expirado
     """
     user_id = get_jwt_identity()
-    access_token = create_access_token(identity=user_id)
+    
+    # Claims de role/status refletem o estado atual do usuário
+    claims = {}
+    identity = load_identity(int(user_id))
+    if identity:
+        claims = identity_claims(identity)
+    
+    access_token = create_access_token(identity=user_id, additional_claims=claims)
     
     return jsonify({
         'access_token': access_token
@@ -283,10 +361,14 @@ def change_password():
     if not data.get('current_password') or not data.get('new_password'):
         return jsonify({'error': 'Senha atual e nova senha são obrigatórias'}), 400
     
-    if not user.check_password(data['current_password']):
-        return jsonify({'error': 'Senha atual incorreta'}), 401
+    try:
+        if not user.check_password(data['current_password']):
+            return jsonify({'error': 'Senha atual incorreta'}), 401
+        
+        user.set_password(data['new_password'])
+    except PasswordHasherBusy as e:
+        return jsonify({'error': str(e)}), 503
     
-    user.set_password(data['new_password'])
     db.session.commit()
     
     return jsonify({'message': 'Senha alterada com sucesso'}), 200
@@ -1,12 +1,30 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from flasgger import swag_from
-from datetime import datetime, timedelta, date
-from ..models import db, Contract, Equipment, Inspection, Client, Branch, Inventory
+from ..docs import swag_from
+from ..models import db, Contract, Equipment, Inspection, Branch, Inventory
 from ..decorators import role_required
+from ..services.inspection_planner import InspectionPlan, generate_inspections, load_auto_inspection_stats
+from ..cache import TTLCache, invalidate_on_change
+from ..jobs import JobsUnavailable, enqueue, job_handler
+from ..pagination import parse_flag
+from .jobs import job_accepted, jobs_unavailable
 
 auto_inspections_bp = Blueprint('auto_inspections', __name__)
 
+GENERATE_JOB = 'auto_inspections.generate'
+
+# Janela máxima do planejamento (preview e geração), em meses
+MAX_MONTHS_AHEAD = 12
+
+
+def invalid_months_ahead(value):
+    """Verifica se months_ahead não é um inteiro entre 1 e MAX_MONTHS_AHEAD"""
+    return isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= MAX_MONTHS_AHEAD
+
+# Cache das estatísticas (TTL definido por STATS_CACHE_TTL; 0 desabilita)
+stats_cache = TTLCache(maxsize=1, name='auto_inspection_stats')
+invalidate_on_change(stats_cache, Contract, Branch, Inventory, Equipment, Inspection)
+
 @auto_inspections_bp.route('/generate', methods=['POST'])
 @jwt_required()
 @role_required('superadmin', 'admin', 'coord')
@@ -36,6 +54,10 @@ def generate_auto_inspections():
               type: integer
               example: 1
               description: ID específico da filial (opcional)
+            async:
+              type: boolean
+              example: true
+              description: Enfileira a geração como tarefa e responde 202 (também via ?async=true)
     responses:
       200:
         description: Inspeções geradas com sucesso
@@ -46,16 +68,28 @@ def generate_auto_inspections():
               type: string
             generated_count:
               type: integer
+            skipped_count:
+              type: integer
+              description: Datas que já possuíam inspeção pendente ou gerada (inclusive por geração concorrente)
+            elapsed_seconds:
+              type: number
+            rows_per_second:
+              type: number
+              description: Vazão de inserção (linhas/segundo)
             inspections:
               type: array
               items:
                 type: object
+      202:
+        description: Geração enfileirada; acompanhe em /api/jobs/<id>
       400:
         description: Erro na requisição
       401:
         description: Token inválido
       403:
         description: Acesso negado
+      503:
+        description: async pedido sem executor de tarefas configurado
     """
     try:
         data = request.get_json() or {}
@@ -64,152 +98,53 @@ def generate_auto_inspections():
         branch_id = data.get('branch_id')
         
         # Validar parâmetros
-        if months_ahead < 1 or months_ahead > 12:
-            return jsonify({'error': 'months_ahead deve estar entre 1 e 12'}), 400
+        if invalid_months_ahead(months_ahead):
+            return jsonify({'error': f'months_ahead deve estar entre 1 e {MAX_MONTHS_AHEAD}'}), 400
         
-        generated_inspections = []
+        created_by = int(get_jwt_identity())
         
-        # Buscar contratos ativos
-        contracts_query = Contract.query.filter_by(status=Contract.STATUS_ACTIVE)
+        # Execução em segundo plano: responde 202 com a tarefa para acompanhamento em /api/jobs/<id>
+        if data.get('async') or parse_flag(request.args.get('async')):
+            job = enqueue(GENERATE_JOB, {
+                'months_ahead': months_ahead,
+                'contract_id': contract_id,
+                'branch_id': branch_id
+            }, created_by=created_by)
+            return job_accepted(job)
         
-        if contract_id:
-            contracts_query = contracts_query.filter_by(id=contract_id)
+        result = generate_inspections(months_ahead, created_by, contract_id=contract_id, branch_id=branch_id)
         
-        contracts = contracts_query.all()
+        # INSERT via Core não passa pelo flush do ORM
+        if result['generated_count']:
+            stats_cache.invalidate()
         
-        if not contracts:
-            return jsonify({
-                'message': 'Nenhum contrato ativo encontrado',
-                'generated_count': 0,
-                'inspections': []
-            }), 200
-        
-        # Para cada contrato ativo
-        for contract in contracts:
-            # Buscar filiais da empresa
-            branches_query = Branch.query.filter_by(company_id=contract.company_id)
-            
-            if branch_id:
-                branches_query = branches_query.filter_by(id=branch_id)
-            
-            branches = branches_query.all()
-            
-            # Para cada filial
-            for branch in branches:
-                # Buscar inventário da filial
-                inventory = Inventory.query.filter_by(branch_id=branch.id).first()
-                
-                if not inventory:
-                    continue
-                
-                # Buscar equipamentos do inventário
-                equipments = Equipment.query.filter_by(inventory_id=inventory.id).all()
-                
-                # Para cada equipamento
-                for equipment in equipments:
-                    # Calcular próximas datas de inspeção
-                    inspection_dates = calculate_inspection_dates(
-                        equipment, months_ahead
-                    )
-                    
-                    # Criar inspeções para cada data
-                    for inspection_date in inspection_dates:
-                        # Verificar se já existe inspeção para esta data/equipamento
-                        existing = Inspection.query.filter_by(
-                            equipment_id=equipment.id,
-                            scheduled_date=inspection_date,
-                            status=Inspection.STATUS_PENDING
-                        ).first()
-                        
-                        if existing:
-                            continue
-                        
-                        # Criar nova inspeção
-                        inspection = Inspection(
-                            title=f"Inspeção {equipment.name} - {branch.name}",
-                            description=f"Inspeção periódica do equipamento {equipment.name} conforme contrato {contract.contract_number}",
-                            scheduled_date=inspection_date,
-                            status=Inspection.STATUS_PENDING,
-                            priority='media',
-                            location=equipment.location or branch.address,
-                            equipment=equipment.name,
-                            client_id=contract.company_id,
-                            branch_id=branch.id,
-                            equipment_id=equipment.id,
-                            contract_id=contract.id,
-                            created_by=get_jwt_identity()
-                        )
-                        
-                        db.session.add(inspection)
-                        generated_inspections.append(inspection)
-        
-        # Salvar no banco
-        db.session.commit()
-        
-        # Serializar inspeções geradas
-        inspections_data = []
-        for inspection in generated_inspections:
-            inspections_data.append({
-                'id': inspection.id,
-                'title': inspection.title,
-                'description': inspection.description,
-                'scheduled_date': inspection.scheduled_date.isoformat(),
-                'status': inspection.status,
-                'priority': inspection.priority,
-                'location': inspection.location,
-                'equipment': inspection.equipment,
-                'client_id': inspection.client_id,
-                'branch_id': inspection.branch_id,
-                'equipment_id': inspection.equipment_id,
-                'contract_id': inspection.contract_id,
-                'team_id': inspection.team_id
-            })
-        
-        return jsonify({
-            'message': f'Inspeções geradas com sucesso',
-            'generated_count': len(generated_inspections),
-            'inspections': inspections_data
-        }), 200
+        return jsonify(result), 200
         
+    except JobsUnavailable as e:
+        return jobs_unavailable(e)
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': f'Erro ao gerar inspeções: {str(e)}'}), 500
 
-def calculate_inspection_dates(equipment, months_ahead):
-    """Calcula as datas de inspeção baseadas no tipo de equipamento"""
-    dates = []
-    today = date.today()
-    end_date = today + timedelta(days=months_ahead * 30)
-    
-    # Definir periodicidade por tipo de equipamento
-    inspection_intervals = {
-        Equipment.TYPE_EXTINGUISHER: 30,  # Mensal
-        Equipment.TYPE_HYDRANT: 90,       # Trimestral
-        Equipment.TYPE_SPRINKLER: 180,    # Semestral
-        Equipment.TYPE_ALARM: 30,        # Mensal
-        Equipment.TYPE_EMERGENCY_LIGHT: 90, # Trimestral
-        Equipment.TYPE_FIRE_DOOR: 180,    # Semestral
-        Equipment.TYPE_HOSE: 90,          # Trimestral
-        Equipment.TYPE_PUMP: 90,          # Trimestral
-    }
-    
-    interval_days = inspection_intervals.get(equipment.type, 90)  # Padrão: trimestral
-    
-    # Se o equipamento tem data da última inspeção, usar como base
-    if equipment.last_inspection_date:
-        base_date = equipment.last_inspection_date
-    else:
-        # Se não tem, usar data de instalação ou hoje
-        base_date = equipment.installation_date or today
+
+# Interna: months_ahead e os filtros são validados pela rota, que exige o perfil
+@job_handler(GENERATE_JOB, public=False)
+def generate_inspections_job(context):
+    """Geração automática executada como tarefa (sem a lista de inspeções no resultado)"""
+    params = context.payload
+    result = generate_inspections(
+        params.get('months_ahead', 3),
+        context.created_by,
+        contract_id=params.get('contract_id'),
+        branch_id=params.get('branch_id'),
+        include_inspections=False,
+        progress=context.report
+    )
     
-    # Calcular próximas datas
-    current_date = base_date
-    while current_date <= end_date:
-        if current_date >= today:
-            dates.append(datetime.combine(current_date, datetime.min.time()))
-        current_date += timedelta(days=interval_days)
+    if result['generated_count']:
+        stats_cache.invalidate()
     
-    return dates
+    return result
 
 @auto_inspections_bp.route('/preview', methods=['POST'])
 @jwt_required()
@@ -237,9 +172,14 @@ def preview_auto_inspections():
             branch_id:
               type: integer
               example: 1
+            format:
+              type: string
+              enum: [json, ndjson]
+              example: ndjson
+              description: "ndjson: uma linha JSON por inspeção, seguida de {preview_count} (também via Accept: application/x-ndjson)"
     responses:
       200:
-        description: Preview das inspeções
+        description: Preview das inspeções (resposta transmitida em partes)
         schema:
           type: object
           properties:
@@ -251,6 +191,11 @@ def preview_auto_inspections():
               type: array
               items:
                 type: object
+            error:
+              type: string
+              description: Presente apenas se a transmissão foi interrompida por um erro (preview incompleto)
+      400:
+        description: months_ahead fora do intervalo de 1 a 12
     """
     try:
         data = request.get_json() or {}
@@ -258,66 +203,53 @@ def preview_auto_inspections():
         contract_id = data.get('contract_id')
         branch_id = data.get('branch_id')
         
-        preview_data = []
+        # O preview transmite todas as candidatas: mesma janela máxima da geração
+        if invalid_months_ahead(months_ahead):
+            return jsonify({'error': f'months_ahead deve estar entre 1 e {MAX_MONTHS_AHEAD}'}), 400
         
-        # Buscar contratos ativos
-        contracts_query = Contract.query.filter_by(status=Contract.STATUS_ACTIVE)
+        output_format = data.get('format') or request.args.get('format')
+        if not output_format and 'application/x-ndjson' in request.headers.get('Accept', ''):
+            output_format = 'ndjson'
         
-        if contract_id:
-            contracts_query = contracts_query.filter_by(id=contract_id)
+        # Consultas de apoio executadas uma única vez, antes do streaming
+        plan = InspectionPlan(months_ahead, contract_id=contract_id, branch_id=branch_id)
+        encode = current_app.json.dumps
         
-        contracts = contracts_query.all()
+        # Erros durante o streaming (após o status 200) não podem virar 500: o
+        # registro final informa o erro e mantém o corpo válido
+        def stream_error(error):
+            current_app.logger.exception('Erro ao transmitir o preview')
+            return f'Erro ao gerar preview: {str(error)}'
         
-        for contract in contracts:
-            # Buscar filiais da empresa
-            branches_query = Branch.query.filter_by(company_id=contract.company_id)
-            
-            if branch_id:
-                branches_query = branches_query.filter_by(id=branch_id)
+        if output_format == 'ndjson':
+            def generate_ndjson():
+                count = 0
+                try:
+                    for candidate in plan.iter_candidates():
+                        yield encode(plan.preview_dict(candidate)) + '\n'
+                        count += 1
+                except Exception as e:
+                    yield encode({'preview_count': count, 'error': stream_error(e)}) + '\n'
+                    return
+                yield encode({'preview_count': count}) + '\n'
             
-            branches = branches_query.all()
-            
-            for branch in branches:
-                # Buscar inventário da filial
-                inventory = Inventory.query.filter_by(branch_id=branch.id).first()
-                
-                if not inventory:
-                    continue
-                
-                # Buscar equipamentos do inventário
-                equipments = Equipment.query.filter_by(inventory_id=inventory.id).all()
-                
-                for equipment in equipments:
-                    # Calcular próximas datas de inspeção
-                    inspection_dates = calculate_inspection_dates(
-                        equipment, months_ahead
-                    )
-                    
-                    for inspection_date in inspection_dates:
-                        # Verificar se já existe inspeção para esta data/equipamento
-                        existing = Inspection.query.filter_by(
-                            equipment_id=equipment.id,
-                            scheduled_date=inspection_date,
-                            status=Inspection.STATUS_PENDING
-                        ).first()
-                        
-                        preview_data.append({
-                            'contract_number': contract.contract_number,
-                            'company_name': contract.company.name if contract.company else 'N/A',
-                            'branch_name': branch.name,
-                            'equipment_name': equipment.name,
-                            'equipment_type': equipment.type,
-                            'scheduled_date': inspection_date.isoformat(),
-                            'location': equipment.location or branch.address,
-                            'already_exists': existing is not None,
-                            'existing_inspection_id': existing.id if existing else None
-                        })
+            return Response(stream_with_context(generate_ndjson()), mimetype='application/x-ndjson')
+        
+        def generate_json():
+            # Mesmo formato da resposta original, emitido em partes
+            yield '{"message": ' + encode('Preview das inspeções que seriam geradas') + ', "preview": ['
+            count = 0
+            error = None
+            try:
+                for candidate in plan.iter_candidates():
+                    yield (',' if count else '') + encode(plan.preview_dict(candidate))
+                    count += 1
+            except Exception as e:
+                error = stream_error(e)
+            yield '], "preview_count": ' + str(count)
+            yield (', "error": ' + encode(error) if error else '') + '}'
         
-        return jsonify({
-            'message': 'Preview das inspeções que seriam geradas',
-            'preview_count': len(preview_data),
-            'preview': preview_data
-        }), 200
+        return Response(stream_with_context(generate_json()), mimetype='application/json')
         
     except Exception as e:
         return jsonify({'error': f'Erro ao gerar preview: {str(e)}'}), 500
@@ -332,6 +264,11 @@ def get_auto_inspection_stats():
       - 🤖 GAT - Geração Automática
     security:
       - Bearer: []
+    parameters:
+      - in: query
+        name: refresh
+        type: boolean
+        description: Ignora o cache de curta duração e recalcula
     responses:
       200:
         description: Estatísticas das inspeções
@@ -352,47 +289,17 @@ def get_auto_inspection_stats():
                 type: object
     """
     try:
-        # Contratos ativos
-        active_contracts = Contract.query.filter_by(status=Contract.STATUS_ACTIVE).count()
-        
-        # Filiais com equipamentos
-        branches_with_equipments = db.session.query(Branch).join(Inventory).join(Equipment).distinct().count()
-        
-        # Total de equipamentos
-        total_equipments = Equipment.query.count()
-        
-        # Inspeções pendentes
-        pending_inspections = Inspection.query.filter_by(status=Inspection.STATUS_PENDING).count()
+        # ?refresh=true ignora o cache e recalcula
+        if request.args.get('refresh', '').lower() == 'true':
+            stats_cache.invalidate()
         
-        # Contratos com equipamentos
-        contracts_with_equipments = []
-        contracts = Contract.query.filter_by(status=Contract.STATUS_ACTIVE).all()
-        
-        for contract in contracts:
-            branches = Branch.query.filter_by(company_id=contract.company_id).all()
-            equipments_count = 0
-            
-            for branch in branches:
-                inventory = Inventory.query.filter_by(branch_id=branch.id).first()
-                if inventory:
-                    equipments_count += Equipment.query.filter_by(inventory_id=inventory.id).count()
-            
-            if equipments_count > 0:
-                contracts_with_equipments.append({
-                    'contract_id': contract.id,
-                    'contract_number': contract.contract_number,
-                    'company_name': contract.company.name if contract.company else 'N/A',
-                    'branches_count': len(branches),
-                    'equipments_count': equipments_count
-                })
+        stats = stats_cache.get_or_set(
+            'stats',
+            load_auto_inspection_stats,
+            ttl=current_app.config.get('STATS_CACHE_TTL', 0)
+        )
         
-        return jsonify({
-            'active_contracts': active_contracts,
-            'total_branches': branches_with_equipments,
-            'total_equipments': total_equipments,
-            'pending_inspections': pending_inspections,
-            'contracts_with_equipments': contracts_with_equipments
-        }), 200
+        return jsonify(stats), 200
         
     except Exception as e:
         return jsonify({'error': f'Erro ao obter estatísticas: {str(e)}'}), 500
@@ -2,13 +2,23 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from ..models import db, Client
 from ..decorators import role_required
+from ..services.client_search import search_clients
+from ..pagination import PaginationError, parse_limit, parse_offset, parse_flag, count_rows
+from ..responses import conditional_list
+from ..serialization import json_response, serializer_for
 
 clients_bp = Blueprint('clients', __name__)
 
 @clients_bp.route('', methods=['GET'])
 @jwt_required()
 def list_clients():
-    """Lista todos os clientes"""
+    """Lista todos os clientes
+    
+    search busca por nome, email ou prefixo do CPF/CNPJ, com resultados ordenados
+    por relevância. Com limit, retorna uma página (offset/next_offset); total só
+    é calculado com include_total=true. A resposta traz um ETag fraco; com
+    If-None-Match igual a ele, retorna 304 sem corpo.
+    """
     try:
         is_active = request.args.get('is_active')
         search = request.args.get('search')
@@ -20,21 +30,53 @@ def list_clients():
             query = query.filter_by(is_active=is_active_bool)
         
         if search:
-            search_pattern = f'%{search}%'
-            query = query.filter(
-                db.or_(
-                    Client.name.ilike(search_pattern),
-                    Client.email.ilike(search_pattern),
-                    Client.cpf_cnpj.ilike(search_pattern)
-                )
-            )
+            query = search_clients(query, search)
         
-        clients = query.all()
+        # Colunas em tuplas, serializadas por colunas (sem objetos ORM)
+        serializer = serializer_for(Client)
+        query = query.with_entities(*serializer.columns)
         
-        return jsonify({
-            'clients': [client.to_dict() for client in clients],
-            'total': len(clients)
-        }), 200
+        if 'limit' not in request.args:
+            clients = query.all()
+            
+            # 304 sem serializar os clientes quando o cliente tem a versão atual
+            not_modified = conditional_list(clients, Client)
+            if not_modified:
+                return not_modified
+            
+            return json_response({
+                'clients': serializer.serialize(clients),
+                'total': len(clients)
+            })
+        
+        limit = parse_limit(request.args.get('limit'))
+        offset = parse_offset(request.args.get('offset'))
+        
+        if not search:
+            query = query.order_by(Client.name, Client.id)
+        
+        # Busca limit + 1 para saber se existe próxima página sem COUNT
+        clients = query.offset(offset).limit(limit + 1).all()
+        has_more = len(clients) > limit
+        clients = clients[:limit]
+        
+        not_modified = conditional_list(clients, Client, has_more)
+        if not_modified:
+            return not_modified
+        
+        result = {
+            'clients': serializer.serialize(clients),
+            'limit': limit,
+            'offset': offset,
+            'next_offset': offset + limit if has_more else None
+        }
+        
+        if parse_flag(request.args.get('include_total')):
+            result['total'] = count_rows(query, Client)
+        
+        return json_response(result)
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         print(f"Erro ao listar clientes: {str(e)}")
         return jsonify({
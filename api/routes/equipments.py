@@ -1,11 +1,24 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required
+from flask import Blueprint, current_app, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+import os
 from datetime import datetime
-from ..models import db, Equipment, Inventory, Standard
+from ..models import db, Equipment, Inventory, Standard, equipment_standards
 from ..decorators import role_required
+from ..loading import LoadingError, parse_include
+from ..jobs import JobsUnavailable, enqueue, job_handler, workers_configured
+from ..pagination import parse_flag
+from ..responses import conditional_list
+from ..serialization import json_response, serializer_for
+from ..services.attachments import get_store, spool_upload
+from ..services.equipment_import import ImportFileError, detect_format, import_equipments
+from ..services.reference_data import attach_standards
+from .auto_inspections import stats_cache
+from .jobs import job_accepted, jobs_unavailable
 
 equipments_bp = Blueprint('equipments', __name__)
 
+IMPORT_JOB = 'equipments.import'
+
 @equipments_bp.route('', methods=['GET'])
 @jwt_required()
 @role_required('superadmin', 'admin', 'coord', 'tecnico')
@@ -25,13 +38,26 @@ def list_equipments():
         name: is_active
         type: boolean
         description: Filtrar por status ativo/inativo
+      - in: query
+        name: include
+        type: string
+        description: "Relacionamentos incluídos, separados por vírgula (inventory, standards) ou none. Padrão: todos"
     responses:
       200:
-        description: Lista de equipamentos
+        description: Lista de equipamentos (com ETag fraco)
+      304:
+        description: Lista inalterada desde o ETag enviado em If-None-Match
+      400:
+        description: Relacionamento inválido em include
     """
     inventory_id = request.args.get('inventory_id', type=int)
     is_active = request.args.get('is_active', type=lambda v: v.lower() == 'true')
     
+    try:
+        relations = parse_include(request.args.get('include'), Equipment)
+    except LoadingError as e:
+        return jsonify({'error': str(e)}), 400
+    
     query = Equipment.query
     
     if inventory_id:
@@ -39,11 +65,56 @@ def list_equipments():
     if is_active is not None:
         query = query.filter_by(is_active=is_active)
     
-    equipments = query.all()
+    serializer = serializer_for(Equipment)
+    if 'inventory' in relations:
+        rows = query.outerjoin(Equipment.inventory).with_entities(
+            *serializer.columns, Inventory.id, Inventory.branch_id
+        ).all()
+    else:
+        rows = query.with_entities(*serializer.columns).all()
     
-    return jsonify({
-        'equipments': [equip.to_dict(include_relations=True) for equip in equipments]
-    }), 200
+    # 304 sem serializar os equipamentos (nem buscar as normas) quando o cliente tem a versão atual
+    not_modified = conditional_list(rows, Equipment)
+    if not_modified:
+        return not_modified
+    
+    return json_response({
+        'equipments': _serialize_equipments(query, rows, relations)
+    })
+
+
+def _serialize_equipments(query, rows, relations):
+    """Serializa a listagem a partir de tuplas, como to_dict(include_relations=True)
+
+    Sem instanciar objetos ORM: o inventário vem do LEFT JOIN na própria consulta
+    (como a estratégia 'joined', colunas ao final de cada linha) e as normas de uma
+    consulta extra filtrada pela mesma consulta dos equipamentos (como 'selectin').
+    """
+    equipments = serializer_for(Equipment).serialize(rows)
+    
+    if 'inventory' in relations:
+        for equip, row in zip(equipments, rows):
+            inventory_id, branch_id = row[-2:]
+            if inventory_id is not None:
+                equip['inventory'] = {'id': inventory_id, 'branch_id': branch_id}
+    
+    if 'standards' in relations and equipments:
+        equipment_ids = query.with_entities(Equipment.id).order_by(None).subquery()
+        standards = {}
+        links = db.session.query(
+            equipment_standards.c.equipment_id, Standard.id, Standard.code, Standard.name
+        ).join(
+            Standard, Standard.id == equipment_standards.c.standard_id
+        ).filter(
+            equipment_standards.c.equipment_id.in_(db.select(equipment_ids.c.id))
+        )
+        for equipment_id, standard_id, code, name in links:
+            standards.setdefault(equipment_id, []).append({'id': standard_id, 'code': code, 'name': name})
+        for equip in equipments:
+            if equip['id'] in standards:
+                equip['standards'] = standards[equip['id']]
+    
+    return equipments
 
 
 @equipments_bp.route('', methods=['POST'])
@@ -136,12 +207,9 @@ def create_equipment():
         notes=data.get('notes')
     )
     
-    # Adicionar normas se fornecidas
+    # Adicionar normas se fornecidas (do cache de referência, sem consulta por id)
     if data.get('standard_ids'):
-        for standard_id in data['standard_ids']:
-            standard = Standard.query.get(standard_id)
-            if standard:
-                equipment.standards.append(standard)
+        equipment.standards.extend(attach_standards(data['standard_ids']))
     
     db.session.add(equipment)
     db.session.commit()
@@ -152,6 +220,145 @@ def create_equipment():
     }), 201
 
 
+
+@equipments_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+@role_required('superadmin', 'admin', 'coord')
+def bulk_import_equipments():
+    """Importa equipamentos em massa de um arquivo CSV, XLSX ou NDJSON
+    ---
+    tags:
+      - 🧯 GAT - Equipamentos
+    security:
+      - Bearer: []
+    consumes:
+      - multipart/form-data
+      - text/csv
+      - application/x-ndjson
+    description: |
+      O arquivo é lido linha a linha e gravado em lotes; as linhas inválidas são
+      ignoradas e listadas no relatório. Colunas: name, serial_number,
+      inventory_id, type, manufacturer, model, tag_number, status, location,
+      capacity, notes, standard_ids (separados por vírgula, ponto e vírgula ou |)
+      e as datas manufacturing_date, installation_date, last_inspection_date,
+      next_inspection_date e expiry_date (AAAA-MM-DD ou DD/MM/AAAA).
+      O arquivo também pode ser enviado como corpo da requisição, com o Content-Type do formato.
+    parameters:
+      - in: formData
+        name: file
+        type: file
+        description: Arquivo .csv, .xlsx ou .ndjson
+      - in: query
+        name: format
+        type: string
+        enum: [csv, xlsx, ndjson]
+        description: "Formato do arquivo (padrão: pela extensão ou Content-Type)"
+      - in: query
+        name: inventory_id
+        type: integer
+        description: Inventário das linhas sem inventory_id
+      - in: query
+        name: async
+        type: boolean
+        description: Enfileira a importação como tarefa e responde 202
+    responses:
+      200:
+        description: Relatório da importação (total_rows, created_count, error_count, errors por linha)
+      202:
+        description: Importação enfileirada; acompanhe em /api/jobs/<id>
+      400:
+        description: Arquivo ausente ou formato inválido
+      404:
+        description: Inventário não encontrado
+      503:
+        description: async pedido sem executor de tarefas configurado
+    """
+    upload = request.files.get('file')
+    if upload:
+        stream, filename, content_type = upload.stream, upload.filename, upload.mimetype
+    elif request.content_length:
+        stream, filename, content_type = request.stream, None, request.mimetype
+    else:
+        return jsonify({'error': 'Envie o arquivo no campo file ou no corpo da requisição'}), 400
+
+    try:
+        file_format = detect_format(filename, content_type, request.args.get('format'))
+    except ImportFileError as e:
+        return jsonify({'error': str(e)}), 400
+
+    inventory_id = request.args.get('inventory_id', type=int)
+    if inventory_id is not None and not db.session.get(Inventory, inventory_id):
+        return jsonify({'error': 'Inventário não encontrado'}), 404
+
+    # Execução em segundo plano: o arquivo fica no armazenamento até a tarefa terminar
+    if parse_flag(request.args.get('async') or request.form.get('async')):
+        if not workers_configured():
+            return jobs_unavailable(JobsUnavailable())
+
+        store = get_store(current_app.config.get('IMPORT_UPLOADS_BACKEND', 'database'))
+        digest, spool = spool_upload(stream)
+        with spool:
+            store.put_file(digest, spool)
+
+        job = enqueue(IMPORT_JOB, {
+            'upload': digest,
+            'storage_backend': store.backend_name,
+            'format': file_format,
+            'inventory_id': inventory_id
+        }, created_by=int(get_jwt_identity()))
+        return job_accepted(job)
+
+    try:
+        report = import_equipments(stream, file_format, default_inventory_id=inventory_id)
+    except ImportFileError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Erro ao importar equipamentos: {str(e)}'}), 500
+
+    # INSERT via Core não passa pelo flush do ORM
+    if report['created_count']:
+        stats_cache.invalidate()
+
+    return jsonify(report), 200
+
+
+# Interna: o payload aponta para o arquivo gravado pela rota e não pode vir do cliente
+@job_handler(IMPORT_JOB, public=False)
+def import_equipments_job(context):
+    """Importação em massa executada como tarefa (progresso pela posição no arquivo)"""
+    params = context.payload
+    store = get_store(params.get('storage_backend'))
+    digest = params['upload']
+
+    try:
+        with store.open(digest) as upload:
+            size = max(1, upload.seek(0, os.SEEK_END))
+            upload.seek(0)
+
+            def progress(message):
+                context.report(min(99, 100 * upload.tell() // size), message)
+
+            report = import_equipments(
+                upload, params['format'],
+                default_inventory_id=params.get('inventory_id'),
+                progress=progress
+            )
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        # Uma tarefa que falha não é reexecutada: o arquivo não é mais necessário
+        store.delete(digest)
+        db.session.commit()
+
+    if report['created_count']:
+        stats_cache.invalidate()
+
+    return report
+
+
 @equipments_bp.route('/<int:id>', methods=['GET'])
 @jwt_required()
 @role_required('superadmin', 'admin', 'coord', 'tecnico')
@@ -241,13 +448,9 @@ def update_equipment(id):
     if 'notes' in data:
         equipment.notes = data['notes']
     
-    # Atualizar normas se fornecidas
+    # Atualizar normas se fornecidas (do cache de referência, sem consulta por id)
     if 'standard_ids' in data:
-        equipment.standards.clear()
-        for standard_id in data['standard_ids']:
-            standard = Standard.query.get(standard_id)
-            if standard:
-                equipment.standards.append(standard)
+        equipment.standards = attach_standards(data['standard_ids'] or [])
     
     db.session.commit()
     
@@ -0,0 +1,271 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from sqlalchemy.exc import IntegrityError
+from ..models import db, Contract, Equipment, InspectionSchedule, Standard
+from ..decorators import role_required
+
+inspection_schedules_bp = Blueprint('inspection_schedules', __name__)
+
+
+def _apply_fields(schedule, data):
+    """Valida e aplica os campos do corpo; retorna a mensagem de erro ou None"""
+    for field in ('equipment_type', 'standard_id', 'contract_id', 'interval', 'unit', 'skip_weekends', 'description'):
+        if field in data:
+            setattr(schedule, field, data[field])
+
+    if schedule.unit is None:
+        schedule.unit = InspectionSchedule.UNITS[0]
+
+    if not isinstance(schedule.interval, int) or isinstance(schedule.interval, bool) or schedule.interval < 1:
+        return 'interval deve ser um inteiro maior que zero'
+
+    if schedule.unit not in InspectionSchedule.UNITS:
+        return f'unit deve ser um de: {", ".join(InspectionSchedule.UNITS)}'
+
+    if schedule.equipment_type is not None and schedule.equipment_type not in Equipment.TYPES:
+        return f'equipment_type deve ser um de: {", ".join(Equipment.TYPES)}'
+
+    if schedule.standard_id is not None and schedule.contract_id is not None:
+        return 'Informe standard_id ou contract_id, não ambos'
+
+    if schedule.standard_id is not None and not db.session.get(Standard, schedule.standard_id):
+        return 'Norma não encontrada'
+
+    if schedule.contract_id is not None and not db.session.get(Contract, schedule.contract_id):
+        return 'Contrato não encontrado'
+
+    if schedule.equipment_type is None and schedule.standard_id is None and schedule.contract_id is None:
+        return 'Informe ao menos equipment_type, standard_id ou contract_id'
+
+    return None
+
+
+def _scope_taken(schedule):
+    """Verifica se já existe outra periodicidade para o mesmo escopo"""
+    query = InspectionSchedule.query.filter(
+        InspectionSchedule.equipment_type.is_(None) if schedule.equipment_type is None
+        else InspectionSchedule.equipment_type == schedule.equipment_type,
+        InspectionSchedule.standard_id.is_(None) if schedule.standard_id is None
+        else InspectionSchedule.standard_id == schedule.standard_id,
+        InspectionSchedule.contract_id.is_(None) if schedule.contract_id is None
+        else InspectionSchedule.contract_id == schedule.contract_id
+    )
+    if schedule.id:
+        query = query.filter(InspectionSchedule.id != schedule.id)
+    return db.session.query(query.exists()).scalar()
+
+
+@inspection_schedules_bp.route('', methods=['GET'])
+@jwt_required()
+@role_required('superadmin', 'admin', 'coord')
+def list_schedules():
+    """Lista as periodicidades de inspeção
+    ---
+    tags:
+      - 🤖 GAT - Geração Automática
+    security:
+      - Bearer: []
+    parameters:
+      - in: query
+        name: equipment_type
+        type: string
+      - in: query
+        name: standard_id
+        type: integer
+      - in: query
+        name: contract_id
+        type: integer
+    responses:
+      200:
+        description: Periodicidades (tipo, norma e contrato; o escopo mais específico prevalece)
+    """
+    try:
+        query = InspectionSchedule.query
+
+        equipment_type = request.args.get('equipment_type')
+        standard_id = request.args.get('standard_id', type=int)
+        contract_id = request.args.get('contract_id', type=int)
+
+        if equipment_type:
+            query = query.filter_by(equipment_type=equipment_type)
+        if standard_id:
+            query = query.filter_by(standard_id=standard_id)
+        if contract_id:
+            query = query.filter_by(contract_id=contract_id)
+
+        schedules = query.order_by(InspectionSchedule.id).all()
+
+        return jsonify({
+            'schedules': [schedule.to_dict() for schedule in schedules]
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Erro ao listar periodicidades: {str(e)}'}), 500
+
+
+@inspection_schedules_bp.route('', methods=['POST'])
+@jwt_required()
+@role_required('superadmin', 'admin')
+def create_schedule():
+    """Cria uma periodicidade de inspeção
+    ---
+    tags:
+      - 🤖 GAT - Geração Automática
+    security:
+      - Bearer: []
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - interval
+          properties:
+            equipment_type:
+              type: string
+              example: extintor
+            standard_id:
+              type: integer
+              description: Periodicidade exigida por uma norma (opcionalmente restrita ao tipo)
+            contract_id:
+              type: integer
+              description: Periodicidade contratada (opcionalmente restrita ao tipo)
+            interval:
+              type: integer
+              example: 1
+            unit:
+              type: string
+              enum: [days, months]
+              example: months
+            skip_weekends:
+              type: boolean
+              description: Adia datas em fim de semana/feriado para o próximo dia útil
+            description:
+              type: string
+    responses:
+      201:
+        description: Periodicidade criada
+      400:
+        description: Dados inválidos
+      409:
+        description: Já existe periodicidade para o escopo
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        schedule = InspectionSchedule()
+
+        error = _apply_fields(schedule, data)
+        if error:
+            return jsonify({'error': error}), 400
+
+        if _scope_taken(schedule):
+            return jsonify({'error': 'Já existe periodicidade para este escopo'}), 409
+
+        db.session.add(schedule)
+        db.session.commit()
+
+        return jsonify({
+            'message': 'Periodicidade criada com sucesso',
+            'schedule': schedule.to_dict()
+        }), 201
+    except IntegrityError as e:
+        db.session.rollback()
+        return jsonify({'error': f'Conflito ao criar periodicidade: {str(e.orig)}'}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Erro ao criar periodicidade: {str(e)}'}), 500
+
+
+@inspection_schedules_bp.route('/<int:id>', methods=['PUT'])
+@jwt_required()
+@role_required('superadmin', 'admin')
+def update_schedule(id):
+    """Atualiza uma periodicidade de inspeção
+    ---
+    tags:
+      - 🤖 GAT - Geração Automática
+    security:
+      - Bearer: []
+    parameters:
+      - in: path
+        name: id
+        type: integer
+        required: true
+      - in: body
+        name: body
+        schema:
+          type: object
+    responses:
+      200:
+        description: Periodicidade atualizada
+      400:
+        description: Dados inválidos
+      404:
+        description: Periodicidade não encontrada
+      409:
+        description: Já existe periodicidade para o escopo
+    """
+    try:
+        schedule = db.session.get(InspectionSchedule, id)
+
+        if not schedule:
+            return jsonify({'error': 'Periodicidade não encontrada'}), 404
+
+        error = _apply_fields(schedule, request.get_json(silent=True) or {})
+        if error:
+            db.session.rollback()
+            return jsonify({'error': error}), 400
+
+        if _scope_taken(schedule):
+            db.session.rollback()
+            return jsonify({'error': 'Já existe periodicidade para este escopo'}), 409
+
+        db.session.commit()
+
+        return jsonify({
+            'message': 'Periodicidade atualizada com sucesso',
+            'schedule': schedule.to_dict()
+        }), 200
+    except IntegrityError as e:
+        db.session.rollback()
+        return jsonify({'error': f'Conflito ao atualizar periodicidade: {str(e.orig)}'}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Erro ao atualizar periodicidade: {str(e)}'}), 500
+
+
+@inspection_schedules_bp.route('/<int:id>', methods=['DELETE'])
+@jwt_required()
+@role_required('superadmin', 'admin')
+def delete_schedule(id):
+    """Exclui uma periodicidade (o escopo volta a usar a regra menos específica)
+    ---
+    tags:
+      - 🤖 GAT - Geração Automática
+    security:
+      - Bearer: []
+    parameters:
+      - in: path
+        name: id
+        type: integer
+        required: true
+    responses:
+      200:
+        description: Periodicidade excluída
+      404:
+        description: Periodicidade não encontrada
+    """
+    try:
+        schedule = db.session.get(InspectionSchedule, id)
+
+        if not schedule:
+            return jsonify({'error': 'Periodicidade não encontrada'}), 404
+
+        db.session.delete(schedule)
+        db.session.commit()
+
+        return jsonify({'message': 'Periodicidade excluída com sucesso'}), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Erro ao excluir periodicidade: {str(e)}'}), 500
@@ -3,7 +3,14 @@ from flask_jwt_extended import jwt_required
 from datetime import datetime
 from ..models import db, Inspection, Client, Team, User, Branch, Equipment, Contract
 from ..decorators import role_required, get_current_user
-from flasgger import swag_from
+from ..services.attachments import externalize_photos, externalize_value, stored_value_response
+from ..pagination import (
+    PaginationError, is_paginated, parse_limit, parse_flag, parse_fields,
+    row_to_dict, count_rows, keyset_page
+)
+from ..responses import conditional_list
+from ..serialization import json_response, serializer_for
+from ..docs import swag_from
 
 inspections_bp = Blueprint('inspections', __name__)
 
@@ -57,6 +64,30 @@ inspections_bp = Blueprint('inspections', __name__)
             'name': 'search_id',
             'type': 'integer',
             'description': 'Buscar por ID específico da inspeção'
+        },
+        {
+            'in': 'query',
+            'name': 'limit',
+            'type': 'integer',
+            'description': 'Ativa a paginação por cursor com o tamanho de página informado (máx. 500)'
+        },
+        {
+            'in': 'query',
+            'name': 'cursor',
+            'type': 'string',
+            'description': 'Cursor opaco retornado em next_cursor pela página anterior'
+        },
+        {
+            'in': 'query',
+            'name': 'fields',
+            'type': 'string',
+            'description': 'Colunas a retornar, separadas por vírgula (ex.: id,title,status,scheduled_date)'
+        },
+        {
+            'in': 'query',
+            'name': 'include_total',
+            'type': 'boolean',
+            'description': 'Inclui a contagem total (COUNT) na resposta paginada'
         }
     ],
     'responses': {
@@ -69,9 +100,17 @@ inspections_bp = Blueprint('inspections', __name__)
                         'type': 'array',
                         'items': {'type': 'object'}
                     },
-                    'total': {'type': 'integer'}
+                    'total': {'type': 'integer'},
+                    'next_cursor': {'type': 'string'},
+                    'limit': {'type': 'integer'}
                 }
             }
+        },
+        304: {
+            'description': 'Lista inalterada desde o ETag enviado em If-None-Match'
+        },
+        400: {
+            'description': 'Parâmetros inválidos'
         }
     },
     'security': [{'Bearer': []}]
@@ -129,12 +168,56 @@ def list_inspections():
             except ValueError:
                 return jsonify({'error': 'ID deve ser um número inteiro'}), 400
         
+        # Projeção de colunas no SQL (fields=id,title,status,...); id e updated_at sempre
+        # selecionados para o ETag
+        fields, columns = parse_fields(request.args.get('fields'), Inspection, required=('id', 'scheduled_date', 'updated_at'))
+        # Sem projeção: todas as colunas em tuplas, serializadas por colunas (sem objetos ORM)
+        serializer = serializer_for(Inspection)
+        query = query.with_entities(*(columns or serializer.columns))
+        
+        def serialize(item):
+            return row_to_dict(item, fields) if fields else serializer(item)
+        
+        # Paginação por cursor (keyset) em (scheduled_date, id)
+        if is_paginated(request.args):
+            limit = parse_limit(request.args.get('limit'))
+            inspections, next_cursor = keyset_page(
+                query,
+                Inspection.scheduled_date,
+                Inspection.id,
+                cursor=request.args.get('cursor'),
+                limit=limit
+            )
+            
+            # 304 sem serializar a página quando o cliente tem a versão atual
+            not_modified = conditional_list(inspections, Inspection, next_cursor)
+            if not_modified:
+                return not_modified
+            
+            response = {
+                'inspections': [serialize(inspection) for inspection in inspections],
+                'next_cursor': next_cursor,
+                'limit': limit
+            }
+            
+            # Contagem total apenas quando solicitada
+            if parse_flag(request.args.get('include_total')):
+                response['total'] = count_rows(query, Inspection)
+            
+            return json_response(response)
+        
         inspections = query.order_by(Inspection.scheduled_date.desc()).all()
         
-        return jsonify({
-            'inspections': [inspection.to_dict() for inspection in inspections],
+        not_modified = conditional_list(inspections, Inspection)
+        if not_modified:
+            return not_modified
+        
+        return json_response({
+            'inspections': [serialize(inspection) for inspection in inspections],
             'total': len(inspections)
-        }), 200
+        })
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         print(f"Erro ao listar inspeções: {str(e)}")
         return jsonify({
@@ -300,6 +383,59 @@ def get_inspection(inspection_id):
     return jsonify(inspection.to_dict()), 200
 
 
+@inspections_bp.route('/<int:inspection_id>/signature', methods=['GET'])
+@jwt_required()
+@swag_from({
+    'tags': ['📋 DAT - Inspeções'],
+    'summary': 'Obtém a assinatura de uma inspeção',
+    'description': 'Transmite a imagem da assinatura com ETag e suporte a Range',
+    'parameters': [
+        {
+            'in': 'path',
+            'name': 'inspection_id',
+            'required': True,
+            'type': 'integer',
+            'description': 'ID da inspeção'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Conteúdo da assinatura'
+        },
+        206: {
+            'description': 'Parte do conteúdo (Range)'
+        },
+        304: {
+            'description': 'Não modificado (If-None-Match)'
+        },
+        404: {
+            'description': 'Inspeção ou assinatura não encontrada'
+        }
+    },
+    'security': [{'Bearer': []}]
+})
+def get_inspection_signature(inspection_id):
+    """Transmite a assinatura de uma inspeção"""
+    current_user = get_current_user()
+    inspection = db.session.query(
+        Inspection.signature,
+        Inspection.technician_id
+    ).filter(Inspection.id == inspection_id).first()
+    
+    if not inspection:
+        return jsonify({'error': 'Inspeção não encontrada'}), 404
+    
+    # Técnicos só podem ver suas próprias inspeções
+    if current_user.role == 'tecnico' and inspection.technician_id != current_user.id:
+        return jsonify({'error': 'Acesso negado'}), 403
+    
+    response = stored_value_response(inspection.signature)
+    if response is None:
+        return jsonify({'error': 'Assinatura não encontrada'}), 404
+    
+    return response
+
+
 @inspections_bp.route('', methods=['POST'])
 @jwt_required()
 @role_required('superadmin', 'admin', 'coord')
@@ -701,11 +837,12 @@ def update_inspection(inspection_id):
     if 'observations' in data:
         inspection.observations = data['observations']
     
+    # Fotos e assinatura inline são movidas para o armazenamento de anexos
     if 'photos' in data:
-        inspection.photos = data['photos']
+        inspection.photos = externalize_photos(data['photos'])
     
     if 'signature' in data:
-        inspection.signature = data['signature']
+        inspection.signature = externalize_value(data['signature'])
     
     db.session.commit()
     
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from ..models import db, Inventory, Branch
 from ..decorators import role_required
+from ..loading import LoadingError, parse_include, eager_load
 
 inventories_bp = Blueprint('inventories', __name__)
 
@@ -20,13 +21,24 @@ def list_inventories():
         name: branch_id
         type: integer
         description: Filtrar por filial
+      - in: query
+        name: include
+        type: string
+        description: "Relacionamentos incluídos, separados por vírgula (branch, equipments) ou none. Padrão: todos"
     responses:
       200:
         description: Lista de inventários
+      400:
+        description: Relacionamento inválido em include
     """
     branch_id = request.args.get('branch_id', type=int)
     
-    query = Inventory.query
+    try:
+        relations = parse_include(request.args.get('include'), Inventory)
+    except LoadingError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    query = eager_load(Inventory.query, Inventory, relations)
     
     if branch_id:
         query = query.filter_by(branch_id=branch_id)
@@ -34,7 +46,7 @@ def list_inventories():
     inventories = query.all()
     
     return jsonify({
-        'inventories': [inv.to_dict(include_relations=True) for inv in inventories]
+        'inventories': [inv.to_dict(include_relations=True, relations=relations) for inv in inventories]
     }), 200
 
 
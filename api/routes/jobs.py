@@ -0,0 +1,115 @@
+from flask import Blueprint, current_app, request, jsonify
+from flask_jwt_extended import jwt_required
+from ..models import db, Job
+from ..decorators import role_required, get_current_user
+from ..jobs import JobError, JobsUnavailable, enqueue, public_job_types
+from . import load_all_routes
+
+jobs_bp = Blueprint('jobs', __name__)
+
+
+def job_accepted(job):
+    """Resposta 202 de uma tarefa enfileirada, com Location para acompanhamento"""
+    response = jsonify({'message': 'Tarefa enfileirada', 'job': job.to_dict()})
+    response.status_code = 202
+    response.headers['Location'] = f'/api/jobs/{job.id}'
+    return response
+
+
+def jobs_unavailable(error):
+    """Resposta 503 quando não há executor para a fila (ver workers_configured)"""
+    return jsonify({'error': str(error)}), 503
+
+
+@jobs_bp.route('', methods=['POST'])
+@jwt_required()
+@role_required('superadmin', 'admin', 'coord')
+def create_job():
+    """Enfileira uma tarefa em segundo plano
+    ---
+    tags:
+      - ⚙️ Compartilhado - Tarefas
+    security:
+      - Bearer: []
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - type
+          properties:
+            type:
+              type: string
+              example: inventories.recount
+              description: "Tipo da tarefa (ex.: inventories.recount, clients.reindex). Geração automática e importação são enfileiradas pelas próprias rotas (async)"
+            payload:
+              type: object
+              example: {"inventory_ids": [1, 2]}
+    responses:
+      202:
+        description: Tarefa enfileirada; acompanhe em /api/jobs/<id>
+      400:
+        description: Tipo desconhecido ou payload inválido
+      403:
+        description: Acesso negado
+      503:
+        description: Nenhum executor de tarefas configurado
+    """
+    data = request.get_json() or {}
+
+    # Os executores são registrados na importação dos módulos de rotas (LAZY_STARTUP)
+    load_all_routes(current_app)
+
+    if not data.get('type'):
+        return jsonify({'error': 'type é obrigatório', 'types': public_job_types()}), 400
+
+    try:
+        job = enqueue(data['type'], data.get('payload'), created_by=get_current_user().id, public=True)
+    except JobsUnavailable as e:
+        return jobs_unavailable(e)
+    except JobError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return job_accepted(job)
+
+
+@jobs_bp.route('/<int:job_id>', methods=['GET'])
+@jwt_required()
+def get_job(job_id):
+    """Status, progresso e resultado de uma tarefa
+    ---
+    tags:
+      - ⚙️ Compartilhado - Tarefas
+    security:
+      - Bearer: []
+    parameters:
+      - in: path
+        name: job_id
+        type: integer
+        required: true
+    responses:
+      200:
+        description: Tarefa (status pendente, executando, concluido ou falhou)
+      403:
+        description: Acesso negado
+      404:
+        description: Tarefa não encontrada
+    """
+    job = db.session.get(Job, job_id)
+    if not job:
+        return jsonify({'error': 'Tarefa não encontrada'}), 404
+
+    # Tarefas são visíveis para quem as criou e para administradores
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'Usuário não encontrado'}), 404
+
+    if job.created_by != user.id and not user.has_role('superadmin', 'admin'):
+        return jsonify({'error': 'Acesso negado'}), 403
+
+    response = jsonify(job.to_dict())
+    if not job.is_finished:
+        response.headers['Retry-After'] = '2'
+    return response
@@ -3,13 +3,25 @@ from flask_jwt_extended import jwt_required
 from datetime import datetime
 from ..models import db, Maintenance
 from ..decorators import role_required, get_current_user
+from ..services.attachments import externalize_photos, externalize_value, stored_value_response
+from ..pagination import (
+    PaginationError, is_paginated, parse_limit, parse_flag, parse_fields,
+    row_to_dict, count_rows, keyset_page
+)
+from ..responses import conditional_list
+from ..serialization import json_response, serializer_for
 
 maintenances_bp = Blueprint('maintenances', __name__)
 
 @maintenances_bp.route('', methods=['GET'])
 @jwt_required()
 def list_maintenances():
-    """Lista manutenções com filtros opcionais"""
+    """Lista manutenções com filtros opcionais
+
+    Aceita paginação por cursor (limit, cursor), projeção de colunas (fields),
+    contagem opcional (include_total) e modo apenas contagem (count_only).
+    A listagem traz um ETag fraco; com If-None-Match igual a ele, retorna 304.
+    """
     try:
         current_user = get_current_user()
     
@@ -52,12 +64,60 @@ def list_maintenances():
             except ValueError:
                 return jsonify({'error': 'Formato de data inválido para date_to'}), 400
     
+        # Apenas a contagem: SELECT COUNT(*) sem carregar objetos
+        if parse_flag(request.args.get('count_only')):
+            return jsonify({'total': count_rows(query, Maintenance)}), 200
+        
+        # Projeção de colunas no SQL (fields=id,title,status,...); id e updated_at sempre
+        # selecionados para o ETag
+        fields, columns = parse_fields(request.args.get('fields'), Maintenance, required=('id', 'scheduled_date', 'updated_at'))
+        # Sem projeção: todas as colunas em tuplas, serializadas por colunas (sem objetos ORM)
+        serializer = serializer_for(Maintenance)
+        query = query.with_entities(*(columns or serializer.columns))
+        
+        def serialize(item):
+            return row_to_dict(item, fields) if fields else serializer(item)
+        
+        # Paginação por cursor (keyset) em (scheduled_date, id)
+        if is_paginated(request.args):
+            limit = parse_limit(request.args.get('limit'))
+            maintenances, next_cursor = keyset_page(
+                query,
+                Maintenance.scheduled_date,
+                Maintenance.id,
+                cursor=request.args.get('cursor'),
+                limit=limit
+            )
+            
+            # 304 sem serializar a página quando o cliente tem a versão atual
+            not_modified = conditional_list(maintenances, Maintenance, next_cursor)
+            if not_modified:
+                return not_modified
+            
+            response = {
+                'maintenances': [serialize(maintenance) for maintenance in maintenances],
+                'next_cursor': next_cursor,
+                'limit': limit
+            }
+            
+            # Contagem total apenas quando solicitada
+            if parse_flag(request.args.get('include_total')):
+                response['total'] = count_rows(query, Maintenance)
+            
+            return json_response(response)
+    
         maintenances = query.order_by(Maintenance.scheduled_date.desc()).all()
         
-        return jsonify({
-            'maintenances': [maintenance.to_dict() for maintenance in maintenances],
+        not_modified = conditional_list(maintenances, Maintenance)
+        if not_modified:
+            return not_modified
+        
+        return json_response({
+            'maintenances': [serialize(maintenance) for maintenance in maintenances],
             'total': len(maintenances)
-        }), 200
+        })
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         print(f"Erro ao listar manutenções: {str(e)}")
         return jsonify({
@@ -83,6 +143,30 @@ def get_maintenance(maintenance_id):
     return jsonify(maintenance.to_dict()), 200
 
 
+@maintenances_bp.route('/<int:maintenance_id>/signature', methods=['GET'])
+@jwt_required()
+def get_maintenance_signature(maintenance_id):
+    """Transmite a assinatura de uma manutenção (ETag e Range)"""
+    current_user = get_current_user()
+    maintenance = db.session.query(
+        Maintenance.signature,
+        Maintenance.technician_id
+    ).filter(Maintenance.id == maintenance_id).first()
+    
+    if not maintenance:
+        return jsonify({'error': 'Manutenção não encontrada'}), 404
+    
+    # Técnicos só podem ver suas próprias manutenções
+    if current_user.role == 'tecnico' and maintenance.technician_id != current_user.id:
+        return jsonify({'error': 'Acesso negado'}), 403
+    
+    response = stored_value_response(maintenance.signature)
+    if response is None:
+        return jsonify({'error': 'Assinatura não encontrada'}), 404
+    
+    return response
+
+
 @maintenances_bp.route('', methods=['POST'])
 @jwt_required()
 @role_required('superadmin', 'admin', 'coord')
@@ -212,11 +296,12 @@ def update_maintenance(maintenance_id):
     if 'observations' in data:
         maintenance.observations = data['observations']
     
+    # Fotos e assinatura inline são movidas para o armazenamento de anexos
     if 'photos' in data:
-        maintenance.photos = data['photos']
+        maintenance.photos = externalize_photos(data['photos'])
     
     if 'signature' in data:
-        maintenance.signature = data['signature']
+        maintenance.signature = externalize_value(data['signature'])
     
     if 'labor_cost' in data:
         maintenance.labor_cost = data['labor_cost']
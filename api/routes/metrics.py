@@ -0,0 +1,80 @@
+import hmac
+from flask import Blueprint, Response, current_app, jsonify, request
+from flask_jwt_extended import verify_jwt_in_request
+from ..cache import named_caches
+from ..identity import resolve_identity
+from ..instrumentation import metrics_registry
+from ..security import password_hasher
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+def _bcrypt_metrics():
+    """Métricas do pool de bcrypt no formato texto do Prometheus"""
+    snapshot = password_hasher.metrics
+    lines = [
+        '# HELP fireng_bcrypt_seconds Tempo de hash/verificação de senha com bcrypt',
+        '# TYPE fireng_bcrypt_seconds summary',
+    ]
+    for operation in ('hash', 'check'):
+        stats = snapshot[operation]
+        lines.append(f'fireng_bcrypt_seconds_count{{operation="{operation}"}} {stats["count"]}')
+        lines.append(f'fireng_bcrypt_seconds_sum{{operation="{operation}"}} {stats["total_ms"] / 1000:.6f}')
+
+    lines.append('# HELP fireng_bcrypt_rejected_total Operações recusadas com o pool de bcrypt saturado')
+    lines.append('# TYPE fireng_bcrypt_rejected_total counter')
+    lines.append(f'fireng_bcrypt_rejected_total {snapshot["rejected"]}')
+    return '\n'.join(lines) + '\n'
+
+
+def _cache_metrics():
+    """Acertos, faltas e entradas dos caches em memória nomeados"""
+    stats = {name: cache.stats() for name, cache in sorted(named_caches.items())}
+    lines = []
+    for metric, key, kind, description in [
+        ('fireng_cache_hits_total', 'hits', 'counter', 'Leituras atendidas pelo cache'),
+        ('fireng_cache_misses_total', 'misses', 'counter', 'Leituras sem entrada válida no cache'),
+        ('fireng_cache_entries', 'size', 'gauge', 'Entradas armazenadas no cache'),
+    ]:
+        lines.append(f'# HELP {metric} {description}')
+        lines.append(f'# TYPE {metric} {kind}')
+        for name, values in stats.items():
+            lines.append(f'{metric}{{cache="{name}"}} {values[key]}')
+    return '\n'.join(lines) + '\n'
+
+
+@metrics_bp.route('', methods=['GET'])
+def prometheus_metrics():
+    """Métricas por endpoint no formato texto do Prometheus
+    ---
+    tags:
+      - 🔐 Compartilhado - Autenticação
+    security:
+      - Bearer: []
+    description: >
+      Consultas SQL, tempo de banco, linhas, tempo de serialização, bytes da resposta e
+      duração por endpoint, e acertos/faltas dos caches em memória, acumulados neste
+      processo. Aceita o token fixo METRICS_TOKEN (para o coletor) ou um JWT de
+      superadmin/admin.
+    produces:
+      - text/plain
+    responses:
+      200:
+        description: Métricas em formato Prometheus
+      401:
+        description: Token não fornecido ou inválido
+      403:
+        description: Acesso negado
+    """
+    metrics_token = current_app.config.get('METRICS_TOKEN')
+    authorization = request.headers.get('Authorization', '')
+
+    if not (metrics_token and hmac.compare_digest(authorization, f'Bearer {metrics_token}')):
+        verify_jwt_in_request()
+        identity = resolve_identity()
+
+        if not identity or not identity.is_active or not identity.has_role('superadmin', 'admin'):
+            return jsonify({'error': 'Acesso negado'}), 403
+
+    body = metrics_registry.render() + _bcrypt_metrics() + _cache_metrics()
+    return Response(body, mimetype='text/plain; version=0.0.4')
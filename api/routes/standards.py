@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from ..models import db, Standard
 from ..decorators import role_required
+from ..services import reference_data
 
 standards_bp = Blueprint('standards', __name__)
 
@@ -26,12 +27,11 @@ def list_standards():
     """
     is_active = request.args.get('is_active', type=lambda v: v.lower() == 'true')
     
-    query = Standard.query
+    # Sem filtro: lista completa do cache de dados de referência
+    if is_active is None:
+        return jsonify({'standards': reference_data.list_standards()}), 200
     
-    if is_active is not None:
-        query = query.filter_by(is_active=is_active)
-    
-    standards = query.all()
+    standards = Standard.query.filter_by(is_active=is_active).all()
     
     return jsonify({
         'standards': [standard.to_dict() for standard in standards]
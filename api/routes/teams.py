@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from ..models import db, Team
 from ..decorators import role_required
+from ..services import reference_data
 
 teams_bp = Blueprint('teams', __name__)
 
@@ -27,16 +28,13 @@ def list_teams():
     try:
         is_active = request.args.get('is_active', type=lambda v: v.lower() == 'true')
         
-        query = Team.query
+        # Lista do cache de dados de referência, filtrada em memória
+        teams = reference_data.list_teams()
         
         if is_active is not None:
-            query = query.filter_by(is_active=is_active)
+            teams = [team for team in teams if team['is_active'] == is_active]
         
-        teams = query.all()
-        
-        return jsonify({
-            'teams': [team.to_dict(include_relations=True) for team in teams]
-        }), 200
+        return jsonify({'teams': teams}), 200
     except Exception as e:
         print(f"Erro ao listar equipes: {str(e)}")
         return jsonify({
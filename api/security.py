@@ -0,0 +1,188 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import bcrypt
+from flask import current_app, g, has_app_context
+
+# Valores padrão quando não há contexto de aplicação (ex.: scripts de seed)
+DEFAULT_BCRYPT_ROUNDS = 12
+DEFAULT_BCRYPT_MAX_WORKERS = 4
+DEFAULT_BCRYPT_MAX_PENDING = 32
+DEFAULT_BCRYPT_TIMEOUT = 10
+
+
+class PasswordHasherBusy(Exception):
+    """O pool de bcrypt está saturado (a requisição deve ser recusada com 503)"""
+
+
+def _config(name, default):
+    if has_app_context():
+        return current_app.config.get(name, default)
+    return default
+
+
+class PasswordHasher:
+    """Executa bcrypt em um pool de threads limitado, fora do worker da requisição
+
+    O bcrypt libera o GIL durante o cálculo; o pool limita quantos hashes rodam
+    ao mesmo tempo e o semáforo limita quantos podem aguardar na fila. Acima
+    disso a chamada falha imediatamente com PasswordHasherBusy.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self.metrics = {
+            'hash': {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0},
+            'check': {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0},
+            'rejected': 0
+        }
+
+    def _ensure_pool(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    workers = _config('BCRYPT_MAX_WORKERS', DEFAULT_BCRYPT_MAX_WORKERS)
+                    pending = _config('BCRYPT_MAX_PENDING', DEFAULT_BCRYPT_MAX_PENDING)
+                    self._slots = threading.BoundedSemaphore(workers + pending)
+                    self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+
+    def _record(self, operation, elapsed_ms):
+        with self._metrics_lock:
+            stats = self.metrics[operation]
+            stats['count'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+
+        # Tempo de bcrypt acumulado na requisição atual (Server-Timing)
+        if has_app_context():
+            g.bcrypt_ms = g.get('bcrypt_ms', 0.0) + elapsed_ms
+
+    def _run(self, operation, fn, *args):
+        self._ensure_pool()
+
+        if not self._slots.acquire(blocking=False):
+            with self._metrics_lock:
+                self.metrics['rejected'] += 1
+            raise PasswordHasherBusy('Servidor ocupado, tente novamente em instantes')
+
+        started_at = time.perf_counter()
+        try:
+            future = self._executor.submit(fn, *args)
+            result = future.result(timeout=_config('BCRYPT_TIMEOUT', DEFAULT_BCRYPT_TIMEOUT))
+        except FutureTimeoutError:
+            raise PasswordHasherBusy('Tempo esgotado ao verificar a senha')
+        finally:
+            self._slots.release()
+
+        self._record(operation, (time.perf_counter() - started_at) * 1000)
+        return result
+
+    def hash(self, password, rounds=None):
+        """Gera o hash bcrypt da senha com o custo configurado (BCRYPT_ROUNDS)"""
+        rounds = rounds or _config('BCRYPT_ROUNDS', DEFAULT_BCRYPT_ROUNDS)
+        salt = bcrypt.gensalt(rounds=rounds)
+        hashed = self._run('hash', bcrypt.hashpw, password.encode('utf-8'), salt)
+        return hashed.decode('utf-8')
+
+    def check(self, password, password_hash):
+        """Verifica a senha contra o hash bcrypt"""
+        return self._run('check', bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    def snapshot(self):
+        """Métricas agregadas de tempo de hash/verificação"""
+        with self._metrics_lock:
+            data = {'rejected': self.metrics['rejected']}
+            for operation in ('hash', 'check'):
+                stats = self.metrics[operation]
+                data[operation] = {
+                    'count': stats['count'],
+                    'avg_ms': round(stats['total_ms'] / stats['count'], 2) if stats['count'] else 0.0,
+                    'max_ms': round(stats['max_ms'], 2)
+                }
+            return data
+
+
+password_hasher = PasswordHasher()
+
+
+def hash_rounds(password_hash):
+    """Extrai o custo (rounds) de um hash bcrypt ('$2b$12$...')"""
+    try:
+        return int(password_hash.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def needs_rehash(password_hash):
+    """Indica se o hash foi gerado com custo diferente do configurado"""
+    return hash_rounds(password_hash) != _config('BCRYPT_ROUNDS', DEFAULT_BCRYPT_ROUNDS)
+
+
+class LoginThrottle:
+    """Limita tentativas de login com falha por par e-mail + IP e por IP (janela deslizante)
+
+    O bloqueio nunca é só por e-mail: falhas vindas de outro IP não impedem o
+    dono da conta de entrar. O limite por IP (LOGIN_MAX_FAILURES_PER_IP) cobre
+    tentativas contra vários e-mails. A verificação acontece antes de qualquer
+    trabalho de bcrypt. O estado é mantido em memória por processo, com número
+    de chaves limitado.
+    """
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._failures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _keys(self, email, ip):
+        """Chaves de contagem com o respectivo limite de falhas"""
+        keys = []
+        if email:
+            keys.append((('email_ip', email.strip().lower(), ip), _config('LOGIN_MAX_FAILURES', 5)))
+        if ip:
+            keys.append((('ip', ip), _config('LOGIN_MAX_FAILURES_PER_IP', 50)))
+        return keys
+
+    def _prune(self, attempts, now, window):
+        while attempts and attempts[0] <= now - window:
+            attempts.popleft()
+
+    def retry_after(self, email, ip):
+        """Segundos até liberar novas tentativas (0 se liberado)"""
+        window = _config('LOGIN_FAILURE_WINDOW', 300)
+        now = time.monotonic()
+        wait = 0
+
+        with self._lock:
+            for key, limit in self._keys(email, ip):
+                attempts = self._failures.get(key)
+                if not attempts:
+                    continue
+                self._prune(attempts, now, window)
+                if len(attempts) >= limit:
+                    wait = max(wait, int(attempts[0] + window - now) + 1)
+
+        return wait
+
+    def record_failure(self, email, ip):
+        now = time.monotonic()
+        with self._lock:
+            for key, _ in self._keys(email, ip):
+                attempts = self._failures.setdefault(key, deque())
+                attempts.append(now)
+                self._failures.move_to_end(key)
+            while len(self._failures) > self.maxsize:
+                self._failures.popitem(last=False)
+
+    def reset(self, email, ip):
+        """Limpa as falhas do par e-mail + IP após login bem-sucedido (o contador por IP é mantido)"""
+        with self._lock:
+            for key, _ in self._keys(email, ip):
+                if key[0] == 'email_ip':
+                    self._failures.pop(key, None)
+
+
+login_throttle = LoginThrottle()
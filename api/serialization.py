@@ -0,0 +1,110 @@
+# Serialização rápida das listagens: serializadores gerados uma vez por modelo a
+# partir das colunas, aplicados diretamente às tuplas (Row) da consulta, e
+# codificação com orjson quando disponível.
+import json
+import threading
+import time
+from sqlalchemy import Date, DateTime, Numeric, Time
+from sqlalchemy import inspect as sa_inspect
+from flask import current_app
+from .instrumentation import current_metrics
+
+# orjson está em requirements.txt (3.10.x ainda publica wheels para o python3.9 do Vercel);
+# se não estiver instalado, json da stdlib compacto
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+def _number(value):
+    # Mesmo comportamento dos to_dict: zero é serializado como null
+    return float(value) if value else None
+
+
+def _converter_for(column_type):
+    """Conversão aplicada aos valores não nulos da coluna (None = valor já serializável)"""
+    if isinstance(column_type, (DateTime, Date, Time)):
+        # orjson codifica datas nativamente no mesmo formato de isoformat()
+        return None if orjson is not None else _isoformat
+    if isinstance(column_type, Numeric):
+        return _number
+    return None
+
+
+class ModelSerializer:
+    """Serializador por colunas de um modelo, equivalente ao to_dict sem relacionamentos
+
+    Usa todas as colunas mapeadas, exceto as de JSON_EXCLUDE do modelo, e os campos
+    calculados de JSON_COMPUTED (nome -> função do dicionário com os valores das
+    colunas), que substituem a coluna de mesmo nome ou são acrescentados ao final.
+    As linhas devem vir de query.with_entities(*serializer.columns, ...): colunas
+    extras ao final (ex.: de um JOIN) são ignoradas. O resultado
+    é codificado por dumps (com orjson, datas seguem como datetime/date).
+    """
+
+    def __init__(self, model):
+        excluded = set(getattr(model, 'JSON_EXCLUDE', ()))
+        computed = getattr(model, 'JSON_COMPUTED', {})
+
+        attributes = [attr for attr in sa_inspect(model).column_attrs if attr.key not in excluded]
+
+        self.model = model
+        self.columns = [getattr(model, attr.key) for attr in attributes]
+        self.keys = [attr.key for attr in attributes]
+        self._converters = []
+        for index, attr in enumerate(attributes):
+            converter = _converter_for(attr.columns[0].type)
+            if converter is not None and attr.key not in computed:
+                self._converters.append((index, attr.key, converter))
+        self._computed = list(computed.items())
+
+    def __call__(self, row):
+        data = dict(zip(self.keys, row))
+        for index, key, convert in self._converters:
+            value = row[index]
+            if value is not None:
+                data[key] = convert(value)
+        if self._computed:
+            # Todos os campos calculados veem os valores originais das colunas
+            data.update([(key, compute(data)) for key, compute in self._computed])
+        return data
+
+    def serialize(self, rows):
+        return [self(row) for row in rows]
+
+
+_serializers = {}
+_serializers_lock = threading.Lock()
+
+
+def serializer_for(model):
+    """Serializador do modelo, gerado na primeira chamada e reaproveitado"""
+    serializer = _serializers.get(model)
+    if serializer is None:
+        with _serializers_lock:
+            serializer = _serializers.setdefault(model, ModelSerializer(model))
+    return serializer
+
+
+def dumps(obj):
+    """Codifica em JSON (bytes UTF-8) com orjson ou, sem ele, com a stdlib compacta"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def json_response(payload, status=200):
+    """Resposta JSON codificada por dumps; o tempo entra nas métricas de serialização"""
+    started_at = time.perf_counter()
+    body = dumps(payload)
+
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics.serialization_seconds += time.perf_counter() - started_at
+
+    return current_app.response_class(body, status=status, mimetype='application/json')
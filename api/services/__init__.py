@@ -0,0 +1 @@
+# Camada de serviços: regras de negócio compartilhadas entre as rotas
@@ -0,0 +1,390 @@
+import base64
+import binascii
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+from datetime import datetime
+from flask import current_app, send_file
+from sqlalchemy.dialects import mysql, sqlite
+from ..models import db, Attachment, AttachmentBlob, Inspection, Maintenance
+
+# data:image/png;base64,....
+DATA_URI_PATTERN = re.compile(r'^data:(?P<content_type>[\w.+-]+/[\w.+-]+)?(?:;[\w.+-]+=[\w.+-]+)*;base64,(?P<data>.*)$', re.S)
+
+# Assinaturas de arquivo para identificar o tipo quando o base64 vem sem data URI
+MAGIC_NUMBERS = [
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF8', 'image/gif'),
+    (b'RIFF', 'image/webp'),
+    (b'%PDF', 'application/pdf'),
+]
+
+# Hash SHA-256 em hexadecimal minúsculo (nome dos anexos no armazenamento)
+SHA256_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+# Tamanho dos blocos lidos ao receber uploads
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Conteúdo endereçado por hash nunca muda: pode ser armazenado em cache (privado) por 1 ano
+ATTACHMENT_MAX_AGE = 365 * 24 * 3600
+
+
+class AttachmentStore:
+    """Interface dos backends de armazenamento de anexos
+
+    Os anexos são endereçados pelo SHA-256 do conteúdo; gravar o mesmo conteúdo
+    duas vezes não duplica dados.
+    """
+
+    backend_name = None
+
+    def put(self, digest, data):
+        raise NotImplementedError
+
+    def put_file(self, digest, source):
+        """Grava o conteúdo de um arquivo binário aberto (lido a partir da posição atual)"""
+        self.put(digest, source.read())
+
+    def open(self, digest):
+        """Retorna um arquivo binário (com seek) para leitura do conteúdo"""
+        raise NotImplementedError
+
+    def exists(self, digest):
+        raise NotImplementedError
+
+    def delete(self, digest):
+        raise NotImplementedError
+
+    def local_path(self, digest):
+        """Caminho no sistema de arquivos, quando o backend for local (ou None)"""
+        return None
+
+
+class LocalFileStore(AttachmentStore):
+    """Armazena anexos no sistema de arquivos local em <raiz>/ab/cd/<sha256>"""
+
+    backend_name = 'local'
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, digest):
+        # O hash vira caminho no disco: nada além de 64 dígitos hexadecimais
+        if not isinstance(digest, str) or not SHA256_PATTERN.fullmatch(digest):
+            raise ValueError(f'Hash de anexo inválido: {digest!r}')
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def put(self, digest, data):
+        self.put_file(digest, io.BytesIO(data))
+
+    def put_file(self, digest, source):
+        path = self._path(digest)
+        if os.path.exists(path):
+            return
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        # Grava em arquivo temporário e renomeia para evitar leituras parciais
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                shutil.copyfileobj(source, tmp_file, UPLOAD_CHUNK_SIZE)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def open(self, digest):
+        return open(self._path(digest), 'rb')
+
+    def local_path(self, digest):
+        return self._path(digest)
+
+    def exists(self, digest):
+        return os.path.exists(self._path(digest))
+
+    def delete(self, digest):
+        if self.exists(digest):
+            os.remove(self._path(digest))
+
+
+class DatabaseStore(AttachmentStore):
+    """Armazena o conteúdo dos anexos na tabela attachment_blobs
+
+    Para ambientes sem disco persistente compartilhado (ex.: Vercel, onde o
+    sistema de arquivos é efêmero e cada instância tem o seu). A gravação
+    acompanha a transação da sessão.
+    """
+
+    backend_name = 'database'
+
+    def __init__(self, root=None):
+        self.root = root
+
+    def put(self, digest, data):
+        table = AttachmentBlob.__table__
+        db.session.execute(insert_ignoring_duplicates(table, {'sha256': digest, 'data': data}))
+
+    def open(self, digest):
+        data = db.session.query(AttachmentBlob.data).filter(AttachmentBlob.sha256 == digest).scalar()
+        if data is None:
+            raise FileNotFoundError(digest)
+        return io.BytesIO(data)
+
+    def exists(self, digest):
+        return db.session.query(AttachmentBlob.sha256).filter(AttachmentBlob.sha256 == digest).first() is not None
+
+    def delete(self, digest):
+        db.session.query(AttachmentBlob).filter(AttachmentBlob.sha256 == digest).delete(synchronize_session=False)
+
+
+# Backends disponíveis (ATTACHMENTS_BACKEND)
+STORE_BACKENDS = {
+    LocalFileStore.backend_name: LocalFileStore,
+    DatabaseStore.backend_name: DatabaseStore,
+}
+
+
+def get_store(backend=None):
+    """Retorna o backend de anexos (o configurado em ATTACHMENTS_BACKEND, por padrão)
+
+    backend permite ler anexos gravados antes de uma troca de backend (ver
+    Attachment.storage_backend).
+    """
+    backend = backend or current_app.config.get('ATTACHMENTS_BACKEND', 'local')
+    stores = current_app.extensions.setdefault('attachment_stores', {})
+    store = stores.get(backend)
+    if store is None:
+        if backend not in STORE_BACKENDS:
+            raise ValueError(f'Backend de anexos desconhecido: {backend}')
+
+        root = current_app.config.get('ATTACHMENTS_DIR', 'attachments')
+        if not os.path.isabs(root):
+            root = os.path.join(current_app.instance_path, root)
+
+        store = STORE_BACKENDS[backend](root)
+        stores[backend] = store
+
+    return store
+
+
+def spool_upload(stream):
+    """Copia um upload em blocos para um arquivo temporário, calculando o SHA-256
+
+    Retorna (digest, arquivo) com o arquivo posicionado no início; o chamador
+    fecha o arquivo. O upload nunca fica inteiro em memória.
+    """
+    digest = hashlib.sha256()
+    spool = tempfile.TemporaryFile()
+    try:
+        for chunk in iter(lambda: stream.read(UPLOAD_CHUNK_SIZE), b''):
+            digest.update(chunk)
+            spool.write(chunk)
+        spool.seek(0)
+    except Exception:
+        spool.close()
+        raise
+
+    return digest.hexdigest(), spool
+
+
+def insert_ignoring_duplicates(table, values):
+    """INSERT que não falha quando a chave única já existe (gravações concorrentes)"""
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect == 'mysql':
+        return mysql.insert(table).values(values).prefix_with('IGNORE')
+
+    if dialect == 'sqlite':
+        return sqlite.insert(table).values(values).on_conflict_do_nothing()
+
+    return table.insert().values(values)
+
+
+def guess_content_type(data):
+    for magic, content_type in MAGIC_NUMBERS:
+        if data.startswith(magic):
+            return content_type
+    return 'application/octet-stream'
+
+
+def decode_payload(value):
+    """Decodifica um conteúdo inline (data URI ou base64 puro)
+
+    Retorna (bytes, content_type) ou None quando o valor não é um conteúdo
+    inline (ex.: URL de foto ou referência de anexo).
+    """
+    if not isinstance(value, str) or not value or Attachment.is_reference(value):
+        return None
+
+    match = DATA_URI_PATTERN.match(value)
+    if match:
+        try:
+            data = base64.b64decode(match.group('data'), validate=False)
+        except (binascii.Error, ValueError):
+            return None
+        return data, match.group('content_type') or guess_content_type(data)
+
+    try:
+        data = base64.b64decode(''.join(value.split()), validate=True)
+    except (binascii.Error, ValueError):
+        return None
+
+    if not data:
+        return None
+
+    return data, guess_content_type(data)
+
+
+def save_attachment(data, content_type='application/octet-stream'):
+    """Grava o conteúdo no backend e registra o anexo (deduplicado pelo hash)
+
+    Duas gravações simultâneas do mesmo conteúdo não violam a unicidade de
+    sha256: o registro é inserido ignorando duplicatas e relido em seguida.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+
+    attachment = Attachment.query.filter_by(sha256=digest).first()
+    if attachment:
+        return attachment
+
+    store = get_store()
+    store.put(digest, data)
+
+    db.session.execute(insert_ignoring_duplicates(Attachment.__table__, {
+        'sha256': digest,
+        'content_type': content_type,
+        'size': len(data),
+        'storage_backend': store.backend_name,
+        'created_at': datetime.utcnow()
+    }))
+    return Attachment.query.filter_by(sha256=digest).one()
+
+
+def externalize_value(value):
+    """Move um conteúdo inline para o armazenamento de anexos e retorna a referência
+
+    Valores que não são conteúdo inline (None, URLs, referências) são
+    retornados sem alteração.
+    """
+    decoded = decode_payload(value)
+    if decoded is None:
+        return value
+
+    data, content_type = decoded
+    return save_attachment(data, content_type).reference
+
+
+def externalize_photos(value):
+    """Externaliza as fotos inline de uma lista JSON, mantendo URLs e referências"""
+    if value is None or value == '':
+        return value
+
+    photos = value
+    if isinstance(value, str):
+        try:
+            photos = json.loads(value)
+        except ValueError:
+            return externalize_value(value)
+
+    if not isinstance(photos, list):
+        return value if isinstance(value, str) else json.dumps(photos)
+
+    return json.dumps([
+        externalize_value(photo) if isinstance(photo, str) else photo
+        for photo in photos
+    ])
+
+
+def has_inline_photos(value):
+    """Indica se a lista JSON de fotos ainda contém conteúdo inline"""
+    if not value:
+        return False
+
+    try:
+        photos = json.loads(value)
+    except ValueError:
+        return decode_payload(value) is not None
+
+    if not isinstance(photos, list):
+        return False
+
+    return any(decode_payload(photo) is not None for photo in photos if isinstance(photo, str))
+
+
+def attachment_visible_to(digest, user):
+    """Verifica se o usuário pode ler o anexo
+
+    Como nas rotas de inspeções e manutenções, técnicos só acessam anexos
+    (assinatura ou fotos) de registros atribuídos a eles; os demais perfis
+    acessam todos.
+    """
+    if user.role != 'tecnico':
+        return True
+
+    reference = Attachment.REFERENCE_PREFIX + digest
+    for model in (Inspection, Maintenance):
+        owned = db.session.query(model.id).filter(
+            model.technician_id == user.id,
+            db.or_(model.signature == reference, model.photos.contains(reference, autoescape=True))
+        ).first()
+        if owned is not None:
+            return True
+
+    return False
+
+
+def attachment_response(digest):
+    """Transmite um anexo com ETag (hash do conteúdo) e suporte a Range"""
+    attachment = Attachment.query.filter_by(sha256=digest).first()
+    if not attachment:
+        return None
+
+    store = get_store(attachment.storage_backend)
+    if not store.exists(digest):
+        return None
+
+    # Com caminho local o tamanho é conhecido e o Range é atendido sem ler o arquivo todo
+    source = store.local_path(digest)
+    if source is None:
+        with store.open(digest) as stored_file:
+            source = io.BytesIO(stored_file.read())
+
+    response = send_file(
+        source,
+        mimetype=attachment.content_type,
+        etag=digest,
+        conditional=True,
+        max_age=ATTACHMENT_MAX_AGE
+    )
+
+    # Assinaturas e fotos exigem JWT (e técnicos só veem as suas): apenas o cache do
+    # próprio navegador pode guardá-las, nunca proxies ou CDNs compartilhados
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
+
+
+def stored_value_response(value):
+    """Transmite o conteúdo de uma coluna signature (referência ou base64 legado)"""
+    if Attachment.is_reference(value):
+        return attachment_response(Attachment.digest_from_reference(value))
+
+    decoded = decode_payload(value)
+    if decoded is None:
+        return None
+
+    data, content_type = decoded
+    return send_file(
+        io.BytesIO(data),
+        mimetype=content_type,
+        etag=hashlib.sha256(data).hexdigest(),
+        conditional=True
+    )
@@ -0,0 +1,235 @@
+import csv
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.exc import DBAPIError
+
+# Linhas por lote de INSERT (executemany)
+DEFAULT_CHUNK_SIZE = 5000
+
+# Intervalo (em linhas) entre mensagens de progresso de uma tabela
+PROGRESS_EVERY = 50000
+
+# Marcador de NULL do LOAD DATA
+CSV_NULL = '\\N'
+
+STAGING_MODES = ('none', 'csv')
+
+
+def chunked(rows, size):
+    """Agrupa um iterável de linhas em listas de até size elementos"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def fk_levels(tables):
+    """Agrupa as tabelas em níveis: cada tabela só depende de tabelas de níveis anteriores
+
+    Tabelas de um mesmo nível são independentes entre si e podem ser carregadas
+    em paralelo. Dependências fora do conjunto informado são ignoradas.
+    """
+    names = {table.name for table in tables}
+    levels = {}
+
+    def level(table):
+        if table.name not in levels:
+            levels[table.name] = 0
+            parents = [
+                fk.column.table for fk in table.foreign_keys
+                if fk.column.table.name in names and fk.column.table.name != table.name
+            ]
+            levels[table.name] = 1 + max((level(parent) for parent in parents), default=-1)
+        return levels[table.name]
+
+    grouped = {}
+    for table in tables:
+        grouped.setdefault(level(table), []).append(table)
+
+    return [grouped[index] for index in sorted(grouped)]
+
+
+def _csv_value(value):
+    if value is None:
+        return CSV_NULL
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, (date, Decimal)):
+        return str(value)
+    if isinstance(value, str):
+        return value.replace('\\', '\\\\')
+    return value
+
+
+class TableStats:
+    """Linhas e tempo de carga de uma tabela"""
+
+    __slots__ = ('name', 'rows', 'seconds', 'method')
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = 0
+        self.seconds = 0.0
+        self.method = 'executemany'
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class BulkLoader:
+    """Carga em massa com SQLAlchemy Core, respeitando a ordem das chaves estrangeiras
+
+    - INSERT em lotes (executemany) com tamanho configurável;
+    - staging opcional em CSV com LOAD DATA LOCAL INFILE (MySQL);
+    - tabelas independentes (mesmo nível de FK) carregadas em paralelo, cada uma
+      com sua própria conexão. No SQLite a carga é sempre sequencial (um único
+      escritor por banco).
+    """
+
+    def __init__(self, engine, chunk_size=DEFAULT_CHUNK_SIZE, workers=4, staging='none',
+                 report=print, progress_every=PROGRESS_EVERY):
+        if staging not in STAGING_MODES:
+            raise ValueError(f'Staging desconhecido: {staging}. Opções: {", ".join(STAGING_MODES)}')
+
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.dialect = engine.dialect.name
+        self.workers = 1 if self.dialect == 'sqlite' else max(1, workers)
+        self.staging = staging
+        self.report = report or (lambda message: None)
+        self.progress_every = progress_every
+        self.stats = {}
+        self._report_lock = threading.Lock()
+        self._infile_engine = None
+
+    def _log(self, message):
+        with self._report_lock:
+            self.report(message)
+
+    def load(self, sources):
+        """Carrega [(tabela, linhas)] e retorna as estatísticas por tabela"""
+        rows_by_table = {table.name: rows for table, rows in sources}
+        levels = fk_levels([table for table, _ in sources])
+        started_at = time.perf_counter()
+
+        for tables in levels:
+            if self.workers == 1 or len(tables) == 1:
+                for table in tables:
+                    self._load_table(table, rows_by_table[table.name])
+                continue
+
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(tables))) as executor:
+                futures = [
+                    executor.submit(self._load_table, table, rows_by_table[table.name])
+                    for table in tables
+                ]
+                for future in futures:
+                    future.result()
+
+        self.elapsed = time.perf_counter() - started_at
+        return self.stats
+
+    def _load_table(self, table, rows):
+        stats = TableStats(table.name)
+        self.stats[table.name] = stats
+        started_at = time.perf_counter()
+
+        if self.staging == 'csv' and self.dialect == 'mysql':
+            self._load_via_csv(table, rows, stats)
+        else:
+            with self.engine.connect() as connection:
+                self._insert_chunks(connection, table, rows, stats)
+
+        stats.seconds = time.perf_counter() - started_at
+        self._log(f'   {table.name}: {stats.rows} linhas em {stats.seconds:.1f}s '
+                  f'({stats.rows_per_second:,.0f} linhas/s, {stats.method})')
+
+    def _insert_chunks(self, connection, table, rows, stats):
+        next_report = self.progress_every
+
+        for chunk in chunked(rows, self.chunk_size):
+            connection.execute(table.insert(), chunk)
+            connection.commit()
+            stats.rows += len(chunk)
+
+            if stats.rows >= next_report:
+                next_report += self.progress_every
+                self._log(f'   ... {table.name}: {stats.rows} linhas')
+
+    def _get_infile_engine(self):
+        # LOAD DATA LOCAL exige local_infile habilitado na conexão do cliente
+        if self._infile_engine is None:
+            self._infile_engine = create_engine(self.engine.url, connect_args={'local_infile': True})
+        return self._infile_engine
+
+    def _load_via_csv(self, table, rows, stats):
+        """Grava as linhas em CSV temporário e carrega com LOAD DATA LOCAL INFILE"""
+        fd, path = tempfile.mkstemp(prefix=f'{table.name}_', suffix='.csv')
+        columns = None
+        written = 0
+
+        try:
+            with os.fdopen(fd, 'w', newline='', encoding='utf-8') as csv_file:
+                writer = csv.writer(csv_file, lineterminator='\n')
+                for row in rows:
+                    if columns is None:
+                        columns = list(row)
+                    writer.writerow([_csv_value(row[column]) for column in columns])
+                    written += 1
+
+            if not written:
+                return
+
+            statement = (
+                f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE `{table.name}` CHARACTER SET utf8mb4 "
+                "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '\\\\' "
+                "LINES TERMINATED BY '\\n' "
+                f"({', '.join(f'`{column}`' for column in columns)})"
+            )
+
+            try:
+                with self._get_infile_engine().begin() as connection:
+                    connection.exec_driver_sql(statement)
+                stats.rows = written
+                stats.method = 'load data'
+            except DBAPIError as error:
+                # Servidor sem local_infile: carrega o mesmo CSV com executemany
+                self._log(f'   {table.name}: LOAD DATA indisponível ({error.orig}); usando executemany')
+                with self.engine.connect() as connection:
+                    self._insert_chunks(connection, table, self._read_csv(path, columns), stats)
+        finally:
+            os.remove(path)
+
+    @staticmethod
+    def _read_csv(path, columns):
+        with open(path, newline='', encoding='utf-8') as csv_file:
+            for values in csv.reader(csv_file):
+                yield {
+                    column: None if value == CSV_NULL else value.replace('\\\\', '\\')
+                    for column, value in zip(columns, values)
+                }
+
+    def summary(self):
+        """Linhas do relatório final de throughput"""
+        total_rows = sum(stats.rows for stats in self.stats.values())
+        elapsed = getattr(self, 'elapsed', 0.0)
+        lines = [f"{'tabela':24} {'linhas':>10} {'segundos':>9} {'linhas/s':>11}  método"]
+        for stats in self.stats.values():
+            lines.append(f'{stats.name:24} {stats.rows:>10} {stats.seconds:>9.1f} '
+                         f'{stats.rows_per_second:>11,.0f}  {stats.method}')
+        rate = total_rows / elapsed if elapsed else 0.0
+        lines.append(f"{'total':24} {total_rows:>10} {elapsed:>9.1f} {rate:>11,.0f}")
+        return lines
@@ -0,0 +1,146 @@
+import re
+from sqlalchemy import inspect
+from ..models import db, Client
+from ..models.client import normalize_search_text, only_digits
+from ..jobs import job_handler
+
+# Termos formados só por dígitos e pontuação de documento são buscados no CPF/CNPJ
+DOCUMENT_TERM_PATTERN = re.compile(r'^[\d.\-/\s]+$')
+
+# Mínimo de dígitos para busca por prefixo de CPF/CNPJ
+MIN_DOCUMENT_DIGITS = 2
+
+# Tamanho mínimo de palavra indexada pelo FULLTEXT do InnoDB (innodb_ft_min_token_size)
+MYSQL_MIN_TOKEN_SIZE = 3
+
+FTS_TABLE = db.table('clients_fts', db.column('rowid'), db.column('search_text'), db.column('rank'))
+
+# Disponibilidade da tabela FTS5 por engine (verificada uma vez)
+_fts_available = {}
+
+
+def search_tokens(term):
+    """Divide o termo normalizado em palavras (letras e dígitos)"""
+    return re.findall(r'\w+', normalize_search_text(term))
+
+
+def _sqlite_fts_available():
+    engine = db.engine
+    if engine not in _fts_available:
+        _fts_available[engine] = inspect(engine).has_table('clients_fts')
+    return _fts_available[engine]
+
+
+def _document_search(query, digits):
+    """Prefixo dos dígitos do CPF/CNPJ (LIKE 'digitos%' usa o índice); exato primeiro"""
+    return query.filter(
+        Client.cpf_cnpj_digits.like(f'{digits}%')
+    ).order_by(
+        db.case((Client.cpf_cnpj_digits == digits, 0), else_=1),
+        Client.name,
+        Client.id
+    )
+
+
+def _mysql_search(query, tokens):
+    """FULLTEXT em modo booleano: todas as palavras, cada uma como prefixo"""
+    indexed = [token for token in tokens if len(token) >= MYSQL_MIN_TOKEN_SIZE]
+    short = [token for token in tokens if len(token) < MYSQL_MIN_TOKEN_SIZE]
+
+    if not indexed:
+        return _fallback_search(query, tokens)
+
+    match = Client.search_text.match(' '.join(f'+{token}*' for token in indexed))
+    query = query.filter(match)
+
+    # Palavras curtas não são indexadas; filtradas sobre as linhas já encontradas
+    for token in short:
+        query = query.filter(Client.search_text.like(f'%{token}%'))
+
+    return query.order_by(match.desc(), Client.name, Client.id)
+
+
+def _sqlite_search(query, tokens):
+    """FTS5: todas as palavras como prefixo, ordenadas pelo bm25 (coluna rank)"""
+    expression = ' '.join(f'"{token}"*' for token in tokens)
+    return query.join(
+        FTS_TABLE, FTS_TABLE.c.rowid == Client.id
+    ).filter(
+        FTS_TABLE.c.search_text.op('MATCH')(expression)
+    ).order_by(FTS_TABLE.c.rank, Client.name, Client.id)
+
+
+def _fallback_search(query, tokens):
+    """Sem índice de texto: todas as palavras na coluna normalizada; início do texto primeiro"""
+    for token in tokens:
+        query = query.filter(Client.search_text.like(f'%{token}%'))
+
+    return query.order_by(
+        db.case((Client.search_text.like(f'{tokens[0]}%'), 0), else_=1),
+        Client.name,
+        Client.id
+    )
+
+
+def search_clients(query, term):
+    """Aplica a busca de clientes à consulta, já ordenada por relevância
+
+    CPF/CNPJ (com ou sem pontuação) usa prefixo dos dígitos; demais termos usam
+    o índice de texto completo do banco (FULLTEXT no MySQL, FTS5 no SQLite).
+    """
+    term = (term or '').strip()
+
+    digits = only_digits(term)
+    if DOCUMENT_TERM_PATTERN.match(term) and len(digits) >= MIN_DOCUMENT_DIGITS:
+        return _document_search(query, digits)
+
+    tokens = search_tokens(term)
+    if not tokens:
+        return query.order_by(Client.name, Client.id)
+
+    dialect = db.engine.dialect.name
+    if dialect == 'mysql':
+        return _mysql_search(query, tokens)
+    if dialect == 'sqlite' and _sqlite_fts_available():
+        return _sqlite_search(query, tokens)
+
+    return _fallback_search(query, tokens)
+
+
+def rebuild_search_index(batch_size=500, progress=None):
+    """Recalcula search_text/cpf_cnpj_digits de todos os clientes e reconstrói o FTS5
+
+    progress(percentual, mensagem) é chamado após cada lote.
+    """
+    updated = 0
+    last_id = 0
+    total = Client.query.count() if progress else 0
+
+    while True:
+        clients = Client.query.filter(Client.id > last_id).order_by(Client.id).limit(batch_size).all()
+        if not clients:
+            break
+
+        for client in clients:
+            last_id = client.id
+            client.refresh_search_fields()
+            updated += 1
+
+        db.session.commit()
+        db.session.expunge_all()
+
+        if progress:
+            progress(100 * updated // max(total, updated), f'{updated}/{total} clientes reindexados')
+
+    if db.engine.dialect.name == 'sqlite' and _sqlite_fts_available():
+        db.session.execute(db.text("INSERT INTO clients_fts(clients_fts) VALUES ('rebuild')"))
+        db.session.commit()
+
+    return updated
+
+
+@job_handler('clients.reindex')
+def reindex_job(context):
+    """Reindexação dos clientes executada como tarefa"""
+    updated = rebuild_search_index(context.payload.get('batch_size', 500), progress=context.report)
+    return {'updated': updated}
@@ -0,0 +1,445 @@
+import codecs
+import csv
+import itertools
+import json
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from datetime import date, datetime, timedelta
+from xml.etree.ElementTree import iterparse
+from ..models import db, Equipment, Inventory, equipment_standards
+from .bulk_loader import chunked
+from .inventory_counters import reconcile_inventory_counts
+from .reference_data import standards_by_id
+
+FORMAT_CSV = 'csv'
+FORMAT_XLSX = 'xlsx'
+FORMAT_NDJSON = 'ndjson'
+FORMATS = (FORMAT_CSV, FORMAT_XLSX, FORMAT_NDJSON)
+
+FORMAT_EXTENSIONS = {
+    '.csv': FORMAT_CSV,
+    '.xlsx': FORMAT_XLSX,
+    '.ndjson': FORMAT_NDJSON,
+    '.jsonl': FORMAT_NDJSON,
+}
+
+FORMAT_CONTENT_TYPES = {
+    'text/csv': FORMAT_CSV,
+    'application/csv': FORMAT_CSV,
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': FORMAT_XLSX,
+    'application/x-ndjson': FORMAT_NDJSON,
+    'application/jsonl': FORMAT_NDJSON,
+}
+
+# Linhas validadas e gravadas por lote (uma consulta de seriais e um INSERT por lote)
+DEFAULT_CHUNK_SIZE = 500
+
+# Erros detalhados no relatório; acima disso apenas a contagem é mantida
+MAX_REPORTED_ERRORS = 1000
+
+# Planilhas XLSX maiores que isso são copiadas para disco antes da leitura
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+REQUIRED_FIELDS = ('name', 'serial_number', 'inventory_id')
+TEXT_FIELDS = ('name', 'type', 'manufacturer', 'model', 'serial_number', 'tag_number',
+               'status', 'location', 'capacity', 'notes')
+DATE_FIELDS = ('manufacturing_date', 'installation_date', 'last_inspection_date',
+               'next_inspection_date', 'expiry_date')
+
+# Datas do Excel são dias desde 30/12/1899
+EXCEL_EPOCH = date(1899, 12, 30)
+
+LIST_SEPARATOR = re.compile(r'[\s,;|]+')
+
+XLSX_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+CELL_REFERENCE = re.compile(r'([A-Z]+)')
+
+
+class ImportFileError(ValueError):
+    """Arquivo de importação ilegível ou formato não suportado"""
+
+
+def detect_format(filename=None, content_type=None, explicit=None):
+    """Formato do arquivo: explícito, pela extensão ou pelo Content-Type"""
+    if explicit:
+        explicit = explicit.lower()
+        if explicit not in FORMATS:
+            raise ImportFileError(f'Formato inválido: {explicit}. Opções: {", ".join(FORMATS)}')
+        return explicit
+
+    if filename:
+        extension = os.path.splitext(filename)[1].lower()
+        if extension in FORMAT_EXTENSIONS:
+            return FORMAT_EXTENSIONS[extension]
+
+    if content_type:
+        content_type = content_type.split(';')[0].strip().lower()
+        if content_type in FORMAT_CONTENT_TYPES:
+            return FORMAT_CONTENT_TYPES[content_type]
+
+    raise ImportFileError(f'Não foi possível identificar o formato do arquivo. Opções: {", ".join(FORMATS)}')
+
+
+def _normalize_header(name):
+    return str(name or '').strip().lower().replace(' ', '_')
+
+
+def _records(header, rows):
+    header = [_normalize_header(name) for name in header]
+    for values in rows:
+        if not any(value not in (None, '') for value in values):
+            continue  # Linha em branco
+        yield dict(zip(header, values))
+
+
+def _csv_rows(stream):
+    """Registros de um CSV (UTF-8, separador ',' ou ';' detectado pelo cabeçalho)"""
+    lines = codecs.getreader('utf-8-sig')(stream)
+    first = lines.readline()
+    if not first:
+        return
+
+    delimiter = ';' if first.count(';') > first.count(',') else ','
+    reader = csv.reader(itertools.chain([first], lines), delimiter=delimiter)
+    header = next(reader)
+    yield from _records(header, reader)
+
+
+def _ndjson_rows(stream):
+    """Registros de um NDJSON (um objeto JSON por linha)"""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        if not isinstance(record, dict):
+            yield {'__error__': 'Linha não é um objeto JSON válido'}
+            continue
+        yield {_normalize_header(key): value for key, value in record.items()}
+
+
+def _column_index(reference):
+    match = CELL_REFERENCE.match(reference or '')
+    if not match:
+        return None
+    index = 0
+    for letter in match.group(1):
+        index = index * 26 + ord(letter) - 64
+    return index - 1
+
+
+def _xlsx_shared_strings(archive):
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return []
+
+    strings = []
+    with archive.open('xl/sharedStrings.xml') as xml_file:
+        for _, element in iterparse(xml_file):
+            if element.tag == f'{XLSX_NS}si':
+                strings.append(''.join(text.text or '' for text in element.iter(f'{XLSX_NS}t')))
+                element.clear()
+    return strings
+
+
+def _xlsx_sheet_rows(archive, sheet, shared_strings):
+    """Linhas da planilha lidas incrementalmente (iterparse), liberando cada linha após o uso"""
+    with archive.open(sheet) as xml_file:
+        root = None
+        for event, element in iterparse(xml_file, events=('start', 'end')):
+            if root is None:
+                root = element
+            if event != 'end' or element.tag != f'{XLSX_NS}row':
+                continue
+
+            values = {}
+            for position, cell in enumerate(element.iter(f'{XLSX_NS}c')):
+                index = _column_index(cell.get('r'))
+                cell_type = cell.get('t')
+                if cell_type == 'inlineStr':
+                    value = ''.join(text.text or '' for text in cell.iter(f'{XLSX_NS}t'))
+                else:
+                    node = cell.find(f'{XLSX_NS}v')
+                    value = node.text if node is not None else None
+                    if value is not None and cell_type == 's':
+                        value = shared_strings[int(value)]
+                values[position if index is None else index] = value
+
+            root.clear()
+            yield [values.get(index) for index in range(max(values) + 1)] if values else []
+
+
+def _xlsx_rows(stream):
+    """Registros da primeira planilha de um XLSX, sem dependências externas"""
+    try:
+        archive = zipfile.ZipFile(stream)
+    except zipfile.BadZipFile:
+        raise ImportFileError('Arquivo XLSX inválido')
+
+    with archive:
+        sheets = sorted(
+            name for name in archive.namelist()
+            if name.startswith('xl/worksheets/sheet') and name.endswith('.xml')
+        )
+        if not sheets:
+            raise ImportFileError('Arquivo XLSX sem planilhas')
+
+        rows = _xlsx_sheet_rows(archive, sheets[0], _xlsx_shared_strings(archive))
+        header = next(rows, None)
+        if header is None:
+            return
+        yield from _records(header, rows)
+
+
+def _seekable(stream):
+    """XLSX (zip) exige leitura aleatória: copia fluxos sem seek para um arquivo temporário"""
+    try:
+        if stream.seekable():
+            return stream
+    except AttributeError:
+        pass
+
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    shutil.copyfileobj(stream, spool)
+    spool.seek(0)
+    return spool
+
+
+def read_records(stream, file_format):
+    """Itera os registros (dicionários) do arquivo sem carregá-lo inteiro em memória"""
+    if file_format == FORMAT_CSV:
+        return _csv_rows(stream)
+    if file_format == FORMAT_NDJSON:
+        return _ndjson_rows(stream)
+    if file_format == FORMAT_XLSX:
+        return _xlsx_rows(_seekable(stream))
+    raise ImportFileError(f'Formato inválido: {file_format}. Opções: {", ".join(FORMATS)}')
+
+
+def _parse_date(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return EXCEL_EPOCH + timedelta(days=int(value))
+
+    value = str(value).strip()
+    if re.fullmatch(r'\d+(\.\d+)?', value):
+        return EXCEL_EPOCH + timedelta(days=int(float(value)))
+
+    if re.fullmatch(r'\d{2}/\d{2}/\d{4}', value):
+        return datetime.strptime(value, '%d/%m/%Y').date()
+
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).date()
+
+
+def _parse_int(value):
+    if isinstance(value, bool):
+        raise ValueError(value)
+    if isinstance(value, str) and '.' in value:
+        value = float(value)  # Números de planilha chegam como "12.0"
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(value)
+    return int(value)
+
+
+def _parse_standard_ids(value):
+    if value in (None, ''):
+        return []
+    if isinstance(value, list):
+        return [_parse_int(item) for item in value]
+    return [_parse_int(item) for item in LIST_SEPARATOR.split(str(value).strip()) if item]
+
+
+class EquipmentImporter:
+    """Importação de equipamentos em lotes, com relatório de erros por linha
+
+    Cada lote é validado contra conjuntos carregados de uma vez (normas,
+    inventários e seriais já cadastrados no lote), gravado com um INSERT em
+    lote via Core e confirmado. O uso de memória depende do tamanho do lote,
+    não do arquivo.
+    """
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE, default_inventory_id=None,
+                 max_errors=MAX_REPORTED_ERRORS, progress=None):
+        self.chunk_size = chunk_size
+        self.default_inventory_id = default_inventory_id
+        self.max_errors = max_errors
+        self.progress = progress
+        self.total_rows = 0
+        self.created_count = 0
+        self.error_count = 0
+        self.errors = []
+        self.inventory_ids = set()
+        self._known_inventories = set()
+        self._standard_ids = None
+
+    def _add_error(self, row_number, messages):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'row': row_number, 'errors': messages})
+
+    def _validate(self, record):
+        """Converte um registro; retorna (valores, standard_ids, erros)"""
+        if '__error__' in record:
+            return None, None, [record['__error__']]
+
+        errors = []
+        values = {}
+
+        if record.get('inventory_id') in (None, '') and self.default_inventory_id is not None:
+            record['inventory_id'] = self.default_inventory_id
+
+        for field in REQUIRED_FIELDS:
+            if record.get(field) in (None, ''):
+                errors.append(f'{field} é obrigatório')
+
+        for field in TEXT_FIELDS:
+            value = record.get(field)
+            values[field] = str(value).strip() if value not in (None, '') else None
+
+        length = Equipment.__table__.c
+        for field in TEXT_FIELDS:
+            limit = getattr(length[field].type, 'length', None)
+            if values[field] and limit and len(values[field]) > limit:
+                errors.append(f'{field} excede {limit} caracteres')
+
+        values['type'] = values['type'] or Equipment.TYPE_EXTINGUISHER
+        if values['type'] not in Equipment.TYPES:
+            errors.append(f'type deve ser um de: {", ".join(Equipment.TYPES)}')
+
+        values['status'] = values['status'] or Equipment.STATUS_ACTIVE
+        if values['status'] not in Equipment.STATUSES:
+            errors.append(f'status deve ser um de: {", ".join(Equipment.STATUSES)}')
+
+        for field in DATE_FIELDS:
+            value = record.get(field)
+            values[field] = None
+            if value not in (None, ''):
+                try:
+                    values[field] = _parse_date(value)
+                except (TypeError, ValueError):
+                    errors.append(f'{field} inválida: {value}')
+
+        values['inventory_id'] = None
+        if record.get('inventory_id') not in (None, ''):
+            try:
+                values['inventory_id'] = _parse_int(record['inventory_id'])
+            except (TypeError, ValueError):
+                errors.append(f'inventory_id inválido: {record["inventory_id"]}')
+
+        standard_ids = []
+        try:
+            standard_ids = _parse_standard_ids(record.get('standard_ids'))
+        except (TypeError, ValueError):
+            errors.append(f'standard_ids inválido: {record.get("standard_ids")}')
+
+        unknown = sorted(set(standard_ids) - self._standard_ids)
+        if unknown:
+            errors.append(f'Normas não encontradas: {", ".join(map(str, unknown))}')
+
+        return values, sorted(set(standard_ids)), errors
+
+    def _load_inventories(self, inventory_ids):
+        missing = set(inventory_ids) - self._known_inventories
+        if missing:
+            rows = db.session.query(Inventory.id).filter(Inventory.id.in_(missing))
+            self._known_inventories.update(inventory_id for inventory_id, in rows)
+
+    def _existing_serials(self, serials):
+        if not serials:
+            return set()
+        rows = db.session.query(Equipment.serial_number).filter(Equipment.serial_number.in_(serials))
+        return {serial for serial, in rows}
+
+    def _import_chunk(self, chunk):
+        validated = []
+        for row_number, record in chunk:
+            values, standard_ids, errors = self._validate(record)
+            validated.append((row_number, values, standard_ids, errors))
+
+        self._load_inventories({
+            values['inventory_id'] for _, values, _, errors in validated
+            if values and values['inventory_id'] is not None
+        })
+        existing = self._existing_serials({
+            values['serial_number'] for _, values, _, _ in validated
+            if values and values['serial_number']
+        })
+
+        rows = []
+        links = {}
+        for row_number, values, standard_ids, errors in validated:
+            if values:
+                if values['inventory_id'] is not None and values['inventory_id'] not in self._known_inventories:
+                    errors.append('Inventário não encontrado')
+                if values['serial_number'] in existing:
+                    errors.append('Número de série já existe')
+
+            if errors:
+                self._add_error(row_number, errors)
+                continue
+
+            # Seriais repetidos no mesmo lote: o primeiro vale; nos lotes seguintes a consulta já os encontra
+            existing.add(values['serial_number'])
+            rows.append(values)
+            links[values['serial_number']] = standard_ids
+
+        if rows:
+            db.session.execute(Equipment.__table__.insert(), rows)
+
+            if any(links.values()):
+                ids = dict(db.session.query(Equipment.serial_number, Equipment.id).filter(
+                    Equipment.serial_number.in_([serial for serial, standard_ids in links.items() if standard_ids])
+                ))
+                db.session.execute(equipment_standards.insert(), [
+                    {'equipment_id': ids[serial], 'standard_id': standard_id}
+                    for serial, standard_ids in links.items()
+                    for standard_id in standard_ids
+                ])
+
+            self.inventory_ids.update(values['inventory_id'] for values in rows)
+
+        db.session.commit()
+        self.created_count += len(rows)
+
+    def run(self, records, first_row=2):
+        """Importa os registros e retorna o relatório
+
+        first_row é o número da primeira linha de dados no arquivo (2 quando há
+        cabeçalho), usado no relatório de erros.
+        """
+        self._standard_ids = set(standards_by_id())
+
+        numbered = ((index + first_row, record) for index, record in enumerate(records))
+        for chunk in chunked(numbered, self.chunk_size):
+            self.total_rows += len(chunk)
+            self._import_chunk(chunk)
+            if self.progress:
+                self.progress(f'{self.total_rows} linhas processadas, {self.created_count} equipamentos criados')
+
+        # O INSERT via Core não passa pelos eventos de flush que mantêm os contadores
+        if self.inventory_ids:
+            reconcile_inventory_counts(sorted(self.inventory_ids))
+            db.session.commit()
+
+        return self.report()
+
+    def report(self):
+        return {
+            'total_rows': self.total_rows,
+            'created_count': self.created_count,
+            'error_count': self.error_count,
+            'errors': self.errors,
+            'errors_truncated': self.error_count > len(self.errors)
+        }
+
+
+def import_equipments(stream, file_format, default_inventory_id=None,
+                      chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """Importa equipamentos de um arquivo CSV, XLSX ou NDJSON"""
+    importer = EquipmentImporter(chunk_size, default_inventory_id=default_inventory_id, progress=progress)
+    first_row = 1 if file_format == FORMAT_NDJSON else 2
+    return importer.run(read_records(stream, file_format), first_row=first_row)
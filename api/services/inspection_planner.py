@@ -0,0 +1,520 @@
+import time
+from datetime import datetime, date
+from flask import current_app
+from sqlalchemy.dialects import mysql, sqlite
+from ..models import db, Client, Contract, Branch, Inventory, Equipment, Inspection, equipment_standards
+from .bulk_loader import chunked
+from .recurrence import add_months, schedule_batch
+from .inspection_schedules import schedule_cache
+
+# Tamanho dos lotes de INSERT multi-linha
+INSERT_BATCH_SIZE = 500
+
+# Linhas buscadas por vez ao percorrer os equipamentos do planejamento
+STREAM_BATCH_SIZE = 1000
+
+
+def planning_window(months_ahead, today=None):
+    """Janela do planejamento: de hoje até o mesmo dia months_ahead meses depois"""
+    today = today or date.today()
+    return today, add_months(today, months_ahead)
+
+
+def load_holidays():
+    """Feriados configurados em INSPECTION_HOLIDAYS (datas ISO separadas por vírgula)"""
+    try:
+        value = current_app.config.get('INSPECTION_HOLIDAYS', '')
+    except RuntimeError:
+        value = ''
+    return frozenset(date.fromisoformat(item.strip()) for item in value.split(',') if item.strip())
+
+
+def inspection_base_date(equipment, today):
+    """Data de referência da série: última inspeção, instalação ou hoje"""
+    return equipment.last_inspection_date or equipment.installation_date or today
+
+
+def _as_datetimes(dates):
+    return [datetime.combine(value, datetime.min.time()) for value in dates]
+
+
+def calculate_batch_dates(rows, months_ahead, schedules, standards=None, holidays=frozenset(), today=None):
+    """Datas de inspeção de um lote de linhas do planejamento, agrupadas por regra de recorrência
+
+    standards: {equipment_id: (standard_id, ...)} (ver load_scope_standards).
+    """
+    today, end_date = planning_window(months_ahead, today)
+    standards = standards or {}
+    items = [
+        (
+            schedules.resolve(row.type, row.contract_id, standards.get(row.equipment_id, ()), holidays),
+            inspection_base_date(row, today)
+        )
+        for row in rows
+    ]
+    return [_as_datetimes(dates) for dates in schedule_batch(items, today, end_date)]
+
+
+def _equipment_rows_query(contract_id=None, branch_id=None):
+    """Consulta única contratos ativos → filiais → inventários → equipamentos
+
+    Seleciona apenas as colunas usadas no planejamento. A ordenação agrupa por
+    empresa/filial e deixa adjacentes as linhas repetidas de um mesmo
+    equipamento quando a empresa possui mais de um contrato ativo.
+    """
+    query = db.session.query(
+        Contract.id.label('contract_id'),
+        Contract.contract_number,
+        Contract.company_id,
+        Branch.id.label('branch_id'),
+        Branch.name.label('branch_name'),
+        Branch.address.label('branch_address'),
+        Equipment.id.label('equipment_id'),
+        Equipment.name.label('equipment_name'),
+        Equipment.type,
+        Equipment.location,
+        Equipment.last_inspection_date,
+        Equipment.installation_date
+    ).join(
+        Branch, Branch.company_id == Contract.company_id
+    ).join(
+        Inventory, Inventory.branch_id == Branch.id
+    ).join(
+        Equipment, Equipment.inventory_id == Inventory.id
+    ).filter(
+        Contract.status == Contract.STATUS_ACTIVE
+    )
+
+    if contract_id:
+        query = query.filter(Contract.id == contract_id)
+
+    if branch_id:
+        query = query.filter(Branch.id == branch_id)
+
+    return query.order_by(Branch.company_id, Branch.id, Equipment.id, Contract.id)
+
+
+def has_active_contracts(contract_id=None):
+    """Verifica se existe ao menos um contrato ativo (opcionalmente um específico)"""
+    query = db.session.query(Contract.id).filter(Contract.status == Contract.STATUS_ACTIVE)
+
+    if contract_id:
+        query = query.filter(Contract.id == contract_id)
+
+    return query.first() is not None
+
+
+def load_company_names(contract_id=None):
+    """Pré-carrega {company_id: nome} das empresas com contrato ativo"""
+    query = db.session.query(Client.id, Client.name).join(
+        Contract, Contract.company_id == Client.id
+    ).filter(
+        Contract.status == Contract.STATUS_ACTIVE
+    )
+
+    if contract_id:
+        query = query.filter(Contract.id == contract_id)
+
+    return {row.id: row.name for row in query.distinct()}
+
+
+def _active_companies(contract_id=None):
+    """Subconsulta das empresas com contrato ativo (opcionalmente um específico)"""
+    query = db.session.query(Contract.company_id).filter(Contract.status == Contract.STATUS_ACTIVE)
+
+    if contract_id:
+        query = query.filter(Contract.id == contract_id)
+
+    return query
+
+
+def load_scope_standards(contract_id=None, branch_id=None):
+    """Mapa {equipment_id: (standard_id, ...)} dos equipamentos do escopo do planejamento
+
+    Lido por inteiro antes de abrir o streaming dos equipamentos: no MySQL o
+    yield_per usa um cursor sem buffer (SSCursor), e outra consulta na mesma
+    conexão descartaria em silêncio as linhas ainda não lidas. Só entram no
+    mapa os equipamentos que têm normas.
+    """
+    query = db.session.query(
+        equipment_standards.c.equipment_id, equipment_standards.c.standard_id
+    ).join(
+        Equipment, Equipment.id == equipment_standards.c.equipment_id
+    ).join(
+        Inventory, Inventory.id == Equipment.inventory_id
+    ).join(
+        Branch, Branch.id == Inventory.branch_id
+    ).filter(
+        Branch.company_id.in_(_active_companies(contract_id))
+    )
+
+    if branch_id:
+        query = query.filter(Branch.id == branch_id)
+
+    standards = {}
+    for equipment_id, standard_id in query.order_by(equipment_standards.c.equipment_id, equipment_standards.c.standard_id):
+        standards[equipment_id] = standards.get(equipment_id, ()) + (standard_id,)
+
+    return standards
+
+
+def find_pending_inspections(date_from, date_to, contract_id=None, branch_id=None):
+    """Busca em lote as inspeções pendentes já existentes no escopo do planejamento
+
+    Retorna um dicionário {(equipment_id, scheduled_date): inspection_id} obtido
+    com uma única consulta, no lugar de um SELECT por equipamento e data.
+    """
+    query = db.session.query(
+        Inspection.id,
+        Inspection.equipment_id,
+        Inspection.scheduled_date
+    ).join(
+        Equipment, Equipment.id == Inspection.equipment_id
+    ).join(
+        Inventory, Inventory.id == Equipment.inventory_id
+    ).join(
+        Branch, Branch.id == Inventory.branch_id
+    ).filter(
+        Inspection.status == Inspection.STATUS_PENDING,
+        Inspection.scheduled_date >= date_from,
+        Inspection.scheduled_date <= date_to,
+        Branch.company_id.in_(_active_companies(contract_id))
+    )
+
+    if branch_id:
+        query = query.filter(Branch.id == branch_id)
+
+    existing = {}
+    for row in query:
+        existing.setdefault((row.equipment_id, row.scheduled_date), row.id)
+
+    return existing
+
+
+class PlannedInspection:
+    """Inspeção candidata calculada pelo planejamento"""
+
+    __slots__ = ('row', 'scheduled_date', 'existing_id')
+
+    def __init__(self, row, scheduled_date, existing_id=None):
+        self.row = row
+        self.scheduled_date = scheduled_date
+        self.existing_id = existing_id
+
+    @property
+    def already_exists(self):
+        return self.existing_id is not None
+
+
+class InspectionPlan:
+    """Núcleo de planejamento compartilhado entre preview e geração
+
+    As consultas de apoio (inspeções existentes e nomes de empresas) são feitas
+    uma única vez por requisição; as candidatas são produzidas sob demanda, de
+    forma que o consumo de memória não cresce com o número de linhas.
+    """
+
+    def __init__(self, months_ahead, contract_id=None, branch_id=None):
+        self.months_ahead = months_ahead
+        self.contract_id = contract_id
+        self.branch_id = branch_id
+
+        today, end_date = planning_window(months_ahead)
+        self.date_from = datetime.combine(today, datetime.min.time())
+        self.date_to = datetime.combine(end_date, datetime.min.time())
+        self.holidays = load_holidays()
+        self.schedules = schedule_cache.get()
+
+        self.existing = find_pending_inspections(
+            self.date_from, self.date_to, contract_id=contract_id, branch_id=branch_id
+        )
+        self.company_names = load_company_names(contract_id)
+
+        # Normas dos equipamentos: apenas se houver periodicidade por norma, e antes do streaming
+        self.standards = load_scope_standards(contract_id, branch_id) if self.schedules.has_standard_rules else {}
+
+    def refresh_existing(self):
+        """Recarrega o mapa de inspeções pendentes (ex.: após inserir novas)"""
+        self.existing = find_pending_inspections(
+            self.date_from, self.date_to, contract_id=self.contract_id, branch_id=self.branch_id
+        )
+        return self.existing
+
+    def iter_candidates(self):
+        """Gera as inspeções candidatas, uma por contrato, equipamento e data
+
+        Como no planejamento original, um equipamento de empresa com vários
+        contratos ativos aparece uma vez por contrato, cada um com a sua
+        periodicidade; as linhas de um mesmo equipamento são adjacentes e vêm
+        em ordem de contrato.
+        """
+        query = _equipment_rows_query(self.contract_id, self.branch_id).yield_per(STREAM_BATCH_SIZE)
+
+        # As datas são calculadas por lote de linhas, agrupadas por regra de recorrência
+        # Nenhuma outra consulta enquanto o cursor estiver aberto (ver load_scope_standards)
+        for rows in chunked(query, STREAM_BATCH_SIZE):
+            batch_dates = calculate_batch_dates(
+                rows, self.months_ahead, self.schedules, self.standards, self.holidays, self.date_from.date()
+            )
+
+            for row, inspection_dates in zip(rows, batch_dates):
+                for inspection_date in inspection_dates:
+                    yield PlannedInspection(
+                        row,
+                        inspection_date,
+                        self.existing.get((row.equipment_id, inspection_date))
+                    )
+
+    def company_name(self, company_id):
+        return self.company_names.get(company_id, 'N/A')
+
+    def preview_dict(self, candidate):
+        """Serializa uma candidata no formato do preview"""
+        row = candidate.row
+        return {
+            'contract_number': row.contract_number,
+            'company_name': self.company_name(row.company_id),
+            'branch_name': row.branch_name,
+            'equipment_name': row.equipment_name,
+            'equipment_type': row.type,
+            'scheduled_date': candidate.scheduled_date.isoformat(),
+            'location': row.location or row.branch_address,
+            'already_exists': candidate.already_exists,
+            'existing_inspection_id': candidate.existing_id
+        }
+
+
+def build_inspection_row(row, inspection_date, created_by, timestamp):
+    """Monta o dicionário de colunas de uma nova inspeção gerada"""
+    return {
+        'title': f"Inspeção {row.equipment_name} - {row.branch_name}",
+        'description': f"Inspeção periódica do equipamento {row.equipment_name} conforme contrato {row.contract_number}",
+        'scheduled_date': inspection_date,
+        'status': Inspection.STATUS_PENDING,
+        'priority': 'media',
+        'location': row.location or row.branch_address,
+        'equipment': row.equipment_name,
+        'origin': Inspection.ORIGIN_AUTO,
+        'client_id': row.company_id,
+        'branch_id': row.branch_id,
+        'equipment_id': row.equipment_id,
+        'contract_id': row.contract_id,
+        'created_by': created_by,
+        'created_at': timestamp,
+        'updated_at': timestamp
+    }
+
+
+def _upsert_statement(table, batch, dialect):
+    """INSERT multi-linha que ignora as chaves (equipment_id, scheduled_date, origin) já existentes"""
+    if dialect == 'mysql':
+        # INSERT IGNORE não altera as linhas existentes; rowcount = linhas inseridas
+        return mysql.insert(table).values(batch).prefix_with('IGNORE')
+
+    if dialect == 'sqlite':
+        return sqlite.insert(table).values(batch).on_conflict_do_nothing(
+            index_elements=['equipment_id', 'scheduled_date', 'origin']
+        )
+
+    return table.insert().values(batch)
+
+
+def _inserted_keys_since(table, batch, first_id):
+    """IDs das linhas do lote gravadas a partir de first_id (bancos sem RETURNING)
+
+    first_id é o primeiro auto-incremento gerado pelo próprio INSERT
+    (LAST_INSERT_ID() da conexão); os IDs são crescentes, então linhas da mesma
+    chave gravadas antes por outra geração ficam de fora.
+    """
+    keys = [(item['equipment_id'], item['scheduled_date']) for item in batch]
+    query = db.select(table.c.id, table.c.equipment_id, table.c.scheduled_date).where(
+        table.c.origin == Inspection.ORIGIN_AUTO,
+        db.tuple_(table.c.equipment_id, table.c.scheduled_date).in_(keys),
+        table.c.id >= first_id
+    )
+    return {(row.equipment_id, row.scheduled_date): row.id for row in db.session.execute(query)}
+
+
+def insert_inspection_rows(rows, batch_size=INSERT_BATCH_SIZE, progress=None, collect_ids=False):
+    """Insere as inspeções em lotes com um único INSERT multi-linha por lote
+
+    Linhas cuja chave (equipment_id, scheduled_date, origin) já existe são
+    ignoradas pelo próprio banco (INSERT IGNORE no MySQL, ON CONFLICT DO NOTHING
+    no SQLite), sem alterar a linha existente, o que torna gerações concorrentes
+    seguras.
+    progress(percentual, mensagem) é chamado após cada lote.
+    Retorna (inseridas, ignoradas, ids); com collect_ids, ids é o mapa
+    {(equipment_id, scheduled_date): id} das linhas inseridas por esta chamada,
+    obtido do próprio INSERT (RETURNING) ou, sem RETURNING, a partir do
+    primeiro ID gerado por ele.
+    """
+    table = Inspection.__table__
+    dialect = db.session.get_bind().dialect
+    returning = collect_ids and dialect.insert_returning
+    inserted = 0
+    ids = {}
+
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        statement = _upsert_statement(table, batch, dialect.name)
+        if returning:
+            statement = statement.returning(table.c.id, table.c.equipment_id, table.c.scheduled_date)
+        result = db.session.execute(statement)
+
+        if returning:
+            # Apenas as linhas efetivamente inseridas voltam do banco
+            batch_ids = {(row.equipment_id, row.scheduled_date): row.id for row in result}
+            ids.update(batch_ids)
+            inserted += len(batch_ids)
+        else:
+            inserted += result.rowcount
+            if collect_ids and result.rowcount:
+                ids.update(_inserted_keys_since(table, batch, result.lastrowid))
+
+        if progress:
+            written = start + len(batch)
+            progress(100 * written // len(rows), f'{written}/{len(rows)} linhas gravadas')
+
+    return inserted, len(rows) - inserted, ids
+
+
+def generate_inspections(months_ahead, created_by, contract_id=None, branch_id=None,
+                         include_inspections=True, progress=None):
+    """Gera as inspeções do planejamento e retorna o resumo da geração
+
+    Compartilhado entre o endpoint síncrono e a tarefa em segundo plano.
+    """
+    started_at = time.perf_counter()
+
+    if not has_active_contracts(contract_id):
+        return {
+            'message': 'Nenhum contrato ativo encontrado',
+            'generated_count': 0,
+            'inspections': []
+        }
+
+    # Planejamento compartilhado com o preview (calculado uma vez por requisição)
+    plan = InspectionPlan(months_ahead, contract_id=contract_id, branch_id=branch_id)
+
+    # Sem microssegundos: o MySQL (DATETIME) trunca o valor gravado
+    timestamp = datetime.utcnow().replace(microsecond=0)
+    new_rows = []
+    planned_keys = set()
+    skipped_count = 0
+
+    for candidate in plan.iter_candidates():
+        key = (candidate.row.equipment_id, candidate.scheduled_date)
+        # Uma inspeção por equipamento e data: vale o primeiro contrato (menor id)
+        if candidate.already_exists or key in planned_keys:
+            skipped_count += 1
+            continue
+
+        planned_keys.add(key)
+        new_rows.append(build_inspection_row(candidate.row, candidate.scheduled_date, created_by, timestamp))
+
+    if progress:
+        progress(0, f'{len(new_rows)} inspeções planejadas')
+
+    # Upsert em lotes multi-linha (após consumir o cursor do planejamento); chaves já
+    # gravadas por uma geração concorrente são ignoradas pelo banco
+    inserted_count, conflict_count, created_ids = insert_inspection_rows(
+        new_rows, progress=progress, collect_ids=include_inspections
+    )
+    db.session.commit()
+    skipped_count += conflict_count
+
+    elapsed = time.perf_counter() - started_at
+    summary = {
+        'message': 'Inspeções geradas com sucesso',
+        'generated_count': inserted_count,
+        'skipped_count': skipped_count,
+        'elapsed_seconds': round(elapsed, 3),
+        'rows_per_second': round(inserted_count / elapsed, 1) if elapsed > 0 else None
+    }
+
+    if not include_inspections:
+        return summary
+
+    inspections_data = []
+    for item in new_rows:
+        inspection_id = created_ids.get((item['equipment_id'], item['scheduled_date']))
+        if inspection_id is None:
+            continue
+        inspections_data.append({
+            'id': inspection_id,
+            'title': item['title'],
+            'description': item['description'],
+            'scheduled_date': item['scheduled_date'].isoformat(),
+            'status': item['status'],
+            'priority': item['priority'],
+            'location': item['location'],
+            'equipment': item['equipment'],
+            'origin': item['origin'],
+            'client_id': item['client_id'],
+            'branch_id': item['branch_id'],
+            'equipment_id': item['equipment_id'],
+            'contract_id': item['contract_id'],
+            'team_id': None
+        })
+
+    summary['inspections'] = inspections_data
+    return summary
+
+
+def load_auto_inspection_stats():
+    """Calcula as estatísticas da geração automática com duas consultas agregadas
+
+    A primeira reúne os totais gerais em subconsultas escalares; a segunda agrupa
+    filiais e equipamentos por contrato ativo (LEFT JOIN + COUNT).
+    """
+    totals = db.session.query(
+        db.session.query(db.func.count(Contract.id)).filter(
+            Contract.status == Contract.STATUS_ACTIVE
+        ).scalar_subquery().label('active_contracts'),
+        db.session.query(db.func.count(db.distinct(Inventory.branch_id))).join(
+            Equipment, Equipment.inventory_id == Inventory.id
+        ).scalar_subquery().label('total_branches'),
+        db.session.query(db.func.count(Equipment.id)).scalar_subquery().label('total_equipments'),
+        db.session.query(db.func.count(Inspection.id)).filter(
+            Inspection.status == Inspection.STATUS_PENDING
+        ).scalar_subquery().label('pending_inspections')
+    ).one()
+
+    per_contract = db.session.query(
+        Contract.id,
+        Contract.contract_number,
+        Client.name.label('company_name'),
+        db.func.count(db.distinct(Branch.id)).label('branches_count'),
+        db.func.count(Equipment.id).label('equipments_count')
+    ).outerjoin(
+        Client, Client.id == Contract.company_id
+    ).outerjoin(
+        Branch, Branch.company_id == Contract.company_id
+    ).outerjoin(
+        Inventory, Inventory.branch_id == Branch.id
+    ).outerjoin(
+        Equipment, Equipment.inventory_id == Inventory.id
+    ).filter(
+        Contract.status == Contract.STATUS_ACTIVE
+    ).group_by(
+        Contract.id, Contract.contract_number, Client.name
+    ).having(
+        db.func.count(Equipment.id) > 0
+    ).order_by(Contract.id).all()
+
+    return {
+        'active_contracts': totals.active_contracts,
+        'total_branches': totals.total_branches,
+        'total_equipments': totals.total_equipments,
+        'pending_inspections': totals.pending_inspections,
+        'contracts_with_equipments': [
+            {
+                'contract_id': row.id,
+                'contract_number': row.contract_number,
+                'company_name': row.company_name or 'N/A',
+                'branches_count': row.branches_count,
+                'equipments_count': row.equipments_count
+            }
+            for row in per_contract
+        ]
+    }
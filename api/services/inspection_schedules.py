@@ -0,0 +1,130 @@
+import threading
+import time
+from flask import current_app
+from ..models import db, Equipment, InspectionSchedule
+from ..cache import invalidate_on_change
+from .recurrence import RecurrenceRule, UNIT_MONTHS
+
+# Periodicidade padrão por tipo de equipamento, usada quando a tabela não define o tipo
+DEFAULT_TYPE_RULES = {
+    Equipment.TYPE_EXTINGUISHER: RecurrenceRule(30),      # Mensal
+    Equipment.TYPE_HYDRANT: RecurrenceRule(90),           # Trimestral
+    Equipment.TYPE_SPRINKLER: RecurrenceRule(180),        # Semestral
+    Equipment.TYPE_ALARM: RecurrenceRule(30),             # Mensal
+    Equipment.TYPE_EMERGENCY_LIGHT: RecurrenceRule(90),   # Trimestral
+    Equipment.TYPE_FIRE_DOOR: RecurrenceRule(180),        # Semestral
+    Equipment.TYPE_HOSE: RecurrenceRule(90),              # Trimestral
+    Equipment.TYPE_PUMP: RecurrenceRule(90),              # Trimestral
+}
+
+DEFAULT_RULE = RecurrenceRule(90)  # Padrão: trimestral
+
+
+def _approximate_days(rule):
+    """Duração aproximada do intervalo, para escolher a norma mais restritiva"""
+    return rule.interval * (30 if rule.unit == UNIT_MONTHS else 1)
+
+
+class ScheduleTable:
+    """Periodicidades carregadas da tabela inspection_schedules, indexadas por escopo
+
+    Ordem de resolução (o escopo mais específico prevalece):
+      1. contrato + tipo
+      2. contrato
+      3. normas do equipamento (norma + tipo, depois norma); com várias normas
+         vale a de menor intervalo
+      4. tipo
+      5. padrão do tipo (DEFAULT_TYPE_RULES) ou DEFAULT_RULE
+    """
+
+    def __init__(self, schedules=(), version=None):
+        self.version = version
+        self.rules = {schedule.scope: schedule.to_rule() for schedule in schedules}
+        self.has_standard_rules = any(standard_id for _, standard_id, _ in self.rules)
+        self._resolved = {}
+
+    def _standard_rule(self, equipment_type, standard_ids):
+        candidates = []
+        for standard_id in standard_ids:
+            rule = self.rules.get((None, standard_id, equipment_type)) or self.rules.get((None, standard_id, None))
+            if rule:
+                candidates.append(rule)
+        return min(candidates, key=_approximate_days) if candidates else None
+
+    def resolve(self, equipment_type, contract_id=None, standard_ids=(), holidays=frozenset()):
+        """Regra efetiva de um equipamento (memorizada por combinação de escopo e feriados)"""
+        key = (equipment_type, contract_id, standard_ids, holidays)
+        rule = self._resolved.get(key)
+        if rule is None:
+            rule = (
+                self.rules.get((contract_id, None, equipment_type))
+                or self.rules.get((contract_id, None, None))
+                or self._standard_rule(equipment_type, standard_ids)
+                or self.rules.get((None, None, equipment_type))
+                or DEFAULT_TYPE_RULES.get(equipment_type, DEFAULT_RULE)
+            )
+            if holidays:
+                rule = rule.with_holidays(holidays)
+            self._resolved[key] = rule
+        return rule
+
+
+def _ttl():
+    try:
+        return current_app.config.get('SCHEDULE_CACHE_TTL', 0)
+    except RuntimeError:
+        return 0
+
+
+class ScheduleCache:
+    """Cache em processo da tabela de periodicidades, invalidado por versão
+
+    Alterações feitas neste processo invalidam o cache imediatamente
+    (after_flush/after_commit). Alterações de outros processos são percebidas
+    pela versão (quantidade de linhas, maior id e maior updated_at), conferida
+    com uma consulta agregada no máximo a cada SCHEDULE_CACHE_TTL segundos; a
+    tabela só é recarregada quando a versão muda.
+    """
+
+    def __init__(self):
+        self._table = None
+        self._engine = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def current_version():
+        row = db.session.query(
+            db.func.count(InspectionSchedule.id),
+            db.func.max(InspectionSchedule.id),
+            db.func.max(InspectionSchedule.updated_at)
+        ).one()
+        return tuple(row)
+
+    def get(self):
+        """Retorna a ScheduleTable atual, recarregando se a versão mudou
+
+        Dentro do TTL a tabela em memória é usada sem nenhuma consulta, desde que
+        lida do mesmo banco (várias aplicações no processo, ex.: testes).
+        """
+        engine = db.engine
+        table = self._table
+        if table is not None and self._engine is engine and time.monotonic() - self._checked_at < _ttl():
+            return table
+
+        version = self.current_version()
+        with self._lock:
+            if self._table is None or self._engine is not engine or self._table.version != version:
+                self._table = ScheduleTable(InspectionSchedule.query.all(), version=version)
+                self._engine = engine
+            self._checked_at = time.monotonic()
+            return self._table
+
+    def invalidate(self):
+        with self._lock:
+            self._table = None
+
+
+schedule_cache = ScheduleCache()
+invalidate_on_change(schedule_cache, InspectionSchedule)
+
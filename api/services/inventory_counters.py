@@ -0,0 +1,67 @@
+from sqlalchemy import bindparam
+from ..models import db, Equipment, Inventory
+from ..jobs import job_handler
+
+COUNTER_COLUMNS = ['total_equipments'] + list(Inventory.TYPE_COUNTERS.values())
+
+
+def _expected_counts(inventory_ids=None):
+    """Contadores esperados por inventário, com uma consulta GROUP BY inventory_id, type"""
+    query = db.session.query(
+        Equipment.inventory_id, Equipment.type, db.func.count(Equipment.id)
+    ).filter(
+        Equipment.inventory_id.isnot(None)
+    ).group_by(Equipment.inventory_id, Equipment.type)
+
+    if inventory_ids is not None:
+        query = query.filter(Equipment.inventory_id.in_(inventory_ids))
+
+    expected = {}
+    for inventory_id, equipment_type, count in query:
+        counters = expected.setdefault(inventory_id, dict.fromkeys(COUNTER_COLUMNS, 0))
+        counters['total_equipments'] += count
+        column = Inventory.TYPE_COUNTERS.get(equipment_type)
+        if column:
+            counters[column] += count
+
+    return expected
+
+
+def reconcile_inventory_counts(inventory_ids=None):
+    """Recalcula os contadores de equipamentos dos inventários (todos, por padrão)
+
+    Lê os contadores atuais e os esperados com duas consultas e grava, em um
+    único UPDATE em lote (executemany), apenas os inventários divergentes.
+    Não confirma a transação: o commit fica com o chamador.
+    Retorna a quantidade de inventários corrigidos.
+    """
+    expected = _expected_counts(inventory_ids)
+    zero = dict.fromkeys(COUNTER_COLUMNS, 0)
+
+    current = db.session.query(Inventory.id, *[getattr(Inventory, column) for column in COUNTER_COLUMNS])
+    if inventory_ids is not None:
+        current = current.filter(Inventory.id.in_(inventory_ids))
+
+    changes = []
+    for row in current:
+        counters = expected.get(row.id, zero)
+        if any(getattr(row, column) != counters[column] for column in COUNTER_COLUMNS):
+            changes.append({'inventory_id': row.id, **counters})
+
+    if changes:
+        table = Inventory.__table__
+        db.session.execute(
+            table.update().where(table.c.id == bindparam('inventory_id')).values(
+                **{column: bindparam(column) for column in COUNTER_COLUMNS}
+            ),
+            changes
+        )
+
+    return len(changes)
+
+
+@job_handler('inventories.recount')
+def recount_job(context):
+    """Reconciliação dos contadores executada como tarefa"""
+    inventory_ids = context.payload.get('inventory_ids')
+    return {'updated': reconcile_inventory_counts(inventory_ids)}
@@ -0,0 +1,129 @@
+import re
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from ..models import db, User, Inspection, Maintenance, Equipment
+
+# Tabelas pequenas (cadastros) em que a varredura completa é aceitável. inspection_schedules
+# (periodicidades por tipo/norma/contrato) é lida inteira por ScheduleCache, assim como a
+# consulta agregada da sua versão
+SMALL_TABLES = frozenset({
+    'users', 'teams', 'team_members', 'branches', 'standards', 'contracts', 'inventories',
+    'inspection_schedules',
+})
+
+# Aliases gerados pelo SQLAlchemy (ex.: inventories_1) apontam para a tabela original
+_ALIAS_SUFFIX = re.compile(r'_\d+$')
+
+
+class PlanTarget:
+    """Requisição cujo SQL gerado é analisado com EXPLAIN"""
+
+    def __init__(self, name, method, url, json_body=None):
+        self.name = name
+        self.method = method
+        self.url = url
+        self.json_body = json_body
+
+
+class FullScan:
+    """Consulta que percorre uma tabela inteira sem usar índice"""
+
+    def __init__(self, target, table, statement, detail):
+        self.target = target
+        self.table = table
+        self.statement = statement
+        self.detail = detail
+
+
+def _first_value(column):
+    return db.session.query(column).filter(column.isnot(None)).order_by(column).limit(1).scalar()
+
+
+def build_targets():
+    """Requisições dos endpoints de listagem, com filtros preenchidos a partir dos dados existentes"""
+    technician_id = _first_value(Inspection.technician_id) or 1
+    client_id = _first_value(Inspection.client_id) or 1
+    team_id = _first_value(Inspection.team_id) or 1
+    inventory_id = _first_value(Equipment.inventory_id) or 1
+    maintenance_type = _first_value(Maintenance.maintenance_type) or 'preventiva'
+
+    return [
+        PlanTarget('inspections_page', 'GET', '/api/inspections?limit=50'),
+        PlanTarget('inspections_technician', 'GET', f'/api/inspections?technician_id={technician_id}&limit=50'),
+        PlanTarget('inspections_client', 'GET', f'/api/inspections?client_id={client_id}&limit=50&include_total=true'),
+        PlanTarget('inspections_team', 'GET', f'/api/inspections?team_id={team_id}&limit=50'),
+        PlanTarget('inspections_status', 'GET', '/api/inspections?status=pendente&limit=50'),
+        PlanTarget('inspections_date_range', 'GET',
+                   '/api/inspections?date_from=2024-01-01&date_to=2024-03-31&limit=50'),
+        PlanTarget('maintenances_page', 'GET', '/api/maintenances?limit=50'),
+        PlanTarget('maintenances_technician', 'GET', f'/api/maintenances?technician_id={technician_id}&limit=50'),
+        PlanTarget('maintenances_client', 'GET', f'/api/maintenances?client_id={client_id}&limit=50'),
+        PlanTarget('maintenances_status', 'GET', '/api/maintenances?status=pendente&limit=50'),
+        PlanTarget('maintenances_type', 'GET', f'/api/maintenances?type={maintenance_type}&limit=50'),
+        PlanTarget('equipments_inventory', 'GET', f'/api/equipments?inventory_id={inventory_id}'),
+        PlanTarget('auto_inspections_preview', 'POST', '/api/auto-inspections/preview',
+                   json_body={'months_ahead': 3, 'contract_id': 1}),
+    ]
+
+
+def capture_statements(app, target, headers):
+    """Executa a requisição e retorna os SELECTs emitidos, com seus parâmetros"""
+    statements = []
+
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', collect)
+    try:
+        response = app.test_client().open(target.url, method=target.method, json=target.json_body, headers=headers)
+        response.get_data()
+    finally:
+        event.remove(engine, 'before_cursor_execute', collect)
+
+    if response.status_code >= 400:
+        raise RuntimeError(f'{target.name}: HTTP {response.status_code} - {response.get_data(as_text=True)[:300]}')
+
+    return statements
+
+
+def _sqlite_scans(connection, statement, parameters):
+    # Linhas: (id, parent, notused, detail); "SCAN t" sem "USING ... INDEX" é varredura completa
+    for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters):
+        detail = row[3]
+        words = detail.split()
+        if len(words) >= 2 and words[0] == 'SCAN' and 'INDEX' not in words and words[1] != 'CONSTANT':
+            yield words[1], detail
+
+
+def _mysql_scans(connection, statement, parameters):
+    for row in connection.exec_driver_sql(f'EXPLAIN {statement}', parameters).mappings():
+        if row.get('type') == 'ALL' and row.get('table'):
+            yield row['table'], f"type=ALL rows={row.get('rows')}"
+
+
+def find_full_scans(app, targets=None, allowed_tables=SMALL_TABLES):
+    """Executa EXPLAIN em cada SELECT dos endpoints e retorna (planos analisados, varreduras completas)"""
+    explain = {'sqlite': _sqlite_scans, 'mysql': _mysql_scans}.get(db.engine.dialect.name)
+    if explain is None:
+        raise RuntimeError(f'EXPLAIN não suportado para o banco {db.engine.dialect.name}')
+
+    admin = User.query.filter(User.role.in_(('superadmin', 'admin'))).order_by(User.id).first()
+    if admin is None:
+        raise RuntimeError('Nenhum usuário admin/superadmin para autenticar as requisições')
+    headers = {'Authorization': f'Bearer {create_access_token(identity=str(admin.id))}'}
+
+    analyzed = 0
+    scans = []
+    for target in targets or build_targets():
+        statements = capture_statements(app, target, headers)
+        with db.engine.connect() as connection:
+            for statement, parameters in statements:
+                analyzed += 1
+                for table, detail in explain(connection, statement, parameters):
+                    if _ALIAS_SUFFIX.sub('', table) in allowed_tables:
+                        continue
+                    scans.append(FullScan(target.name, table, statement, detail))
+
+    return analyzed, scans
@@ -0,0 +1,180 @@
+import calendar
+from datetime import timedelta
+from importlib.util import find_spec
+
+# NumPy é opcional: acelera lotes grandes; fora do requirements.txt (limite de tamanho do Vercel).
+# Importado só no primeiro lote vetorizado, fora do cold start
+HAS_NUMPY = find_spec('numpy') is not None
+
+UNIT_DAYS = 'days'
+UNIT_MONTHS = 'months'
+UNITS = (UNIT_DAYS, UNIT_MONTHS)
+
+# Lote mínimo para usar o caminho vetorizado (NumPy); abaixo disso o custo de conversão domina
+NUMPY_MIN_BATCH = 64
+
+
+def add_months(value, months):
+    """Soma meses mantendo o dia, limitado ao último dia do mês (31/01 + 1 mês = 28/02 ou 29/02)"""
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    return value.replace(year=year, month=month, day=min(value.day, calendar.monthrange(year, month)[1]))
+
+
+class RecurrenceRule:
+    """Regra de recorrência: a cada N dias ou N meses (mesmo dia do mês)
+
+    Com skip_weekends/holidays, cada ocorrência que cair em fim de semana ou
+    feriado é adiada para o próximo dia útil; a série continua ancorada nas
+    datas nominais (o adiamento não se acumula).
+    """
+
+    __slots__ = ('interval', 'unit', 'skip_weekends', 'holidays')
+
+    def __init__(self, interval, unit=UNIT_DAYS, skip_weekends=False, holidays=()):
+        if unit not in UNITS:
+            raise ValueError(f'Unidade de recorrência inválida: {unit}. Opções: {", ".join(UNITS)}')
+        if int(interval) < 1:
+            raise ValueError('O intervalo da recorrência deve ser maior que zero')
+
+        self.interval = int(interval)
+        self.unit = unit
+        self.skip_weekends = bool(skip_weekends)
+        self.holidays = frozenset(holidays)
+
+    def __repr__(self):
+        flags = ' dias úteis' if self.skip_weekends else ''
+        return f'<RecurrenceRule {self.interval} {self.unit}{flags}>'
+
+    def _key(self):
+        return (self.interval, self.unit, self.skip_weekends, self.holidays)
+
+    def __eq__(self, other):
+        return isinstance(other, RecurrenceRule) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    @property
+    def adjusts_dates(self):
+        return self.skip_weekends or bool(self.holidays)
+
+    def with_holidays(self, holidays):
+        """Cópia da regra com o calendário de feriados informado"""
+        return RecurrenceRule(self.interval, self.unit, self.skip_weekends, holidays)
+
+    def nominal(self, base, step):
+        """Data nominal da ocorrência de índice step (0 = base)"""
+        if self.unit == UNIT_DAYS:
+            return base + timedelta(days=step * self.interval)
+        return add_months(base, step * self.interval)
+
+    def first_step(self, base, start):
+        """Índice da primeira ocorrência nominal >= start, calculado sem percorrer a série"""
+        if base >= start:
+            return 0
+
+        if self.unit == UNIT_DAYS:
+            return -(-(start - base).days // self.interval)
+
+        # Meses inteiros até start; o ajuste de fim de mês exige no máximo mais um passo
+        months = (start.year - base.year) * 12 + start.month - base.month
+        step = max(0, months // self.interval)
+        while self.nominal(base, step) < start:
+            step += 1
+        return step
+
+    def adjust(self, value):
+        """Adia a data para o próximo dia útil, conforme a regra"""
+        while (self.skip_weekends and value.weekday() >= 5) or value in self.holidays:
+            value += timedelta(days=1)
+        return value
+
+    def occurrences(self, base, start, end):
+        """Ocorrências entre start e end (inclusive), a partir da data base"""
+        dates = []
+        step = self.first_step(base, start)
+        nominal = self.nominal(base, step)
+
+        while nominal <= end:
+            value = self.adjust(nominal)
+            if value <= end and (not dates or value != dates[-1]):
+                dates.append(value)
+            step += 1
+            nominal = self.nominal(base, step)
+
+        return dates
+
+
+def _numpy_day_occurrences(rule, bases, start, end):
+    """Ocorrências de uma regra em dias para um lote inteiro de datas base (NumPy datetime64)"""
+    import numpy as np
+
+    base = np.array(bases, dtype='datetime64[D]')
+    window_start = np.datetime64(start, 'D')
+    window_end = np.datetime64(end, 'D')
+    interval = rule.interval
+
+    # Salto aritmético até a primeira ocorrência >= start
+    delta = (window_start - base).astype(np.int64)
+    steps = np.where(delta > 0, -(-delta // interval), 0)
+    first = base + (steps * interval).astype('timedelta64[D]')
+
+    counts = np.where(first <= window_end, (window_end - first).astype(np.int64) // interval + 1, 0)
+    width = int(counts.max()) if len(counts) else 0
+    if width == 0:
+        return [[] for _ in bases]
+
+    offsets = (np.arange(width, dtype=np.int64) * interval).astype('timedelta64[D]')
+    matrix = first[:, None] + offsets[None, :]
+
+    if rule.adjusts_dates:
+        matrix = np.busday_offset(
+            matrix, 0, roll='forward',
+            weekmask='1111100' if rule.skip_weekends else '1111111',
+            holidays=np.array(sorted(rule.holidays), dtype='datetime64[D]')
+        )
+
+    rows = matrix.tolist()
+    if not rule.adjusts_dates:
+        return [row[:count] for row, count in zip(rows, counts.tolist())]
+
+    # Datas adiadas podem coincidir (ex.: sábado e domingo -> segunda) ou passar de end
+    results = []
+    for row, count in zip(rows, counts.tolist()):
+        dates = []
+        for value in row[:count]:
+            if value <= end and (not dates or value != dates[-1]):
+                dates.append(value)
+        results.append(dates)
+    return results
+
+
+def batch_occurrences(rule, bases, start, end):
+    """Ocorrências de uma mesma regra para várias datas base; retorna listas alinhadas a bases
+
+    Regras em dias usam NumPy (quando instalado) para lotes a partir de
+    NUMPY_MIN_BATCH; caso contrário cada base é resolvida com o salto aritmético.
+    """
+    if HAS_NUMPY and rule.unit == UNIT_DAYS and len(bases) >= NUMPY_MIN_BATCH:
+        return _numpy_day_occurrences(rule, bases, start, end)
+    return [rule.occurrences(base, start, end) for base in bases]
+
+
+def schedule_batch(items, start, end):
+    """Calcula as ocorrências de [(regra, data_base)] agrupando por regra
+
+    Retorna as listas de datas na mesma ordem dos itens.
+    """
+    groups = {}
+    for index, (rule, base) in enumerate(items):
+        groups.setdefault(rule, []).append(index)
+
+    results = [None] * len(items)
+    for rule, indexes in groups.items():
+        dates = batch_occurrences(rule, [items[index][1] for index in indexes], start, end)
+        for index, occurrence_dates in zip(indexes, dates):
+            results[index] = occurrence_dates
+
+    return results
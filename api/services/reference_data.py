@@ -0,0 +1,70 @@
+from flask import current_app
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import make_transient_to_detached
+from ..cache import TTLCache, invalidate_on_change
+from ..models import db, Standard, Team
+
+# Dados de referência (normas e equipes): poucas linhas, lidas a cada carregamento de
+# página e raramente alteradas. Cada gravação desses modelos invalida o cache (versão);
+# o TTL (REFERENCE_CACHE_TTL) limita a defasagem entre processos.
+reference_cache = TTLCache(maxsize=8, name='reference_data')
+invalidate_on_change(reference_cache, Standard, Team)
+
+
+def _ttl():
+    return current_app.config.get('REFERENCE_CACHE_TTL', 0)
+
+
+def _load_standards():
+    """Normas por id como instâncias desanexadas, sem passar pelo identity map da sessão"""
+    keys = [attr.key for attr in sa_inspect(Standard).column_attrs]
+    rows = db.session.query(*[getattr(Standard, key) for key in keys]).order_by(Standard.id)
+
+    standards = {}
+    for row in rows:
+        standard = Standard(**dict(zip(keys, row)))
+        make_transient_to_detached(standard)
+        standards[standard.id] = standard
+    return standards
+
+
+def standards_by_id():
+    """{id: Standard} de todas as normas (instâncias compartilhadas: somente leitura)"""
+    return reference_cache.get_or_set('standards', _load_standards, ttl=_ttl())
+
+
+def list_standards():
+    """Todas as normas serializadas (to_dict), ordenadas por id"""
+    return reference_cache.get_or_set(
+        'standards:list',
+        lambda: [standard.to_dict() for standard in standards_by_id().values()],
+        ttl=_ttl()
+    )
+
+
+def attach_standards(standard_ids):
+    """Normas dos ids informados, anexadas à sessão atual sem consulta ao banco
+
+    Ids desconhecidos ou inválidos são ignorados. Usa merge(load=False): a sessão
+    recebe uma cópia da instância em cache, que pode ser associada a equipamentos.
+    """
+    standards = standards_by_id()
+
+    attached = {}
+    for standard_id in standard_ids:
+        try:
+            standard = standards.get(int(standard_id))
+        except (TypeError, ValueError):
+            continue
+        if standard is not None and standard.id not in attached:
+            attached[standard.id] = db.session.merge(standard, load=False)
+    return list(attached.values())
+
+
+def list_teams():
+    """Todas as equipes serializadas (to_dict com relacionamentos), ordenadas por id"""
+    return reference_cache.get_or_set(
+        'teams',
+        lambda: [team.to_dict(include_relations=True) for team in Team.query.order_by(Team.id)],
+        ttl=_ttl()
+    )
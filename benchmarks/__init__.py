@@ -0,0 +1 @@
+# Benchmarks de desempenho da API (ver benchmarks/run.py)
@@ -0,0 +1,237 @@
+"""
+Gerador de dados sintéticos para os benchmarks
+
+Produz linhas determinísticas (mesma semente → mesmos dados) para todas as
+tabelas usadas pelos endpoints medidos. Os IDs são atribuídos pelo gerador,
+de forma que as chaves estrangeiras são conhecidas sem consultar o banco.
+"""
+
+import json
+import random
+from datetime import date, datetime, timedelta
+
+from api.models import (
+    db, User, Team, Client, Branch, Contract, Inventory, Standard,
+    Equipment, Inspection, Maintenance
+)
+from api.models.client import normalize_search_text, only_digits
+from api.models.equipment import equipment_standards
+from api.services.bulk_loader import BulkLoader
+from api.services.inventory_counters import reconcile_inventory_counts
+
+# Perfis de volume (production reproduz a escala esperada de um tenant grande)
+SCALES = {
+    'small': {
+        'clients': 20, 'branches_per_client': 3, 'technicians': 10, 'teams': 3,
+        'equipments': 2000, 'inspections': 10000, 'maintenances': 2000,
+    },
+    'medium': {
+        'clients': 100, 'branches_per_client': 5, 'technicians': 40, 'teams': 8,
+        'equipments': 10000, 'inspections': 100000, 'maintenances': 10000,
+    },
+    'production': {
+        'clients': 500, 'branches_per_client': 4, 'technicians': 150, 'teams': 20,
+        'equipments': 50000, 'inspections': 500000, 'maintenances': 50000,
+    },
+}
+
+# Senha do usuário administrador criado para os benchmarks
+BENCHMARK_EMAIL = 'benchmark@fireng.local'
+BENCHMARK_PASSWORD = 'benchmark123'
+
+# Linhas por lote de INSERT
+CHUNK_SIZE = 5000
+
+PRIORITIES = ['baixa', 'media', 'alta', 'urgente']
+CITIES = [('São Paulo', 'SP'), ('Campinas', 'SP'), ('Curitiba', 'PR'), ('Belo Horizonte', 'MG'), ('Recife', 'PE')]
+STANDARD_CODES = [
+    ('NBR 12693', 'Sistemas de proteção por extintores de incêndio', Standard.TYPE_NBR),
+    ('NBR 13714', 'Sistemas de hidrantes e de mangotinhos', Standard.TYPE_NBR),
+    ('NBR 10897', 'Sistemas de proteção contra incêndio por chuveiros automáticos', Standard.TYPE_NBR),
+    ('NBR 17240', 'Sistemas de detecção e alarme de incêndio', Standard.TYPE_NBR),
+    ('NBR 10898', 'Sistema de iluminação de emergência', Standard.TYPE_NBR),
+    ('IT 17', 'Brigada de incêndio', Standard.TYPE_IT),
+]
+
+
+class SyntheticDataset:
+    """Linhas sintéticas por tabela, geradas sob demanda na ordem das chaves estrangeiras"""
+
+    def __init__(self, scale='small', seed=42, today=None):
+        if scale not in SCALES:
+            raise ValueError(f'Escala desconhecida: {scale}. Opções: {", ".join(SCALES)}')
+
+        self.scale = scale
+        self.sizes = SCALES[scale]
+        self.seed = seed
+        self.today = today or date.today()
+        self.now = datetime.combine(self.today, datetime.min.time())
+
+        self.branches_count = self.sizes['clients'] * self.sizes['branches_per_client']
+        # Usuário 1 é o administrador; técnicos a partir do 2
+        self.technician_ids = list(range(2, 2 + self.sizes['technicians']))
+
+    def _random(self, table):
+        # Um gerador por tabela: o conteúdo de uma tabela não depende das demais
+        return random.Random(f'{self.seed}:{table}')
+
+    def branch_client(self, branch_id):
+        return (branch_id - 1) // self.sizes['branches_per_client'] + 1
+
+    def equipment_branch(self, equipment_id):
+        return (equipment_id - 1) % self.branches_count + 1
+
+    def users(self, password_hash):
+        yield {
+            'id': 1, 'email': BENCHMARK_EMAIL, 'password_hash': password_hash,
+            'name': 'Benchmark Admin', 'role': 'superadmin', 'is_active': True,
+            'created_at': self.now, 'updated_at': self.now
+        }
+        for user_id in self.technician_ids:
+            yield {
+                'id': user_id, 'email': f'tecnico{user_id}@fireng.local', 'password_hash': password_hash,
+                'name': f'Técnico {user_id}', 'role': 'tecnico', 'is_active': True,
+                'created_at': self.now, 'updated_at': self.now
+            }
+
+    def teams(self):
+        for team_id in range(1, self.sizes['teams'] + 1):
+            yield {
+                'id': team_id, 'name': f'Equipe {team_id}', 'is_active': True,
+                'coordinator_id': 1, 'created_at': self.now, 'updated_at': self.now
+            }
+
+    def clients(self):
+        for client_id in range(1, self.sizes['clients'] + 1):
+            name = f'Cliente Sintético {client_id:05d} Ltda'
+            email = f'contato{client_id}@cliente.local'
+            cnpj = f'{client_id:08d}/0001-{client_id % 100:02d}'
+            digits = only_digits(cnpj)
+            city, state = CITIES[client_id % len(CITIES)]
+            yield {
+                'id': client_id, 'name': name, 'email': email, 'cpf_cnpj': cnpj,
+                'city': city, 'state': state, 'is_active': True,
+                'search_text': ' '.join([normalize_search_text(name), email, digits]),
+                'cpf_cnpj_digits': digits,
+                'created_at': self.now, 'updated_at': self.now
+            }
+
+    def branches(self):
+        for branch_id in range(1, self.branches_count + 1):
+            client_id = self.branch_client(branch_id)
+            city, state = CITIES[branch_id % len(CITIES)]
+            yield {
+                'id': branch_id, 'name': f'Filial {branch_id:05d}', 'company_id': client_id,
+                'address': f'Rua Sintética, {branch_id}', 'city': city, 'state': state,
+                'is_active': True, 'created_at': self.now, 'updated_at': self.now
+            }
+
+    def contracts(self):
+        rng = self._random('contracts')
+        for client_id in range(1, self.sizes['clients'] + 1):
+            yield {
+                'id': client_id, 'contract_number': f'CT-{client_id:06d}',
+                'start_date': self.today - timedelta(days=365), 'end_date': self.today + timedelta(days=365),
+                'value': rng.randint(10000, 500000),
+                'status': Contract.STATUS_ACTIVE if client_id % 10 else Contract.STATUS_SUSPENDED,
+                'company_id': client_id, 'team_id': client_id % self.sizes['teams'] + 1,
+                'created_at': self.now, 'updated_at': self.now
+            }
+
+    def inventories(self):
+        for branch_id in range(1, self.branches_count + 1):
+            yield {
+                'id': branch_id, 'branch_id': branch_id, 'status': Inventory.STATUS_UPDATED,
+                'created_at': self.now, 'updated_at': self.now
+            }
+
+    def standards(self):
+        for standard_id, (code, name, standard_type) in enumerate(STANDARD_CODES, start=1):
+            yield {
+                'id': standard_id, 'code': code, 'name': name, 'type': standard_type,
+                'created_at': self.now, 'updated_at': self.now
+            }
+
+    def equipments(self):
+        rng = self._random('equipments')
+        for equipment_id in range(1, self.sizes['equipments'] + 1):
+            equipment_type = Equipment.TYPES[rng.randrange(len(Equipment.TYPES))]
+            installed = self.today - timedelta(days=rng.randint(30, 3650))
+            last_inspection = installed + timedelta(days=rng.randint(0, max(0, (self.today - installed).days)))
+            yield {
+                'id': equipment_id, 'name': f'{equipment_type.title()} {equipment_id:06d}',
+                'type': equipment_type, 'serial_number': f'SN-{equipment_id:08d}',
+                'tag_number': f'TAG-{equipment_id:06d}', 'installation_date': installed,
+                'last_inspection_date': last_inspection if rng.random() < 0.8 else None,
+                'status': Equipment.STATUS_ACTIVE, 'location': f'Pavimento {rng.randint(1, 20)}',
+                'inventory_id': self.equipment_branch(equipment_id),
+                'created_at': self.now, 'updated_at': self.now
+            }
+
+    def equipment_standards(self):
+        rng = self._random('equipment_standards')
+        for equipment_id in range(1, self.sizes['equipments'] + 1):
+            for standard_id in rng.sample(range(1, len(STANDARD_CODES) + 1), rng.randint(1, 2)):
+                yield {'equipment_id': equipment_id, 'standard_id': standard_id, 'created_at': self.now}
+
+    def _service_row(self, rng, row_id, kind):
+        equipment_id = rng.randint(1, self.sizes['equipments'])
+        branch_id = self.equipment_branch(equipment_id)
+        client_id = self.branch_client(branch_id)
+        scheduled = self.now + timedelta(days=rng.randint(-365, 180), hours=rng.randint(7, 18))
+        status = (
+            Inspection.STATUS_COMPLETED if scheduled < self.now and rng.random() < 0.85
+            else Inspection.STATUS_PENDING
+        )
+        return {
+            'id': row_id, 'title': f'{kind} {row_id:07d}', 'scheduled_date': scheduled,
+            'completed_date': scheduled + timedelta(hours=2) if status == Inspection.STATUS_COMPLETED else None,
+            'status': status, 'priority': PRIORITIES[rng.randrange(len(PRIORITIES))],
+            'location': f'Filial {branch_id:05d}', 'equipment': f'Equipamento {equipment_id:06d}',
+            'client_id': client_id, 'branch_id': branch_id, 'equipment_id': equipment_id,
+            'contract_id': client_id, 'team_id': client_id % self.sizes['teams'] + 1,
+            'technician_id': self.technician_ids[rng.randrange(len(self.technician_ids))],
+            'created_by': 1, 'created_at': scheduled - timedelta(days=15), 'updated_at': scheduled
+        }
+
+    def inspections(self):
+        rng = self._random('inspections')
+        for inspection_id in range(1, self.sizes['inspections'] + 1):
+            row = self._service_row(rng, inspection_id, 'Inspeção')
+            # Todas as linhas de um lote precisam das mesmas colunas (executemany)
+            row['photos'] = json.dumps([]) if row['status'] == Inspection.STATUS_COMPLETED else None
+            yield row
+
+    def maintenances(self):
+        rng = self._random('maintenances')
+        for maintenance_id in range(1, self.sizes['maintenances'] + 1):
+            row = self._service_row(rng, maintenance_id, 'Manutenção')
+            row['maintenance_type'] = Maintenance.TYPES[rng.randrange(len(Maintenance.TYPES))]
+            yield row
+
+    def tables(self, password_hash):
+        """(tabela, linhas) na ordem das chaves estrangeiras"""
+        return [
+            (User.__table__, self.users(password_hash)),
+            (Team.__table__, self.teams()),
+            (Client.__table__, self.clients()),
+            (Branch.__table__, self.branches()),
+            (Contract.__table__, self.contracts()),
+            (Inventory.__table__, self.inventories()),
+            (Standard.__table__, self.standards()),
+            (Equipment.__table__, self.equipments()),
+            (equipment_standards, self.equipment_standards()),
+            (Inspection.__table__, self.inspections()),
+            (Maintenance.__table__, self.maintenances()),
+        ]
+
+
+def load_dataset(dataset, password_hash, chunk_size=CHUNK_SIZE, workers=4, staging='none', report=print):
+    """Grava o conjunto de dados com o BulkLoader (lotes Core, ordem de FK, paralelismo por nível)"""
+    loader = BulkLoader(db.engine, chunk_size=chunk_size, workers=workers, staging=staging, report=report)
+    loader.load(dataset.tables(password_hash))
+
+    # A carga via Core não passa pelos eventos que mantêm os contadores dos inventários
+    reconcile_inventory_counts()
+    db.session.commit()
+    return loader
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos endpoints mais usados sobre um conjunto de dados sintético
+
+Uso:
+    python -m benchmarks.run --scale small
+    python -m benchmarks.run --scale production --reuse
+    python -m benchmarks.run --scale small --update-baseline
+
+Para cada cenário mede latência (p50/p95), consultas SQL por requisição e pico
+de memória alocada, e compara com o arquivo de baseline (JSON). Sai com código
+1 quando algum cenário regride além da tolerância.
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Tolerância padrão de latência/memória em relação ao baseline (0.5 = +50%)
+DEFAULT_TOLERANCE = 0.5
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark dos endpoints da API Fireng')
+    parser.add_argument('--scale', default='small', help='Perfil de volume: small, medium ou production')
+    parser.add_argument('--seed', type=int, default=42, help='Semente do gerador de dados')
+    parser.add_argument('--database-url', help='Banco usado (padrão: SQLite em arquivo temporário por escala)')
+    parser.add_argument('--reuse', action='store_true', help='Reaproveita o banco já gerado para a escala')
+    parser.add_argument('--iterations', type=int, default=20, help='Requisições medidas por cenário')
+    parser.add_argument('--only', help='Executa apenas os cenários informados (separados por vírgula)')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Arquivo JSON de baseline')
+    parser.add_argument('--update-baseline', action='store_true', help='Grava os resultados como novo baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Aumento tolerado de p95/memória em relação ao baseline')
+    parser.add_argument('--output', help='Grava os resultados desta execução em JSON')
+    return parser.parse_args(argv)
+
+
+def percentile(values, fraction):
+    """Percentil pelo método nearest-rank"""
+    ordered = sorted(values)
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+
+class Scenario:
+    """Requisição medida pelo benchmark"""
+
+    def __init__(self, name, method, url, json_body=None, authenticated=True, iterations=None):
+        self.name = name
+        self.method = method
+        self.url = url
+        self.json_body = json_body
+        self.authenticated = authenticated
+        # Cenários caros (ex.: bcrypt) podem usar menos iterações
+        self.iterations = iterations
+
+    def run(self, client, headers):
+        response = client.open(
+            self.url,
+            method=self.method,
+            json=self.json_body,
+            headers=headers if self.authenticated else None
+        )
+        # Consome o corpo (inclusive respostas em streaming)
+        response.get_data()
+        return response
+
+
+def build_scenarios(dataset):
+    from benchmarks.dataset import BENCHMARK_EMAIL, BENCHMARK_PASSWORD
+
+    return [
+        Scenario('login', 'POST', '/api/auth/login',
+                 json_body={'email': BENCHMARK_EMAIL, 'password': BENCHMARK_PASSWORD},
+                 authenticated=False, iterations=5),
+        Scenario('inspections_page', 'GET', '/api/inspections?limit=50'),
+        Scenario('inspections_client_page', 'GET', '/api/inspections?client_id=1&limit=100&include_total=true'),
+        Scenario('inspections_pending_projection', 'GET',
+                 '/api/inspections?status=pendente&limit=200&fields=id,title,scheduled_date,status'),
+        Scenario('maintenances_count', 'GET', '/api/maintenances?count_only=true'),
+        Scenario('equipments_inventory', 'GET', '/api/equipments?inventory_id=1'),
+        Scenario('equipments_all', 'GET', '/api/equipments', iterations=3),
+        Scenario('clients_search', 'GET', '/api/clients?search=sintetico%200001&limit=20'),
+        Scenario('auto_inspections_stats', 'GET', '/api/auto-inspections/stats?refresh=true'),
+        Scenario('auto_inspections_preview', 'POST', '/api/auto-inspections/preview',
+                 json_body={'months_ahead': 3, 'contract_id': 1}),
+    ]
+
+
+def measure(app, scenario, headers, iterations):
+    """Executa o cenário e retorna latências, consultas e pico de memória"""
+    from sqlalchemy import event
+    from api.models import db
+
+    client = app.test_client()
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    # Aquecimento (caches de compilação do SQLAlchemy, identidade, etc.)
+    response = scenario.run(client, headers)
+    if response.status_code >= 400:
+        raise RuntimeError(f'{scenario.name}: HTTP {response.status_code} - {response.get_data(as_text=True)[:300]}')
+
+    latencies = []
+    for _ in range(scenario.iterations or iterations):
+        started_at = time.perf_counter()
+        scenario.run(client, headers)
+        latencies.append((time.perf_counter() - started_at) * 1000)
+
+    # Execução separada com contagem de consultas e tracemalloc (que distorce a latência)
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', count_statement)
+    tracemalloc.start()
+    try:
+        response = scenario.run(client, headers)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        event.remove(engine, 'before_cursor_execute', count_statement)
+
+    return {
+        'status': response.status_code,
+        'p50_ms': round(percentile(latencies, 0.50), 2),
+        'p95_ms': round(percentile(latencies, 0.95), 2),
+        'queries': len(statements),
+        'peak_memory_kb': round(peak / 1024, 1),
+        'response_bytes': len(response.get_data()),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Lista as regressões em relação ao baseline"""
+    regressions = []
+
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+
+        if current['queries'] > previous['queries']:
+            regressions.append(f"{name}: consultas {previous['queries']} -> {current['queries']}")
+
+        for metric in ('p95_ms', 'peak_memory_kb'):
+            limit = previous[metric] * (1 + tolerance)
+            if current[metric] > limit:
+                regressions.append(f'{name}: {metric} {previous[metric]} -> {current[metric]} (limite {limit:.1f})')
+
+    return regressions
+
+
+def prepare_database(args):
+    """Cria e popula o banco sintético (ou reaproveita com --reuse)"""
+    if args.database_url:
+        return args.database_url, True
+
+    path = os.path.join(tempfile.gettempdir(), f'fireng_bench_{args.scale}_{args.seed}.db')
+    exists = os.path.exists(path)
+    if exists and not args.reuse:
+        os.remove(path)
+
+    return f'sqlite:///{path}', not (exists and args.reuse)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    database_url, populate = prepare_database(args)
+
+    # A configuração lê DATABASE_URL na importação
+    os.environ['DATABASE_URL'] = database_url
+    os.environ.setdefault('FLASK_ENV', 'production')
+    logging.getLogger('sqlalchemy').setLevel(logging.WARNING)
+
+    from flask_jwt_extended import create_access_token
+    from api.app import create_app
+    from api.models import db
+    from api.security import password_hasher
+    from benchmarks.dataset import SyntheticDataset, BENCHMARK_PASSWORD, load_dataset
+
+    app = create_app()
+    dataset = SyntheticDataset(args.scale, seed=args.seed)
+
+    with app.app_context():
+        db.engine.echo = False
+
+        if populate:
+            db.create_all()
+            print(f'Gerando dados sintéticos ({args.scale})...')
+            started_at = time.perf_counter()
+            load_dataset(dataset, password_hasher.hash(BENCHMARK_PASSWORD))
+            print(f'   concluído em {time.perf_counter() - started_at:.1f}s')
+
+        headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    scenarios = build_scenarios(dataset)
+    if args.only:
+        selected = set(args.only.split(','))
+        scenarios = [scenario for scenario in scenarios if scenario.name in selected]
+
+    print(f"\n{'cenário':34} {'p50 ms':>9} {'p95 ms':>9} {'consultas':>10} {'pico KB':>10}")
+    results = {}
+    for scenario in scenarios:
+        result = measure(app, scenario, headers, args.iterations)
+        results[scenario.name] = result
+        print(f"{scenario.name:34} {result['p50_ms']:>9} {result['p95_ms']:>9} "
+              f"{result['queries']:>10} {result['peak_memory_kb']:>10}")
+
+    report = {'scale': args.scale, 'seed': args.seed, 'scenarios': results}
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2, ensure_ascii=False)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file).get(args.scale, {})
+
+    if args.update_baseline:
+        stored = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as baseline_file:
+                stored = json.load(baseline_file)
+        stored[args.scale] = {**baseline, **results}
+        with open(args.baseline, 'w', encoding='utf-8') as baseline_file:
+            json.dump(stored, baseline_file, indent=2, ensure_ascii=False, sort_keys=True)
+            baseline_file.write('\n')
+        print(f'\nBaseline atualizado: {args.baseline}')
+        return 0
+
+    if not baseline:
+        print(f'\nSem baseline para a escala {args.scale} (use --update-baseline)')
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print('\nREGRESSÕES EM RELAÇÃO AO BASELINE:')
+        for regression in regressions:
+            print(f'   - {regression}')
+        return 1
+
+    print('\nSem regressões em relação ao baseline')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
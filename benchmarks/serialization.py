@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Serialização das listagens: to_dict + jsonify versus serializadores por colunas
+
+Uso:
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --rows 10000 --runs 7
+    python -m benchmarks.serialization --scale medium --reuse
+
+Para cada modelo carrega até --rows linhas do banco sintético (o mesmo de
+benchmarks.run) pelos dois caminhos e reporta a mediana, em ms, de cada etapa:
+- atual: objetos ORM + to_dict + provider JSON do Flask (app.json.dumps);
+- rápido: tuplas (Row) + serializador por colunas + serialization.dumps
+  (orjson quando instalado).
+Também confere se os dois caminhos produzem o mesmo JSON decodificado.
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.run import prepare_database
+
+MODELS = ['Inspection', 'Maintenance', 'Equipment', 'Client']
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark de serialização das listagens')
+    parser.add_argument('--rows', type=int, default=10000, help='Linhas por modelo (limitado ao disponível)')
+    parser.add_argument('--runs', type=int, default=5, help='Repetições por caminho (mediana)')
+    parser.add_argument('--scale', default='small', help='Perfil de volume do banco sintético')
+    parser.add_argument('--seed', type=int, default=42, help='Semente do gerador de dados')
+    parser.add_argument('--database-url', help='Banco usado (padrão: o mesmo SQLite de benchmarks.run)')
+    parser.add_argument('--reuse', action='store_true', help='Reaproveita o banco já gerado para a escala')
+    return parser.parse_args(argv)
+
+
+def timed(function):
+    started_at = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - started_at) * 1000
+
+
+def current_path(app, db, model, rows):
+    """Objetos ORM + to_dict + provider JSON do Flask"""
+    db.session.expunge_all()
+    objects, load_ms = timed(lambda: model.query.order_by(model.id).limit(rows).all())
+    data, serialize_ms = timed(lambda: [obj.to_dict() for obj in objects])
+    body, encode_ms = timed(lambda: app.json.dumps(data))
+    return body, (load_ms, serialize_ms, encode_ms)
+
+
+def fast_path(db, model, rows):
+    """Tuplas + serializador por colunas + serialization.dumps"""
+    from api.serialization import dumps, serializer_for
+
+    db.session.expunge_all()
+    serializer = serializer_for(model)
+    query = model.query.with_entities(*serializer.columns).order_by(model.id).limit(rows)
+    tuples, load_ms = timed(query.all)
+    data, serialize_ms = timed(lambda: serializer.serialize(tuples))
+    body, encode_ms = timed(lambda: dumps(data))
+    return body, (load_ms, serialize_ms, encode_ms)
+
+
+def median_stages(samples):
+    return [statistics.median(stage) for stage in zip(*samples)]
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    database_url, populate = prepare_database(args)
+
+    # A configuração lê DATABASE_URL na importação
+    os.environ['DATABASE_URL'] = database_url
+    os.environ.setdefault('FLASK_ENV', 'production')
+    logging.getLogger('sqlalchemy').setLevel(logging.WARNING)
+
+    import api.models as models
+    from api.app import create_app
+    from api.security import password_hasher
+    from api.serialization import orjson
+    from benchmarks.dataset import SyntheticDataset, BENCHMARK_PASSWORD, load_dataset
+
+    app = create_app()
+
+    print(f"Codificador do caminho rápido: {'orjson' if orjson is not None else 'json (stdlib)'}")
+    print(f"\n{'modelo':12} {'linhas':>7} {'caminho':8} {'carga ms':>9} {'dict ms':>8} "
+          f"{'json ms':>8} {'total ms':>9} {'KB':>7}  ganho")
+
+    mismatches = []
+    with app.app_context():
+        models.db.engine.echo = False
+
+        if populate:
+            models.db.create_all()
+            print(f'Gerando dados sintéticos ({args.scale})...')
+            load_dataset(SyntheticDataset(args.scale, seed=args.seed), password_hasher.hash(BENCHMARK_PASSWORD))
+
+        for name in MODELS:
+            model = getattr(models, name)
+            current_samples, fast_samples = [], []
+            for _ in range(args.runs):
+                current_body, stages = current_path(app, models.db, model, args.rows)
+                current_samples.append(stages)
+                fast_body, stages = fast_path(models.db, model, args.rows)
+                fast_samples.append(stages)
+
+            current_data = json.loads(current_body)
+            if current_data != json.loads(fast_body):
+                mismatches.append(name)
+
+            current_total = sum(median_stages(current_samples))
+            for label, samples, body in [('atual', current_samples, current_body), ('rápido', fast_samples, fast_body)]:
+                load_ms, serialize_ms, encode_ms = median_stages(samples)
+                total = load_ms + serialize_ms + encode_ms
+                speedup = f'{current_total / total:.1f}x' if label == 'rápido' and total else ''
+                print(f'{name:12} {len(current_data):>7} {label:8} {load_ms:>9.1f} {serialize_ms:>8.1f} '
+                      f'{encode_ms:>8.1f} {total:>9.1f} {len(body) / 1024:>7.0f}  {speedup}')
+
+    if mismatches:
+        print(f"\nJSON DIFERENTE ENTRE OS CAMINHOS: {', '.join(mismatches)}")
+        return 1
+
+    print('\nMesmo JSON decodificado nos dois caminhos.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Perfil de inicialização (cold start) da função do Vercel
+
+Uso:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --modules 30
+    python -m benchmarks.startup --mode lazy
+
+Cada execução roda em um processo novo (python -X importtime) que importa
+api/index.py como o Vercel faz e envia a primeira requisição a /api/health e a
+/api/auth/login. Reporta a mediana do tempo de importação + create_app e da
+primeira requisição de cada endpoint, nos modos normal e LAZY_STARTUP, e os
+módulos com maior tempo de importação acumulado.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = {
+    'eager': 'false',
+    'lazy': 'true',
+}
+
+# Executado em processo novo: mede importação do entrypoint e as primeiras requisições
+CHILD_SCRIPT = r'''
+import json, time
+started_at = time.perf_counter()
+from api.index import app
+timings = {'import': time.perf_counter() - started_at}
+client = app.test_client()
+for name, method, url, body in [
+    ('health', 'GET', '/api/health', None),
+    ('login', 'POST', '/api/auth/login', {'email': 'startup@fireng.local', 'password': 'startup'}),
+]:
+    started_at = time.perf_counter()
+    response = client.open(url, method=method, json=body)
+    response.get_data()
+    timings[name] = time.perf_counter() - started_at
+    timings[name + '_status'] = response.status_code
+print('STARTUP ' + json.dumps(timings))
+'''
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Perfil de cold start da API Fireng')
+    parser.add_argument('--runs', type=int, default=5, help='Processos por modo (mediana)')
+    parser.add_argument('--modules', type=int, default=20, help='Módulos listados no perfil de importação')
+    parser.add_argument('--mode', choices=sorted(MODES), help='Mede apenas um modo (padrão: ambos)')
+    parser.add_argument('--database-url', help='Banco usado (padrão: SQLite temporário com o usuário de teste)')
+    return parser.parse_args(argv)
+
+
+def prepare_database():
+    """SQLite temporário com as tabelas e o usuário usado no login"""
+    path = os.path.join(tempfile.gettempdir(), 'fireng_startup.db')
+    database_url = f'sqlite:///{path}'
+    if os.path.exists(path):
+        return database_url
+
+    os.environ['DATABASE_URL'] = database_url
+    from api.app import create_app
+    from api.models import db, User
+
+    app = create_app()
+    with app.app_context():
+        db.engine.echo = False
+        db.create_all()
+        user = User(email='startup@fireng.local', name='Startup', role='admin')
+        user.set_password('startup')
+        db.session.add(user)
+        db.session.commit()
+
+    return database_url
+
+
+def parse_importtime(stderr):
+    """Tempos (self, acumulado) em microssegundos por módulo, da saída de -X importtime"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def run_once(mode, database_url):
+    env = dict(os.environ, DATABASE_URL=database_url, LAZY_STARTUP=MODES[mode], FLASK_ENV='production')
+    env.pop('VERCEL', None)
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD_SCRIPT],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+
+    timings = None
+    for line in process.stdout.splitlines():
+        if line.startswith('STARTUP '):
+            timings = json.loads(line[len('STARTUP '):])
+
+    if timings is None:
+        raise RuntimeError(f'Falha ao medir o modo {mode}:\n{process.stderr[-2000:]}')
+
+    return timings, parse_importtime(process.stderr)
+
+
+def profile_mode(mode, runs, database_url):
+    samples = []
+    modules = {}
+    for _ in range(runs):
+        timings, imported = run_once(mode, database_url)
+        samples.append(timings)
+        for name, (self_us, cumulative_us) in imported.items():
+            modules.setdefault(name, []).append((self_us, cumulative_us))
+
+    summary = {
+        key: statistics.median(sample[key] for sample in samples) * 1000
+        for key in ('import', 'health', 'login')
+    }
+    summary['statuses'] = {key: samples[-1][f'{key}_status'] for key in ('health', 'login')}
+    summary['modules'] = {
+        name: (statistics.median(value[0] for value in values) / 1000,
+               statistics.median(value[1] for value in values) / 1000)
+        for name, values in modules.items()
+    }
+    return summary
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    database_url = args.database_url or prepare_database()
+    modes = [args.mode] if args.mode else list(MODES)
+
+    results = {mode: profile_mode(mode, args.runs, database_url) for mode in modes}
+
+    print(f"\n{'modo':8} {'import+app ms':>14} {'1ª health ms':>13} {'1ª login ms':>12} {'total ms':>9}  status")
+    for mode, summary in results.items():
+        total = summary['import'] + summary['health'] + summary['login']
+        statuses = '/'.join(str(code) for code in summary['statuses'].values())
+        print(f"{mode:8} {summary['import']:>14.1f} {summary['health']:>13.1f} "
+              f"{summary['login']:>12.1f} {total:>9.1f}  {statuses}")
+
+    for mode, summary in results.items():
+        print(f'\nImportação por módulo ({mode}, mediana de {args.runs} processos; acumulado inclui dependências)')
+        print(f"{'módulo':48} {'próprio ms':>11} {'acumulado ms':>13}")
+        ranked = sorted(summary['modules'].items(), key=lambda item: item[1][1], reverse=True)
+        for name, (self_ms, cumulative_ms) in ranked[:args.modules]:
+            print(f'{name:48} {self_ms:>11.1f} {cumulative_ms:>13.1f}')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""client search index
+
+Revision ID: 8b2d4e6f1a37
+Revises: 3f1c2a9b7d10
+Create Date: 2026-10-17 14:20:00.000000
+
+"""
+import re
+import unicodedata
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2d4e6f1a37'
+down_revision = '3f1c2a9b7d10'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_FTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS clients_fts USING fts5("
+    "search_text, content='clients', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    'CREATE TRIGGER IF NOT EXISTS clients_fts_ai AFTER INSERT ON clients BEGIN '
+    'INSERT INTO clients_fts(rowid, search_text) VALUES (new.id, new.search_text); END',
+    'CREATE TRIGGER IF NOT EXISTS clients_fts_ad AFTER DELETE ON clients BEGIN '
+    "INSERT INTO clients_fts(clients_fts, rowid, search_text) VALUES ('delete', old.id, old.search_text); END",
+    'CREATE TRIGGER IF NOT EXISTS clients_fts_au AFTER UPDATE ON clients BEGIN '
+    "INSERT INTO clients_fts(clients_fts, rowid, search_text) VALUES ('delete', old.id, old.search_text); "
+    'INSERT INTO clients_fts(rowid, search_text) VALUES (new.id, new.search_text); END',
+    "INSERT INTO clients_fts(clients_fts) VALUES ('rebuild')",
+]
+
+
+def _normalize(value):
+    value = unicodedata.normalize('NFKD', value or '')
+    value = ''.join(char for char in value if not unicodedata.combining(char))
+    return ' '.join(value.lower().split())
+
+
+def _backfill(bind):
+    clients = sa.table(
+        'clients',
+        sa.column('id'), sa.column('name'), sa.column('email'), sa.column('cpf_cnpj'),
+        sa.column('search_text'), sa.column('cpf_cnpj_digits')
+    )
+
+    rows = bind.execute(sa.select(clients.c.id, clients.c.name, clients.c.email, clients.c.cpf_cnpj)).fetchall()
+    for row in rows:
+        digits = re.sub(r'\D', '', row.cpf_cnpj or '') or None
+        parts = [_normalize(row.name), _normalize(row.email), digits]
+        bind.execute(
+            clients.update().where(clients.c.id == row.id).values(
+                search_text=' '.join(part for part in parts if part)[:255],
+                cpf_cnpj_digits=digits
+            )
+        )
+
+
+def upgrade():
+    with op.batch_alter_table('clients', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_text', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('cpf_cnpj_digits', sa.String(length=20), nullable=True))
+        batch_op.create_index(batch_op.f('ix_clients_cpf_cnpj_digits'), ['cpf_cnpj_digits'], unique=False)
+
+    bind = op.get_bind()
+    _backfill(bind)
+
+    if bind.dialect.name == 'mysql':
+        op.execute('ALTER TABLE clients ADD FULLTEXT INDEX ft_clients_search_text (search_text)')
+    elif bind.dialect.name == 'sqlite':
+        for statement in SQLITE_FTS:
+            op.execute(statement)
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'mysql':
+        op.execute('ALTER TABLE clients DROP INDEX ft_clients_search_text')
+    elif bind.dialect.name == 'sqlite':
+        for trigger in ('clients_fts_ai', 'clients_fts_ad', 'clients_fts_au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS clients_fts')
+
+    with op.batch_alter_table('clients', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_clients_cpf_cnpj_digits'))
+        batch_op.drop_column('cpf_cnpj_digits')
+        batch_op.drop_column('search_text')
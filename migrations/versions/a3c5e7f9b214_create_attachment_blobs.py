@@ -0,0 +1,29 @@
+"""create attachment blobs
+
+Revision ID: a3c5e7f9b214
+Revises: f7b1d3e5a820
+Create Date: 2026-10-17 21:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c5e7f9b214'
+down_revision = 'f7b1d3e5a820'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('attachment_blobs',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('data', sa.LargeBinary().with_variant(mysql.LONGBLOB(), 'mysql'), nullable=False),
+    sa.PrimaryKeyConstraint('sha256')
+    )
+
+
+def downgrade():
+    op.drop_table('attachment_blobs')
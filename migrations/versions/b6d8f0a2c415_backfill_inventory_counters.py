@@ -0,0 +1,50 @@
+"""backfill inventory counters
+
+Revision ID: b6d8f0a2c415
+Revises: a3c5e7f9b214
+Create Date: 2026-10-17 21:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d8f0a2c415'
+down_revision = 'a3c5e7f9b214'
+branch_labels = None
+depends_on = None
+
+
+# Coluna de contador de cada tipo de equipamento (Inventory.TYPE_COUNTERS na data da migração)
+TYPE_COUNTERS = {
+    'extintor': 'extinguishers_count',
+    'hidrante': 'hydrants_count',
+    'sprinkler': 'sprinklers_count',
+    'alarme': 'alarms_count',
+    'iluminacao_emergencia': 'emergency_lights_count',
+}
+
+
+def upgrade():
+    # Os contadores passaram a ser mantidos incrementalmente; até aqui nunca eram
+    # recalculados, então partem dos valores reais
+    inventories = sa.table('inventories', sa.column('id'), sa.column('total_equipments'),
+                           *[sa.column(column) for column in TYPE_COUNTERS.values()])
+    equipments = sa.table('equipments', sa.column('id'), sa.column('inventory_id'), sa.column('type'))
+
+    def count(*criteria):
+        return sa.select(sa.func.count(equipments.c.id)).where(
+            equipments.c.inventory_id == inventories.c.id, *criteria
+        ).scalar_subquery()
+
+    values = {'total_equipments': count()}
+    for equipment_type, column in TYPE_COUNTERS.items():
+        values[column] = count(equipments.c.type == equipment_type)
+
+    op.execute(inventories.update().values(**values))
+
+
+def downgrade():
+    # Os valores anteriores (desatualizados) não são restaurados
+    pass
@@ -0,0 +1,56 @@
+"""list filter indexes
+
+Revision ID: c4e7a1d92b58
+Revises: 8b2d4e6f1a37
+Create Date: 2026-10-17 16:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e7a1d92b58'
+down_revision = '8b2d4e6f1a37'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('inspections', 'ix_inspections_scheduled_date_id', ['scheduled_date', 'id']),
+    ('inspections', 'ix_inspections_technician_scheduled', ['technician_id', 'scheduled_date', 'id']),
+    ('inspections', 'ix_inspections_client_scheduled', ['client_id', 'scheduled_date', 'id']),
+    ('inspections', 'ix_inspections_team_scheduled', ['team_id', 'scheduled_date', 'id']),
+    ('inspections', 'ix_inspections_status_scheduled', ['status', 'scheduled_date', 'id']),
+    ('inspections', 'ix_inspections_equipment_scheduled_status', ['equipment_id', 'scheduled_date', 'status']),
+    ('maintenances', 'ix_maintenances_scheduled_date_id', ['scheduled_date', 'id']),
+    ('maintenances', 'ix_maintenances_technician_scheduled', ['technician_id', 'scheduled_date', 'id']),
+    ('maintenances', 'ix_maintenances_client_scheduled', ['client_id', 'scheduled_date', 'id']),
+    ('maintenances', 'ix_maintenances_status_scheduled', ['status', 'scheduled_date', 'id']),
+    ('maintenances', 'ix_maintenances_type_scheduled', ['maintenance_type', 'scheduled_date', 'id']),
+    ('equipments', 'ix_equipments_inventory_id', ['inventory_id']),
+    ('equipments', 'ix_equipments_serial_number', ['serial_number']),
+]
+
+
+def _existing_indexes(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    # Bancos criados com db.create_all() já depois desta revisão possuem os índices
+    existing = {}
+    for table, name, columns in INDEXES:
+        if table not in existing:
+            existing[table] = _existing_indexes(table)
+        if name not in existing[table]:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    existing = {}
+    for table, name, columns in reversed(INDEXES):
+        if table not in existing:
+            existing[table] = _existing_indexes(table)
+        if name in existing[table]:
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,50 @@
+"""inspection origin unique key
+
+Revision ID: d5f8b3a6c901
+Revises: c4e7a1d92b58
+Create Date: 2026-10-17 17:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5f8b3a6c901'
+down_revision = 'c4e7a1d92b58'
+branch_labels = None
+depends_on = None
+
+
+# Descrição gravada pela geração automática (identifica as inspeções geradas antes da coluna origin)
+GENERATED_DESCRIPTION = 'Inspeção periódica do equipamento %'
+
+
+def upgrade():
+    with op.batch_alter_table('inspections', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('origin', sa.String(length=20), nullable=True))
+
+    # Marca como geradas apenas a primeira inspeção de cada (equipamento, data);
+    # duplicatas criadas por gerações concorrentes continuam como manuais (origin NULL).
+    # A tabela derivada evita o erro 1093 do MySQL (UPDATE com subconsulta na mesma tabela).
+    op.get_bind().execute(
+        sa.text(
+            "UPDATE inspections SET origin = 'auto' WHERE id IN ("
+            "SELECT id FROM (SELECT MIN(id) AS id FROM inspections "
+            "WHERE equipment_id IS NOT NULL AND description LIKE :description "
+            "GROUP BY equipment_id, scheduled_date) AS first_generated)"
+        ),
+        {'description': GENERATED_DESCRIPTION}
+    )
+
+    op.create_index(
+        'uq_inspections_equipment_scheduled_origin', 'inspections',
+        ['equipment_id', 'scheduled_date', 'origin'], unique=True
+    )
+
+
+def downgrade():
+    op.drop_index('uq_inspections_equipment_scheduled_origin', table_name='inspections')
+
+    with op.batch_alter_table('inspections', schema=None) as batch_op:
+        batch_op.drop_column('origin')
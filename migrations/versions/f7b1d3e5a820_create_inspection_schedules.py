@@ -0,0 +1,66 @@
+"""create inspection schedules
+
+Revision ID: f7b1d3e5a820
+Revises: e2a9c7b4d613
+Create Date: 2026-10-17 19:40:00.000000
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7b1d3e5a820'
+down_revision = 'e2a9c7b4d613'
+branch_labels = None
+depends_on = None
+
+
+# Periodicidades que estavam fixas no código (intervalo em dias por tipo de equipamento)
+DEFAULT_SCHEDULES = [
+    ('extintor', 30, 'Mensal'),
+    ('hidrante', 90, 'Trimestral'),
+    ('sprinkler', 180, 'Semestral'),
+    ('alarme', 30, 'Mensal'),
+    ('iluminacao_emergencia', 90, 'Trimestral'),
+    ('porta_corta_fogo', 180, 'Semestral'),
+    ('mangueira', 90, 'Trimestral'),
+    ('bomba', 90, 'Trimestral'),
+]
+
+
+def upgrade():
+    schedules = op.create_table('inspection_schedules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('equipment_type', sa.String(length=50), nullable=True),
+    sa.Column('standard_id', sa.Integer(), nullable=True),
+    sa.Column('contract_id', sa.Integer(), nullable=True),
+    sa.Column('interval', sa.Integer(), nullable=False),
+    sa.Column('unit', sa.String(length=10), nullable=False),
+    sa.Column('skip_weekends', sa.Boolean(), nullable=False),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ),
+    sa.ForeignKeyConstraint(['standard_id'], ['standards.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    now = datetime.utcnow()
+    op.bulk_insert(schedules, [
+        {
+            'equipment_type': equipment_type,
+            'interval': interval,
+            'unit': 'days',
+            'skip_weekends': False,
+            'description': description,
+            'created_at': now,
+            'updated_at': now
+        }
+        for equipment_type, interval, description in DEFAULT_SCHEDULES
+    ])
+
+
+def downgrade():
+    op.drop_table('inspection_schedules')
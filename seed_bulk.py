@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Carga em massa de dados sintéticos (tenant realista) com inserções em lote
+
+Uso:
+    python seed_bulk.py --scale medium
+    python seed_bulk.py --scale production --chunk-size 10000 --workers 4 --staging csv
+    DATABASE_URL=sqlite:///instance/fireng.db python seed_bulk.py --scale small --create-tables
+
+As tabelas são carregadas na ordem das chaves estrangeiras; tabelas
+independentes entre si são carregadas em paralelo (exceto no SQLite).
+Com --staging csv no MySQL os dados são gravados em CSV e carregados com
+LOAD DATA LOCAL INFILE.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Carga em massa de dados sintéticos')
+    parser.add_argument('--scale', default='small', help='Perfil de volume: small, medium ou production')
+    parser.add_argument('--seed', type=int, default=42, help='Semente do gerador de dados')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='Linhas por lote de INSERT')
+    parser.add_argument('--workers', type=int, default=4, help='Tabelas carregadas em paralelo por nível de FK')
+    parser.add_argument('--staging', choices=['none', 'csv'], default='none',
+                        help='csv: LOAD DATA LOCAL INFILE a partir de CSV temporário (MySQL)')
+    parser.add_argument('--create-tables', action='store_true', help='Executa db.create_all() antes da carga')
+    return parser.parse_args()
+
+
+def seed_bulk():
+    args = parse_args()
+    logging.getLogger('sqlalchemy').setLevel(logging.WARNING)
+
+    from api.app import create_app
+    from api.models import db
+    from api.security import password_hasher
+    from benchmarks.dataset import SyntheticDataset, BENCHMARK_EMAIL, BENCHMARK_PASSWORD, load_dataset
+
+    app = create_app()
+
+    with app.app_context():
+        db.engine.echo = False
+
+        if args.create_tables:
+            db.create_all()
+
+        print("\n" + "=" * 80)
+        print(f"🌱 CARGA EM MASSA ({args.scale}) - banco {db.engine.dialect.name}")
+        print("=" * 80 + "\n")
+
+        dataset = SyntheticDataset(args.scale, seed=args.seed)
+        started_at = time.perf_counter()
+        loader = load_dataset(
+            dataset,
+            password_hasher.hash(BENCHMARK_PASSWORD),
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            staging=args.staging
+        )
+
+        print("\n📊 RESUMO:")
+        for line in loader.summary():
+            print(f"  {line}")
+        print(f"\n✨ Concluído em {time.perf_counter() - started_at:.1f}s")
+        print(f"🔐 Login: {BENCHMARK_EMAIL} / {BENCHMARK_PASSWORD}\n")
+
+
+if __name__ == '__main__':
+    seed_bulk()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Guarda da leitura de anexos (GET /api/attachments/<sha256>)
+
+Os anexos exigem JWT e técnicos só leem os das suas inspeções e manutenções:
+a resposta pode ser guardada apenas pelo navegador (Cache-Control private,
+nunca public) e é revalidada pelo ETag (hash do conteúdo). Usa SQLite em
+memória e o backend 'database'.
+"""
+
+import os
+import sys
+
+# Banco em memória antes de carregar a configuração da aplicação
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'assinatura'
+
+
+def _create_app():
+    from flask_jwt_extended import create_access_token
+    from api.app import create_app
+    from api.models import db, User
+    from api.services.attachments import save_attachment
+
+    app = create_app()
+    app.config['ATTACHMENTS_BACKEND'] = 'database'
+
+    with app.app_context():
+        db.engine.echo = False
+        db.create_all()
+
+        admin = User(email='guard@example.com', name='Guard', role='superadmin', password_hash='-')
+        technician = User(email='tecnico@example.com', name='Técnico', role='tecnico', password_hash='-')
+        db.session.add_all([admin, technician])
+        db.session.flush()
+
+        digest = save_attachment(PNG, 'image/png').sha256
+        db.session.commit()
+
+        tokens = {user.role: create_access_token(identity=str(user.id)) for user in (admin, technician)}
+
+    headers = {role: {'Authorization': f'Bearer {token}'} for role, token in tokens.items()}
+    return app, headers, digest
+
+
+def test_attachment_is_privately_cached():
+    app, headers, digest = _create_app()
+    client = app.test_client()
+
+    response = client.get(f'/api/attachments/{digest}', headers=headers['superadmin'])
+    assert response.status_code == 200 and response.data == PNG
+    cache_control = response.headers['Cache-Control']
+    assert 'private' in cache_control and 'public' not in cache_control
+    assert response.cache_control.max_age > 0
+
+    response = client.get(f'/api/attachments/{digest}',
+                          headers=dict(headers['superadmin'], **{'If-None-Match': f'"{digest}"'}))
+    assert response.status_code == 304
+    assert 'public' not in response.headers.get('Cache-Control', '')
+
+
+def test_technician_only_reads_own_attachments():
+    app, headers, digest = _create_app()
+
+    response = app.test_client().get(f'/api/attachments/{digest}', headers=headers['tecnico'])
+    assert response.status_code == 404
+
+
+if __name__ == "__main__":
+    print("Verificando a leitura de anexos...")
+    test_attachment_is_privately_cached()
+    test_technician_only_reads_own_attachments()
+    print("\nANEXOS OK!")
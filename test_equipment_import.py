@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Guarda da importação em massa de equipamentos (POST /api/equipments/bulk)
+
+O relatório conta linhas, criados e erros por linha; em segundo plano o arquivo
+fica no banco até a tarefa terminar e é removido em seguida, a tarefa de
+importação não pode ser enfileirada pela rota genérica de tarefas e o
+armazenamento local só aceita hashes SHA-256 como nome de arquivo. Usa SQLite
+em memória.
+"""
+
+import os
+import sys
+
+# Banco em memória antes de carregar a configuração da aplicação
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+CSV = (
+    'name,serial_number,inventory_id,type\n'
+    'Extintor A,SN-1,,extintor\n'
+    'Extintor B,,,extintor\n'
+    'Hidrante C,SN-3,,hidrante\n'
+).encode('utf-8')
+
+
+def _create_app():
+    from flask_jwt_extended import create_access_token
+    from api.app import create_app
+    from api.models import db, User, Client, Branch, Inventory
+
+    app = create_app()
+    app.config['JOBS_EXTERNAL_WORKER'] = True
+
+    with app.app_context():
+        db.engine.echo = False
+        db.create_all()
+
+        user = User(email='guard@example.com', name='Guard', role='superadmin', password_hash='-')
+        client = Client(name='Cliente', email='cliente@example.com')
+        db.session.add_all([user, client])
+        db.session.flush()
+
+        branch = Branch(name='Filial', company_id=client.id)
+        db.session.add(branch)
+        db.session.flush()
+
+        inventory = Inventory(branch_id=branch.id)
+        db.session.add(inventory)
+        db.session.commit()
+
+        token = create_access_token(identity=str(user.id))
+        inventory_id = inventory.id
+
+    return app, {'Authorization': f'Bearer {token}'}, inventory_id
+
+
+def _check_report(report):
+    assert report['total_rows'] == 3
+    assert report['created_count'] == 2
+    assert report['error_count'] == 1
+    assert report['errors'] == [{'row': 3, 'errors': ['serial_number é obrigatório']}]
+
+
+def test_import_report():
+    from api.models import db, Inventory
+
+    app, headers, inventory_id = _create_app()
+    client = app.test_client()
+
+    response = client.post(f'/api/equipments/bulk?inventory_id={inventory_id}', data=CSV,
+                           headers=dict(headers, **{'Content-Type': 'text/csv'}))
+    assert response.status_code == 200
+    _check_report(response.get_json())
+
+    with app.app_context():
+        inventory = db.session.get(Inventory, inventory_id)
+        assert (inventory.total_equipments, inventory.extinguishers_count, inventory.hydrants_count) == (2, 1, 1)
+
+
+def test_async_import_report_and_cleanup():
+    from api.jobs import JobWorker
+    from api.models import db, AttachmentBlob, Job
+
+    app, headers, inventory_id = _create_app()
+    client = app.test_client()
+
+    response = client.post(f'/api/equipments/bulk?inventory_id={inventory_id}&async=1', data=CSV,
+                           headers=dict(headers, **{'Content-Type': 'text/csv'}))
+    assert response.status_code == 202
+    job_id = response.get_json()['job']['id']
+
+    with app.app_context():
+        # O arquivo aguarda o executor no banco, acessível de qualquer máquina
+        assert db.session.query(AttachmentBlob).count() == 1
+
+    assert JobWorker(app).drain() == 1
+
+    with app.app_context():
+        job = db.session.get(Job, job_id)
+        assert job.status == Job.STATUS_SUCCEEDED
+        _check_report(job.to_dict()['result'])
+        assert db.session.query(AttachmentBlob).count() == 0
+
+
+def test_import_job_is_internal():
+    from api.models import Job
+
+    app, headers, _ = _create_app()
+
+    payload = {'upload': '../../etc/passwd', 'format': 'csv'}
+    response = app.test_client().post('/api/jobs', headers=headers,
+                                      json={'type': 'equipments.import', 'payload': payload})
+    assert response.status_code == 400
+    assert 'equipments.import' not in response.get_json()['error'].split('Opções:')[1]
+
+    with app.app_context():
+        assert Job.query.count() == 0
+
+
+def test_local_store_rejects_invalid_digest():
+    from api.services.attachments import LocalFileStore
+
+    store = LocalFileStore('/tmp/attachments')
+    for digest in ('../../etc/passwd', 'A' * 64, '0' * 64 + '\n', None):
+        try:
+            store.open(digest)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f'hash aceito: {digest!r}')
+
+
+if __name__ == "__main__":
+    print("Verificando a importação em massa de equipamentos...")
+    test_import_report()
+    test_async_import_report_and_cleanup()
+    test_import_job_is_internal()
+    test_local_store_rejects_invalid_digest()
+    print("\nIMPORTAÇÃO EM MASSA OK!")
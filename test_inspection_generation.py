@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Guarda da gravação em lote da geração automática de inspeções
+
+As chaves (equipment_id, scheduled_date, origin) já gravadas são ignoradas pelo
+banco sem alterar a linha existente, a contagem de inseridas/ignoradas é exata e
+os IDs devolvidos correspondem às linhas inseridas pela chamada. Preview e
+geração aceitam apenas months_ahead entre 1 e 12. Com periodicidade por norma,
+as normas são lidas antes do streaming dos equipamentos (no MySQL, outra
+consulta com o cursor aberto descartaria as linhas restantes). Falhas ao gravar
+periodicidades respondem em JSON e desfazem a sessão. Usa SQLite em
+memória; o comando do MySQL é conferido apenas na compilação.
+"""
+
+import os
+import sys
+
+# Banco em memória antes de carregar a configuração da aplicação
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import date, datetime, timedelta
+
+
+def _create_app():
+    from api.app import create_app
+    from api.models import db, User, Client, Branch, Contract, Inventory, Equipment
+
+    app = create_app()
+
+    with app.app_context():
+        db.engine.echo = False
+        db.create_all()
+
+        user = User(email='guard@example.com', name='Guard', role='superadmin', password_hash='-')
+        client = Client(name='Cliente', email='cliente@example.com')
+        db.session.add_all([user, client])
+        db.session.flush()
+
+        branch = Branch(name='Filial', company_id=client.id)
+        db.session.add(branch)
+        db.session.flush()
+
+        # Dois contratos ativos da mesma empresa: uma inspeção por equipamento e data
+        db.session.add_all([
+            Contract(contract_number=f'C-{i}', start_date=date.today(), company_id=client.id, status='ativo')
+            for i in range(2)
+        ])
+        inventory = Inventory(branch_id=branch.id)
+        db.session.add(inventory)
+        db.session.flush()
+
+        db.session.add_all([
+            Equipment(name=f'Equipamento {i}', type=Equipment.TYPE_EXTINGUISHER, serial_number=f'SN-{i}',
+                      inventory_id=inventory.id, installation_date=date.today() - timedelta(days=400))
+            for i in range(3)
+        ])
+        db.session.commit()
+
+    return app
+
+
+def _row(equipment_id, scheduled_date, timestamp):
+    from api.models import Inspection
+
+    return {
+        'title': 'Inspeção', 'scheduled_date': scheduled_date, 'status': Inspection.STATUS_PENDING,
+        'origin': Inspection.ORIGIN_AUTO, 'client_id': 1, 'equipment_id': equipment_id,
+        'created_by': 1, 'created_at': timestamp, 'updated_at': timestamp
+    }
+
+
+def test_insert_counts_and_ids():
+    from api.models import db, Inspection
+    from api.services.inspection_planner import insert_inspection_rows
+
+    app = _create_app()
+
+    with app.app_context():
+        first = datetime(2026, 1, 1)
+        day = datetime(2026, 2, 1)
+        rows = [_row(equipment_id, day, first) for equipment_id in (1, 2)]
+        inserted, skipped, ids = insert_inspection_rows(rows, collect_ids=True)
+        db.session.commit()
+        assert (inserted, skipped) == (2, 0)
+        assert ids == {(row.equipment_id, row.scheduled_date): row.id for row in Inspection.query}
+
+        # Mesmo segundo, chaves em parte repetidas e lotes menores que a entrada
+        rows = [_row(equipment_id, day, first) for equipment_id in (1, 2, 3)]
+        inserted, skipped, ids = insert_inspection_rows(rows, batch_size=2, collect_ids=True)
+        db.session.commit()
+        assert (inserted, skipped) == (1, 2)
+        assert list(ids) == [(3, day)]
+
+        # As linhas existentes não são alteradas pelo conflito
+        assert {inspection.updated_at for inspection in Inspection.query} == {first}
+
+
+def test_mysql_statement_ignores_duplicates():
+    from sqlalchemy.dialects import mysql
+    from api.models import Inspection
+    from api.services.inspection_planner import _upsert_statement
+
+    statement = _upsert_statement(Inspection.__table__, [_row(1, datetime(2026, 1, 1), datetime(2026, 1, 1))], 'mysql')
+    sql = str(statement.compile(dialect=mysql.dialect()))
+    assert sql.startswith('INSERT IGNORE INTO inspections')
+    assert 'ON DUPLICATE KEY' not in sql
+
+
+def test_generate_reports_inserted_ids():
+    from api.models import Inspection
+    from api.services.inspection_planner import generate_inspections
+
+    app = _create_app()
+
+    with app.app_context():
+        result = generate_inspections(2, 1)
+        assert result['generated_count'] == len(result['inspections']) > 0
+        # O segundo contrato tem as mesmas datas: contado como ignorado
+        assert result['skipped_count'] == result['generated_count']
+        assert sorted(item['id'] for item in result['inspections']) == sorted(i.id for i in Inspection.query)
+
+        again = generate_inspections(2, 1)
+        assert again['generated_count'] == 0 and again['inspections'] == []
+
+
+def test_standard_rules_across_stream_batches():
+    from sqlalchemy import event
+    from api.models import db, Equipment, InspectionSchedule, Standard
+    from api.services import inspection_planner
+    from api.services.inspection_planner import InspectionPlan
+
+    app = _create_app()
+
+    with app.app_context():
+        standard = Standard(code='NBR 12962', name='Extintores', type='NBR')
+        db.session.add(standard)
+        db.session.flush()
+        # Norma mais frequente que o padrão do tipo (mensal), em todos os equipamentos
+        db.session.add(InspectionSchedule(standard_id=standard.id, interval=7, unit='days'))
+        for equipment in Equipment.query:
+            equipment.standards.append(standard)
+        db.session.commit()
+
+        batch_size = inspection_planner.STREAM_BATCH_SIZE
+        inspection_planner.STREAM_BATCH_SIZE = 2
+        statements = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        try:
+            plan = InspectionPlan(1)
+            assert plan.schedules.has_standard_rules
+            event.listen(db.engine, 'before_cursor_execute', count_statement)
+            try:
+                candidates = list(plan.iter_candidates())
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', count_statement)
+        finally:
+            inspection_planner.STREAM_BATCH_SIZE = batch_size
+
+        # Apenas o SELECT do streaming enquanto o cursor está aberto
+        assert len(statements) == 1
+
+        # 3 equipamentos x 2 contratos, cada um com a série semanal completa da janela
+        rule = plan.schedules.resolve(Equipment.TYPE_EXTINGUISHER, None, (standard.id,), plan.holidays)
+        base = Equipment.query.first().installation_date
+        expected = len(list(rule.occurrences(base, plan.date_from.date(), plan.date_to.date())))
+        assert expected >= 4
+        assert len(candidates) == 3 * 2 * expected
+
+
+def test_months_ahead_is_bounded():
+    from flask_jwt_extended import create_access_token
+
+    app = _create_app()
+    client = app.test_client()
+
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    for route in ('/api/auto-inspections/preview', '/api/auto-inspections/generate'):
+        for months_ahead in (0, 13, 1000, '3', True):
+            response = client.post(route, headers=headers, json={'months_ahead': months_ahead})
+            assert response.status_code == 400, (route, months_ahead)
+
+    response = client.post('/api/auto-inspections/preview', headers=headers, json={'months_ahead': 2})
+    assert response.status_code == 200 and response.get_json()['preview_count'] > 0
+
+
+def test_schedule_write_errors_are_json():
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy.exc import IntegrityError
+    from api.models import db
+
+    app = _create_app()
+    client = app.test_client()
+
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    # Gravação concorrente do mesmo escopo: o banco recusa no commit
+    def conflict():
+        raise IntegrityError('INSERT INTO inspection_schedules', {}, Exception('Duplicate entry'))
+
+    commit = db.session.commit
+    db.session.commit = conflict
+    try:
+        response = client.post('/api/inspection-schedules', headers=headers,
+                               json={'equipment_type': 'extintor', 'interval': 1, 'unit': 'months'})
+    finally:
+        db.session.commit = commit
+    assert response.status_code == 409 and 'error' in response.get_json()
+
+    # A sessão foi desfeita: nada gravado e a próxima requisição funciona
+    response = client.get('/api/inspection-schedules', headers=headers)
+    assert response.status_code == 200 and response.get_json()['schedules'] == []
+
+
+if __name__ == "__main__":
+    print("Verificando a gravação em lote da geração automática...")
+    test_insert_counts_and_ids()
+    test_mysql_statement_ignores_duplicates()
+    test_generate_reports_inserted_ids()
+    test_standard_rules_across_stream_batches()
+    test_months_ahead_is_bounded()
+    test_schedule_write_errors_are_json()
+    print("\nGERAÇÃO AUTOMÁTICA OK!")
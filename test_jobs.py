@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Guarda da fila de tarefas em segundo plano (api/jobs.py)
+
+A reserva é um compare-and-swap: cada tarefa vai para um único executor, quem
+perde a disputa passa à candidata seguinte, tarefas abandonadas são retomadas
+até esgotar as tentativas, sem executor configurado nada é enfileirado e os
+tipos internos (validados pelas suas rotas) são recusados por POST /api/jobs.
+Usa SQLite em memória.
+"""
+
+import os
+import sys
+
+# Banco em memória antes de carregar a configuração da aplicação
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime, timedelta
+from sqlalchemy import event
+
+
+def _create_app(external_worker=True):
+    from flask_jwt_extended import create_access_token
+    from api.app import create_app
+    from api.jobs import job_handler
+    from api.models import db, User
+
+    @job_handler('test.echo')
+    def echo_job(context):
+        return {'echo': context.payload}
+
+    app = create_app()
+    app.config['JOBS_EXTERNAL_WORKER'] = external_worker
+
+    with app.app_context():
+        db.engine.echo = False
+        db.create_all()
+
+        user = User(email='guard@example.com', name='Guard', role='superadmin', password_hash='-')
+        db.session.add(user)
+        db.session.commit()
+
+        token = create_access_token(identity=str(user.id))
+
+    return app, {'Authorization': f'Bearer {token}'}
+
+
+def test_each_job_is_claimed_once():
+    from api.jobs import claim_next, enqueue, run_job
+    from api.models import db, Job
+
+    app, _ = _create_app()
+
+    with app.app_context():
+        first = enqueue('test.echo', {'n': 1}).id
+        second = enqueue('test.echo', {'n': 2}).id
+
+        assert claim_next('a').id == first
+        assert claim_next('b').id == second
+        assert claim_next('c') is None
+
+        job = run_job(db.session.get(Job, first))
+        assert job.status == Job.STATUS_SUCCEEDED and job.to_dict()['result'] == {'echo': {'n': 1}}
+
+
+def test_claim_race_moves_to_next_candidate():
+    from api.jobs import claim_next, enqueue
+    from api.models import db, Job
+
+    app, _ = _create_app()
+
+    with app.app_context():
+        first = enqueue('test.echo').id
+        second = enqueue('test.echo').id
+        engine = db.engine
+        raced = []
+
+        # Outro executor reserva a primeira candidata entre o SELECT e o UPDATE deste
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith('UPDATE jobs SET status') and not raced:
+                raced.append(True)
+                cursor.execute("UPDATE jobs SET status = 'executando', worker_id = 'outro', "
+                               "attempts = attempts + 1 WHERE id = ?", (first,))
+
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            job = claim_next('a')
+        finally:
+            event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+        assert raced and job.id == second and job.worker_id == 'a'
+        assert db.session.get(Job, first).worker_id == 'outro'
+
+
+def test_stale_jobs_are_retried_until_exhausted():
+    from api.jobs import claim_next, enqueue
+    from api.models import db, Job
+
+    app, _ = _create_app()
+    app.config['JOBS_MAX_ATTEMPTS'] = 2
+
+    with app.app_context():
+        job_id = enqueue('test.echo').id
+        stale = datetime.utcnow() - timedelta(seconds=app.config['JOBS_STALE_AFTER'] + 60)
+
+        for attempt in (1, 2):
+            job = claim_next(f'executor-{attempt}')
+            assert job.id == job_id and job.attempts == attempt
+            # Executor morreu sem reportar progresso
+            db.session.execute(db.update(Job).where(Job.id == job_id).values(updated_at=stale))
+            db.session.commit()
+
+        assert claim_next('executor-3') is None
+        job = db.session.get(Job, job_id)
+        assert job.status == Job.STATUS_FAILED and job.error
+
+
+def test_enqueue_refused_without_workers():
+    from api.jobs import JobsUnavailable, enqueue
+    from api.models import Job
+
+    app, headers = _create_app(external_worker=False)
+
+    with app.app_context():
+        try:
+            enqueue('test.echo')
+        except JobsUnavailable:
+            pass
+        else:
+            raise AssertionError('tarefa enfileirada sem executor')
+
+        response = app.test_client().post('/api/jobs', headers=headers, json={'type': 'test.echo'})
+        assert response.status_code == 503
+        assert Job.query.count() == 0
+
+
+def test_internal_jobs_refused_by_generic_route():
+    from api.models import Job
+
+    app, headers = _create_app()
+    client = app.test_client()
+
+    for job_type, payload in [('auto_inspections.generate', {'months_ahead': 1000}),
+                              ('equipments.import', {'upload': '../x', 'format': 'csv'})]:
+        response = client.post('/api/jobs', headers=headers, json={'type': job_type, 'payload': payload})
+        assert response.status_code == 400, job_type
+
+    response = client.post('/api/jobs', headers=headers, json={'type': 'test.echo'})
+    assert response.status_code == 202
+
+    with app.app_context():
+        assert [job.job_type for job in Job.query] == ['test.echo']
+
+
+if __name__ == "__main__":
+    print("Verificando a fila de tarefas...")
+    test_each_job_is_claimed_once()
+    test_claim_race_moves_to_next_candidate()
+    test_stale_jobs_are_retried_until_exhausted()
+    test_enqueue_refused_without_workers()
+    test_internal_jobs_refused_by_generic_route()
+    print("\nFILA DE TAREFAS OK!")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Guarda da especificação OpenAPI pré-gerada (api/apispec.json)
+
+Falha quando o arquivo não corresponde às docstrings atuais das rotas; para
+atualizar, rode `flask docs build`. Também verifica o envio com ETag e gzip.
+"""
+
+import gzip
+import os
+import sys
+
+# Banco em memória antes de carregar a configuração da aplicação
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def _create_app():
+    from api.app import create_app
+    return create_app()
+
+
+def test_spec_artifact_is_current():
+    from api.docs import SPEC_ARTIFACT_PATH, render_spec
+
+    assert os.path.exists(SPEC_ARTIFACT_PATH), 'api/apispec.json ausente; rode `flask docs build`'
+
+    with open(SPEC_ARTIFACT_PATH, 'rb') as spec_file:
+        current = spec_file.read()
+
+    assert render_spec(_create_app()) == current, 'api/apispec.json desatualizado; rode `flask docs build`'
+
+
+def test_spec_served_with_etag_and_gzip():
+    from api.docs import SPEC_ARTIFACT_PATH
+
+    with open(SPEC_ARTIFACT_PATH, 'rb') as spec_file:
+        current = spec_file.read()
+
+    client = _create_app().test_client()
+
+    response = client.get('/apispec.json')
+    assert response.status_code == 200
+    assert response.data == current
+    etag = response.headers['ETag']
+
+    response = client.get('/apispec.json', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == current
+
+    response = client.get('/apispec.json', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert not response.data
+
+
+if __name__ == "__main__":
+    print("Verificando a especificação OpenAPI pré-gerada...")
+    test_spec_artifact_is_current()
+    test_spec_served_with_etag_and_gzip()
+    print("\nESPECIFICAÇÃO ATUALIZADA!")
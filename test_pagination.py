@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Guarda da paginação por cursor (api/pagination.py)
+
+O cursor opaco preserva (scheduled_date, id) sem perda, e percorrer a listagem de
+inspeções página a página devolve cada linha uma única vez, na mesma ordem da
+listagem completa, mesmo com datas repetidas. O ETag da página vem das linhas
+buscadas: If-None-Match igual responde 304 sem corpo, e alterar uma linha da
+página muda o ETag. Usa SQLite em memória.
+"""
+
+import os
+import sys
+
+# Banco em memória antes de carregar a configuração da aplicação
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime
+
+
+def _create_app():
+    from flask_jwt_extended import create_access_token
+    from api.app import create_app
+    from api.models import db, User, Client, Inspection
+
+    app = create_app()
+
+    with app.app_context():
+        db.engine.echo = False
+        db.create_all()
+
+        user = User(email='guard@example.com', name='Guard', role='superadmin', password_hash='-')
+        client = Client(name='Cliente', email='cliente@example.com')
+        db.session.add_all([user, client])
+        db.session.flush()
+
+        # Datas repetidas (desempate por id) e frações de segundo
+        for i in range(7):
+            scheduled = datetime(2026, 1, 1 + i // 3, 8, 0, 0, 500000 if i % 3 == 2 else 0)
+            db.session.add(Inspection(title=f'Inspeção {i}', scheduled_date=scheduled, client_id=client.id))
+        db.session.commit()
+
+        token = create_access_token(identity=str(user.id))
+
+    return app, {'Authorization': f'Bearer {token}'}
+
+
+def test_cursor_round_trip():
+    from api.pagination import PaginationError, decode_cursor, encode_cursor
+
+    value = datetime(2026, 3, 9, 14, 30, 5, 123456)
+    assert decode_cursor(encode_cursor(value, 42)) == (value, 42)
+
+    for cursor in ['', 'não-é-base64', encode_cursor('ontem', 1)]:
+        try:
+            decode_cursor(cursor)
+        except PaginationError:
+            continue
+        raise AssertionError(f'cursor aceito: {cursor!r}')
+
+
+def test_keyset_walk_matches_full_listing():
+    app, headers = _create_app()
+    client = app.test_client()
+
+    full = client.get('/api/inspections', headers=headers).get_json()['inspections']
+
+    seen, cursor = [], None
+    while True:
+        url = '/api/inspections?limit=2' + (f'&cursor={cursor}' if cursor else '')
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, response.get_json()
+        page = response.get_json()
+        seen.extend(item['id'] for item in page['inspections'])
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+
+    assert seen == [item['id'] for item in full]
+
+    response = client.get('/api/inspections?limit=2&cursor=invalido', headers=headers)
+    assert response.status_code == 400
+
+
+def test_page_etag_and_not_modified():
+    from api.models import db, Inspection
+
+    app, headers = _create_app()
+    client = app.test_client()
+    url = '/api/inspections?limit=2&fields=id,title&include_total=true'
+
+    response = client.get(url, headers=headers)
+    etag = response.headers['ETag']
+    page = response.get_json()['inspections']
+    # updated_at é selecionado para o ETag, mas só aparece se pedido em fields
+    assert [sorted(item) for item in page] == [['id', 'title']] * 2
+
+    response = client.get(url, headers=dict(headers, **{'If-None-Match': etag}))
+    assert response.status_code == 304 and response.data == b''
+    assert response.headers['ETag'] == etag
+
+    # Outra URL (cursor, fields, include) não reaproveita o ETag
+    response = client.get('/api/inspections?limit=2', headers=dict(headers, **{'If-None-Match': etag}))
+    assert response.status_code == 200 and response.headers['ETag'] != etag
+
+    with app.app_context():
+        inspection = db.session.get(Inspection, page[0]['id'])
+        inspection.title = 'Alterada'
+        inspection.updated_at = datetime(2030, 1, 1)
+        db.session.commit()
+
+    response = client.get(url, headers=dict(headers, **{'If-None-Match': etag}))
+    assert response.status_code == 200 and response.headers['ETag'] != etag
+    assert response.get_json()['inspections'][0]['title'] == 'Alterada'
+
+
+if __name__ == "__main__":
+    print("Verificando a paginação por cursor...")
+    test_cursor_round_trip()
+    test_keyset_walk_matches_full_listing()
+    test_page_etag_and_not_modified()
+    print("\nPAGINAÇÃO POR CURSOR OK!")
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Guarda de regressão: número de consultas SQL das listagens com relacionamentos
+
+Usa SQLite em memória; não depende do banco remoto.
+"""
+
+import os
+import sys
+
+# Banco em memória antes de carregar a configuração da aplicação
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from contextlib import contextmanager
+from sqlalchemy import event
+
+# Limite de consultas por listagem, independente da quantidade de registros
+# (autenticação + listagem + carregamento em lote dos relacionamentos)
+QUERY_BUDGET = 10
+
+EQUIPMENTS_COUNT = 2000
+
+
+@contextmanager
+def count_queries(engine):
+    """Conta os comandos SQL executados no engine dentro do bloco"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def _create_app():
+    from flask_jwt_extended import create_access_token
+    from api.app import create_app
+    from api.models import db, User, Client, Branch, Inventory, Equipment, Standard
+    from api.models.equipment import equipment_standards
+    from api.services.inventory_counters import reconcile_inventory_counts
+
+    app = create_app()
+
+    with app.app_context():
+        db.engine.echo = False
+        db.create_all()
+
+        user = User(email='guard@example.com', name='Guard', role='superadmin', password_hash='-')
+        client = Client(name='Cliente', email='cliente@example.com')
+        db.session.add_all([user, client])
+        db.session.flush()
+
+        standards = [Standard(code=f'NBR {i}', name=f'Norma {i}', type='NBR') for i in range(3)]
+        branches = [Branch(name=f'Filial {i}', company_id=client.id) for i in range(4)]
+        db.session.add_all(standards + branches)
+        db.session.flush()
+
+        inventories = [Inventory(branch_id=branch.id) for branch in branches]
+        db.session.add_all(inventories)
+        db.session.flush()
+
+        db.session.execute(Equipment.__table__.insert(), [
+            {
+                'name': f'Equipamento {i}',
+                'type': Equipment.TYPES[i % len(Equipment.TYPES)],
+                'serial_number': f'SN-{i}',
+                'inventory_id': inventories[i % len(inventories)].id
+            }
+            for i in range(EQUIPMENTS_COUNT)
+        ])
+        # Carga via Core não passa pelos contadores do ORM
+        reconcile_inventory_counts()
+        equipment_ids = [row[0] for row in db.session.query(Equipment.id)]
+        db.session.execute(equipment_standards.insert(), [
+            {'equipment_id': equipment_id, 'standard_id': standard.id}
+            for equipment_id in equipment_ids
+            for standard in standards[:1 + equipment_id % len(standards)]
+        ])
+        db.session.commit()
+
+        token = create_access_token(identity=str(user.id))
+
+    return app, {'Authorization': f'Bearer {token}'}
+
+
+def _assert_listing(app, headers, url, key, expected):
+    from api.models import db
+
+    client = app.test_client()
+
+    with app.app_context():
+        with count_queries(db.engine) as statements:
+            response = client.get(url, headers=headers)
+
+    assert response.status_code == 200, response.get_json()
+    assert len(response.get_json()[key]) == expected
+    assert len(statements) <= QUERY_BUDGET, (
+        f'{url}: {len(statements)} consultas (limite {QUERY_BUDGET})\n' + '\n'.join(statements[:20])
+    )
+
+    print(f"   {url}: {len(statements)} consultas para {expected} registros")
+    return response.get_json()[key]
+
+
+def test_query_counts():
+    """Listagens com relacionamentos usam um número constante de consultas"""
+    app, headers = _create_app()
+
+    equipments = _assert_listing(app, headers, '/api/equipments', 'equipments', EQUIPMENTS_COUNT)
+    assert all('inventory' in equipment and equipment['standards'] for equipment in equipments)
+
+    _assert_listing(app, headers, '/api/equipments?include=inventory', 'equipments', EQUIPMENTS_COUNT)
+    inventories = _assert_listing(app, headers, '/api/inventories', 'inventories', 4)
+    assert sum(inventory['equipments_count'] for inventory in inventories) == EQUIPMENTS_COUNT
+
+
+def test_inventories_do_not_load_equipments():
+    """equipments_count vem do contador do inventário, sem carregar os equipamentos"""
+    from api.models import db
+
+    app, headers = _create_app()
+    client = app.test_client()
+
+    with app.app_context():
+        with count_queries(db.engine) as statements:
+            response = client.get('/api/inventories?include=equipments', headers=headers)
+
+    assert response.status_code == 200, response.get_json()
+    assert not [statement for statement in statements if 'FROM equipments' in statement], statements
+
+
+if __name__ == "__main__":
+    print("Contando consultas das listagens...")
+    test_query_counts()
+    test_inventories_do_not_load_equipments()
+    print("\nLISTAGENS DENTRO DO LIMITE DE CONSULTAS!")
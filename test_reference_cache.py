@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Guarda do cache de dados de referência (normas e equipes)
+
+Listagens repetidas de normas/equipes e a associação de normas a equipamentos não
+consultam a tabela de normas; gravações em normas/equipes invalidam o cache. A
+tabela de periodicidades só confere a versão depois do SCHEDULE_CACHE_TTL, e
+gravações no processo a recarregam na hora. Usa SQLite em memória.
+"""
+
+import os
+import sys
+
+# Banco em memória antes de carregar a configuração da aplicação
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from contextlib import contextmanager
+from sqlalchemy import event
+
+
+@contextmanager
+def count_queries(engine, table):
+    """Conta os comandos SQL que citam a tabela dentro do bloco"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if f'FROM {table}' in statement:
+            statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def _create_app():
+    from flask_jwt_extended import create_access_token
+    from api.app import create_app
+    from api.models import db, User, Client, Branch, Inventory, Standard, Team
+
+    app = create_app()
+
+    with app.app_context():
+        db.engine.echo = False
+        db.create_all()
+
+        user = User(email='guard@example.com', name='Guard', role='superadmin', password_hash='-')
+        client = Client(name='Cliente', email='cliente@example.com')
+        standards = [Standard(code=f'NBR {i}', name=f'Norma {i}', type='NBR') for i in range(3)]
+        db.session.add_all([user, client, Team(name='Equipe'), *standards])
+        db.session.flush()
+
+        branch = Branch(name='Filial', company_id=client.id)
+        db.session.add(branch)
+        db.session.flush()
+        db.session.add(Inventory(branch_id=branch.id))
+        db.session.commit()
+
+        token = create_access_token(identity=str(user.id))
+
+    return app, {'Authorization': f'Bearer {token}'}
+
+
+def test_reference_cache():
+    from api.models import db
+    from api.services.reference_data import reference_cache
+
+    app, headers = _create_app()
+    client = app.test_client()
+    reference_cache.invalidate()
+
+    with app.app_context():
+        client.get('/api/standards', headers=headers)
+        client.get('/api/teams', headers=headers)
+        hits = reference_cache.stats()['hits']
+
+        with count_queries(db.engine, 'standards') as standards_queries:
+            response = client.get('/api/standards', headers=headers)
+            assert len(response.get_json()['standards']) == 3
+
+            response = client.post('/api/equipments', headers=headers, json={
+                'name': 'Extintor', 'serial_number': 'SN-1', 'inventory_id': 1, 'standard_ids': [1, 3, 99]
+            })
+            assert response.status_code == 201, response.get_json()
+            assert [standard['id'] for standard in response.get_json()['equipment']['standards']] == [1, 3]
+
+        # Apenas o carregamento das normas do equipamento para a resposta (após o commit)
+        assert len(standards_queries) <= 1, standards_queries
+
+        with count_queries(db.engine, 'teams') as teams_queries:
+            client.get('/api/teams', headers=headers)
+        assert not teams_queries
+        assert reference_cache.stats()['hits'] > hits
+
+        # Associar normas a equipamentos não invalida; alterar uma norma ou criar equipe sim
+        client.put('/api/standards/1', headers=headers, json={'name': 'Norma alterada'})
+        names = [standard['name'] for standard in client.get('/api/standards', headers=headers).get_json()['standards']]
+        assert 'Norma alterada' in names
+
+        client.post('/api/teams', headers=headers, json={'name': 'Nova equipe'})
+        assert len(client.get('/api/teams', headers=headers).get_json()['teams']) == 2
+
+
+def test_schedule_cache():
+    from api.models import db, InspectionSchedule
+    from api.services.inspection_schedules import schedule_cache
+
+    app, _ = _create_app()
+    app.config['SCHEDULE_CACHE_TTL'] = 60
+    schedule_cache.invalidate()
+
+    with app.app_context():
+        schedule_cache.get()
+
+        # Dentro do TTL: nenhuma consulta, nem a da versão
+        with count_queries(db.engine, 'inspection_schedules') as queries:
+            table = schedule_cache.get()
+        assert not queries and not table.rules
+
+        db.session.add(InspectionSchedule(equipment_type='extintor', interval=2, unit='months'))
+        db.session.commit()
+
+        # Gravação no processo invalida o cache antes do TTL
+        assert schedule_cache.get().rules
+
+        # Sem TTL a versão é conferida a cada uso, mas a tabela não é recarregada
+        app.config['SCHEDULE_CACHE_TTL'] = 0
+        with count_queries(db.engine, 'inspection_schedules') as queries:
+            assert schedule_cache.get() is schedule_cache.get()
+        assert len(queries) == 2
+
+
+if __name__ == "__main__":
+    print("Verificando o cache de dados de referência...")
+    test_reference_cache()
+    test_schedule_cache()
+    print("\nCACHE DE REFERÊNCIA OK!")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Guarda da serialização por colunas das listagens (api/serialization.py)
+
+As listagens de equipamentos, inspeções, manutenções e clientes devem produzir o
+mesmo JSON que to_dict dos modelos. Usa SQLite em memória.
+"""
+
+import os
+import sys
+
+# Banco em memória antes de carregar a configuração da aplicação
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+# Adicionar o diretório atual ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+
+def _create_app():
+    from flask_jwt_extended import create_access_token
+    from api.app import create_app
+    from api.models import db, User, Client, Branch, Inventory, Equipment, Standard, Inspection, Maintenance
+
+    app = create_app()
+
+    with app.app_context():
+        db.engine.echo = False
+        db.create_all()
+
+        user = User(email='guard@example.com', name='Guard', role='superadmin', password_hash='-')
+        client = Client(name='Cliente', email='cliente@example.com', cpf_cnpj='12.345.678/0001-90')
+        standard = Standard(code='NBR 1', name='Norma 1', type='NBR')
+        db.session.add_all([user, client, standard])
+        db.session.flush()
+
+        branch = Branch(name='Filial', company_id=client.id)
+        db.session.add(branch)
+        db.session.flush()
+        inventory = Inventory(branch_id=branch.id)
+        db.session.add(inventory)
+        db.session.flush()
+
+        for i in range(3):
+            equipment = Equipment(
+                name=f'Equipamento {i}', type=Equipment.TYPES[i], serial_number=f'SN-{i}',
+                inventory_id=inventory.id if i else None, installation_date=date(2025, 1, i + 1)
+            )
+            if i < 2:
+                equipment.standards.append(standard)
+            db.session.add(equipment)
+
+        signatures = [None, 'attachment:' + 'a' * 64, 'data:image/png;base64,AAAA']
+        for i, signature in enumerate(signatures):
+            scheduled = datetime(2026, 1, i + 1, 8, 30, 15, 250000 * i)
+            db.session.add(Inspection(title=f'Inspeção {i}', scheduled_date=scheduled, client_id=client.id,
+                                      signature=signature))
+            db.session.add(Maintenance(title=f'Manutenção {i}', scheduled_date=scheduled, client_id=client.id,
+                                       signature=signature, labor_cost=Decimal(i * 5), parts_cost=None))
+        db.session.commit()
+
+        token = create_access_token(identity=str(user.id))
+
+    return app, {'Authorization': f'Bearer {token}'}
+
+
+def test_listings_match_to_dict():
+    from api.models import Client, Equipment, Inspection, Maintenance
+
+    app, headers = _create_app()
+    client = app.test_client()
+
+    with app.app_context():
+        scheduled = lambda model: model.query.order_by(model.scheduled_date.desc())
+        expected = {
+            '/api/equipments': ('equipments', [e.to_dict(include_relations=True) for e in Equipment.query]),
+            '/api/equipments?include=none': ('equipments', [e.to_dict() for e in Equipment.query]),
+            '/api/inspections': ('inspections', [i.to_dict() for i in scheduled(Inspection)]),
+            '/api/inspections?limit=2': ('inspections', [i.to_dict() for i in scheduled(Inspection).limit(2)]),
+            '/api/maintenances': ('maintenances', [m.to_dict() for m in scheduled(Maintenance)]),
+            '/api/clients': ('clients', [c.to_dict() for c in Client.query]),
+        }
+
+    for url, (key, rows) in expected.items():
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, response.get_json()
+        assert response.get_json()[key] == json.loads(json.dumps(rows)), url
+
+
+if __name__ == "__main__":
+    print("Comparando a serialização por colunas com to_dict...")
+    test_listings_match_to_dict()
+    print("\nSERIALIZAÇÃO EQUIVALENTE!")